@@ -0,0 +1,35 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+from .tokens import CLAIM_FIELDS, get_claims_version
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Build ``request.user`` from the claims of a :class:`~accounts.tokens.ClaimsRefreshToken`.
+
+    The user is an unsaved-looking ``User`` with its primary key set, so it can
+    be compared with and assigned to foreign keys, plus a ``department``
+    attribute read by :func:`accounts.tokens.get_staff_department`. Tokens
+    issued without the claims, or before the claims of their user changed,
+    fall back to the regular database lookup, and tokens of a user who was
+    inactive at login are refused like simplejwt refuses inactive users.
+    """
+
+    def get_user(self, validated_token):
+        if 'user_type' not in validated_token or 'is_active' not in validated_token:
+            return super().get_user(validated_token)
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        if validated_token.get('claims_version', 0) != get_claims_version(user_id):
+            return super().get_user(validated_token)
+        if not validated_token['is_active']:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        user = User(**{field: validated_token.get(field) for field in CLAIM_FIELDS})
+        setattr(user, api_settings.USER_ID_FIELD, user_id)
+        user._state.adding = False
+        user.department = validated_token.get('department')
+        return user
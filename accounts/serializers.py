@@ -3,6 +3,7 @@ from rest_framework.exceptions import ValidationError
 
 from .models import User, StudentProfile, StaffProfile, AdminProfile, UserProfile
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from .tokens import ClaimsRefreshToken
 import os
 
 
@@ -106,6 +107,7 @@ class UserSerializer(serializers.ModelSerializer):
 
 
 class CustomTokenObtainSerializer(TokenObtainPairSerializer):
+    token_class = ClaimsRefreshToken
     email = serializers.EmailField(required=True)
     password = serializers.CharField(required=True, write_only=True)
 
@@ -1,6 +1,10 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 from .models import User, StudentProfile, StaffProfile, AdminProfile
+from .tokens import revoke_user_tokens
+
+# Changing any of these invalidates the claims embedded in issued tokens
+USER_CLAIM_FIELDS = ('user_type', 'is_staff', 'is_superuser', 'is_active')
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -36,3 +40,26 @@ def save_user_profile(sender, instance, created, **kwargs):
                     instance.profile.save()
             except AdminProfile.DoesNotExist:
                 AdminProfile.objects.create(user=instance, admin_id='admin' + str(instance.id))
+
+
+@receiver(pre_save, sender=User)
+@receiver(pre_save, sender=StaffProfile)
+def remember_token_claims(sender, instance, **kwargs):
+    instance._previous_claims = None
+    fields = ('department',) if sender is StaffProfile else USER_CLAIM_FIELDS
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and not set(fields) & set(update_fields):
+        return
+    if instance.pk:
+        instance._previous_claims = sender.objects.filter(pk=instance.pk).values_list(*fields).first()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=StaffProfile)
+def revoke_stale_tokens(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_claims', None)
+    if created or previous is None:
+        return
+    fields = ('department',) if sender is StaffProfile else USER_CLAIM_FIELDS
+    if previous != tuple(getattr(instance, field) for field in fields):
+        revoke_user_tokens(instance.user_id if sender is StaffProfile else instance.pk)
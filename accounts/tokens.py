@@ -0,0 +1,75 @@
+"""
+JWTs that carry the authorization facts of their user.
+
+Tokens issued by :class:`ClaimsRefreshToken` embed ``user_type``,
+``is_staff``, ``is_superuser`` and the staff ``department`` (plus the fields
+shown by ``UserMinimalSerializer``), so :class:`accounts.authentication.ClaimsJWTAuthentication`
+can authorize a request without loading the user or its ``StaffProfile``.
+
+Invalidation: the claims are a snapshot taken at login. When one of them
+changes (a ``StaffProfile.department`` edit, or ``user_type``/``is_staff``/
+``is_superuser``/``is_active`` on the user), :func:`revoke_user_tokens`
+blacklists every outstanding refresh token of the user, so no new access
+token can be minted from the old claims, and bumps the user's claims version
+in the shared cache. Tokens carry the version they were issued at; an access
+token whose version is no longer current is authenticated from the database
+instead, so a deactivated or demoted staff member loses access at once
+rather than when the token expires, for the price of one cache read per
+request.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import StaffProfile
+
+CLAIM_FIELDS = ('email', 'first_name', 'last_name', 'user_type', 'is_active', 'is_staff', 'is_superuser')
+
+
+def get_staff_department(user):
+    """Department of a staff user, from the token claims when the request carried them."""
+    if hasattr(user, 'department'):
+        return user.department
+    if user.user_type != 'staff':
+        return None
+    return StaffProfile.objects.filter(user_id=user.pk).values_list('department', flat=True).first()
+
+
+def claims_version_key(user_id):
+    return f'token-claims:{user_id}'
+
+
+def get_claims_version(user_id):
+    """Version of the claims of ``user_id``; 0 until they first change."""
+    return cache.get(claims_version_key(user_id), 0)
+
+
+def user_claims(user):
+    claims = {field: getattr(user, field) for field in CLAIM_FIELDS}
+    claims['department'] = get_staff_department(user)
+    claims['claims_version'] = get_claims_version(user.pk)
+    return claims
+
+
+class ClaimsRefreshToken(RefreshToken):
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim, value in user_claims(user).items():
+            token[claim] = value
+        return token
+
+
+def revoke_user_tokens(user_id):
+    """Blacklist the unexpired refresh tokens of ``user_id`` and outdate its issued access tokens."""
+    # On commit: a login in between would read the old claims under the new version
+    transaction.on_commit(lambda: cache.set(claims_version_key(user_id), time.time_ns(), timeout=None))
+    outstanding = OutstandingToken.objects.filter(user_id=user_id, expires_at__gt=timezone.now())
+    BlacklistedToken.objects.bulk_create(
+        [BlacklistedToken(token=token) for token in outstanding],
+        ignore_conflicts=True
+    )
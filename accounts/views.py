@@ -10,6 +10,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework_simplejwt.tokens import RefreshToken, AccessToken
 from rest_framework_simplejwt.exceptions import TokenError
+from .tokens import ClaimsRefreshToken
 
 
 class CustomTokenObtainPairView(TokenObtainPairView):
@@ -21,7 +22,7 @@ class CustomTokenObtainPairView(TokenObtainPairView):
             serializer.is_valid(raise_exception=True)
             user_id = serializer.validated_data['user_id']
             user = User.objects.get(id=user_id)
-            refresh = RefreshToken.for_user(user)
+            refresh = ClaimsRefreshToken.for_user(user)
             return Response({
                 'status': 'success',
                 'message': 'User logged in successfully',
@@ -88,7 +89,7 @@ class RegisterView(APIView):
         try:
             serializer.is_valid(raise_exception=True)
             user = serializer.save()
-            refresh = RefreshToken.for_user(user)
+            refresh = ClaimsRefreshToken.for_user(user)
             return Response({
                 'status': 'success',
                 'message': 'User registered successfully',
@@ -0,0 +1,160 @@
+"""
+Set-based approval actions.
+
+A bulk action reads every requested booking with one locking query that also
+answers the department check, moves the permitted ones with one conditional
+``UPDATE`` and writes history and feedback with ``bulk_create``, all in a
+single transaction. Bookings brought back from a non-blocking status (e.g.
+approving a rejected one) are first checked against the other bookings of
+their venues, which are locked, and left alone if they would overlap.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import BooleanField, ExpressionWrapper, Q, Subquery, Value
+from django.utils import timezone
+
+from accounts.models import StaffProfile
+from bookings.conflicts import (
+    NON_BLOCKING_STATUSES, VenueIntervalIndex, blocking_bookings, get_max_duration, lock_venues
+)
+from bookings.models import Booking, BookingFeedback, BookingHistory, BookingStatus
+from bookings.signals import bookings_bulk_changed
+
+ACTION_STATUSES = {
+    'review': BookingStatus.UNDER_REVIEW,
+    'approve': BookingStatus.APPROVED,
+    'reject': BookingStatus.REJECTED,
+    'request-documents': BookingStatus.DOCUMENTS_PENDING,
+}
+
+FEEDBACK_TYPES = {
+    'approve': 'approval',
+    'reject': 'rejection',
+}
+
+UPDATED = 'updated'
+UNCHANGED = 'unchanged'
+FORBIDDEN = 'forbidden'
+NOT_FOUND = 'not_found'
+CONFLICT = 'conflict'
+
+
+def permitted_expression(user):
+    """Whether ``user`` may act on a booking, evaluated inside the booking query."""
+    if user.is_superuser:
+        return Value(True)
+    if user.user_type != 'staff':
+        return Value(False)
+    if hasattr(user, 'department'):
+        if not user.department:
+            return Value(False)
+        department = user.department
+    else:
+        department = Subquery(
+            StaffProfile.objects.filter(user_id=user.pk).exclude(department='').values('department')[:1]
+        )
+    return ExpressionWrapper(Q(venue__handled_by=department), output_field=BooleanField())
+
+
+def conflicting_windows(windows):
+    """
+    Ids of ``windows`` (``{pk: (venue_id, start_time, end_time)}``) overlapping a
+    blocking booking of their venue or an earlier window of the batch, read
+    with one range query after locking the venues.
+    """
+    if not windows:
+        return set()
+    venue_ids = {venue_id for venue_id, _, _ in windows.values()}
+    lock_venues(venue_ids)
+
+    span_start = min(start_time for _, start_time, _ in windows.values())
+    span_end = max(end_time for _, _, end_time in windows.values())
+    existing = defaultdict(list)
+    for venue_id, start_time, end_time, pk in blocking_bookings().filter(
+        venue_id__in=venue_ids,
+        start_time__gt=span_start - get_max_duration(),
+        start_time__lt=span_end,
+        end_time__gt=span_start,
+    ).values_list('venue_id', 'start_time', 'end_time', 'pk'):
+        existing[venue_id].append((start_time, end_time, pk))
+    indexes = {venue_id: VenueIntervalIndex(intervals) for venue_id, intervals in existing.items()}
+
+    conflicts = set()
+    taken = defaultdict(list)
+    for pk, (venue_id, start_time, end_time) in sorted(windows.items(), key=lambda item: (item[1][1], item[0])):
+        index = indexes.get(venue_id)
+        if (index and index.overlapping(start_time, end_time, exclude_pk=pk)) or any(
+            start < end_time and start_time < end for start, end in taken[venue_id]
+        ):
+            conflicts.add(pk)
+        else:
+            taken[venue_id].append((start_time, end_time))
+    return conflicts
+
+
+@transaction.atomic
+def apply_bulk_action(user, booking_ids, action, comment=''):
+    """Apply ``action`` to ``booking_ids`` and return ``{booking_id: outcome}``."""
+    new_status = ACTION_STATUSES[action]
+    rows = (
+        Booking.objects.select_for_update(of=('self',))
+        .filter(pk__in=booking_ids, requires_approval=True)
+        .annotate(permitted=permitted_expression(user))
+        .values_list('pk', 'status', 'permitted', 'venue_id', 'start_time', 'end_time')
+    )
+
+    outcomes = {booking_id: NOT_FOUND for booking_id in booking_ids}
+    previous = {}
+    windows = {}
+    for pk, status, permitted, venue_id, start_time, end_time in rows:
+        if not permitted:
+            outcomes[pk] = FORBIDDEN
+        elif status == new_status:
+            outcomes[pk] = UNCHANGED
+        else:
+            outcomes[pk] = UPDATED
+            previous[pk] = status
+            windows[pk] = (venue_id, start_time, end_time)
+
+    if new_status not in NON_BLOCKING_STATUSES:
+        reactivated = {pk: windows[pk] for pk, status in previous.items() if status in NON_BLOCKING_STATUSES}
+        for pk in conflicting_windows(reactivated):
+            outcomes[pk] = CONFLICT
+            del previous[pk], windows[pk]
+
+    if not previous:
+        return outcomes
+
+    now = timezone.now()
+    changes = {'status': new_status, 'updated_at': now}
+    if action == 'approve':
+        changes.update(approved_by=user, approval_date=now)
+    Booking.objects.filter(pk__in=previous).exclude(status=new_status).update(**changes)
+
+    BookingHistory.objects.bulk_create([
+        BookingHistory(
+            booking_id=pk,
+            previous_status=status,
+            new_status=new_status,
+            changed_by=user,
+            comment=comment,
+            handled_by_role=getattr(user, 'role', 'staff')
+        )
+        for pk, status in previous.items()
+    ])
+
+    if comment:
+        BookingFeedback.objects.bulk_create([
+            BookingFeedback(
+                booking_id=pk,
+                staff=user,
+                content=comment,
+                is_internal=False,
+                feedback_type=FEEDBACK_TYPES.get(action, 'requirement')
+            )
+            for pk in previous
+        ])
+
+    bookings_bulk_changed(windows.values())
+    return outcomes
@@ -1,4 +1,6 @@
 from rest_framework import permissions
+from accounts.tokens import get_staff_department
+from bookings.permissions import get_request_booking
 
 
 class IsStaffOrAdmin(permissions.BasePermission):
@@ -17,15 +19,9 @@ class CanApproveBookings(permissions.BasePermission):
         #     return True
 
         if request.user.user_type == 'staff':
-            from accounts.models import StaffProfile
-            staff_profile = StaffProfile.objects.get(user=request.user)
             booking_id = view.kwargs.get('booking_id')
             if booking_id:
-                try:
-                    from bookings.models import Booking
-                    booking = Booking.objects.get(id=booking_id)
-                    return booking.venue.handled_by == staff_profile.department
-                except Exception as e:
-                    pass
-
-        return False
\ No newline at end of file
+                booking = get_request_booking(request, booking_id)
+                return booking is not None and booking.venue.handled_by == get_staff_department(request.user)
+
+        return False
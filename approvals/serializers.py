@@ -10,6 +10,16 @@ class ApprovalActionSerializer(serializers.Serializer):
     comment = serializers.CharField(required=False, allow_blank=True)
 
 
+class BulkApprovalActionSerializer(serializers.Serializer):
+    booking_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=500
+    )
+    action = serializers.ChoiceField(choices=['review', 'approve', 'reject', 'request-documents'])
+    comment = serializers.CharField(required=False, allow_blank=True)
+
+
 class DocumentVerificationSerializer(serializers.Serializer):
     verification_note = serializers.CharField(required=False, allow_blank=True)
 
@@ -50,6 +50,7 @@ POST    /api/approvals/{booking_id}/review/     # Mark booking as under review
 POST    /api/approvals/{booking_id}/approve/    # Approve a booking
 POST    /api/approvals/{booking_id}/reject/     # Reject a booking
 POST    /api/approvals/{booking_id}/request-documents/  # Request additional documents
+POST    /api/approvals/bulk/                    # Apply one action to many bookings {booking_ids, action, comment}
 
 # Approval workflow history
 GET     /api/approvals/{booking_id}/history/    # Get approval history for a booking
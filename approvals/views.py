@@ -1,10 +1,14 @@
-from rest_framework import viewsets, status, permissions
+from rest_framework import viewsets, status, permissions, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework.authentication import SessionAuthentication
 from django.utils import timezone
+from django.db import transaction
 from django.db.models import Count, Avg, Q, F
 from django.shortcuts import get_object_or_404
+from django.http import Http404
+from django_filters.rest_framework import DjangoFilterBackend
 
 from bookings.models import (
     Booking, BookingStatus, BookingHistory,
@@ -15,28 +19,54 @@ from bookings.serializers import (
     BookingFeedbackSerializer, BookingFileSerializer, BookingListSerializer
 )
 from .serializers import (
-    ApprovalActionSerializer, DocumentVerificationSerializer,
-    StaffCommentSerializer
+    ApprovalActionSerializer, BulkApprovalActionSerializer,
+    DocumentVerificationSerializer, StaffCommentSerializer
 )
+from .bulk import apply_bulk_action, UPDATED
+from bookings.conflicts import validate_reactivation
 from .permissions import IsStaffOrAdmin, CanApproveBookings
-from accounts.models import StaffProfile
+from bookings.pagination import SelectablePagination
+from bookings.permissions import get_request_booking
+from accounts.authentication import ClaimsJWTAuthentication
+from backend.identity import IdentityMapMixin, related
+from accounts.tokens import get_staff_department
+from backend.search import FullTextSearchFilter
+from bookings.search import booking_index
 
-class ApprovalViewSet(viewsets.ReadOnlyModelViewSet):
+# Approval endpoints authorize from the token claims instead of StaffProfile
+CLAIMS_AUTHENTICATION = [ClaimsJWTAuthentication, SessionAuthentication]
+
+
+class ApprovalViewSet(IdentityMapMixin, viewsets.ReadOnlyModelViewSet):
+    authentication_classes = CLAIMS_AUTHENTICATION
     permission_classes = [IsStaffOrAdmin]
     serializer_class = BookingDetailSerializer
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['status', 'venue__category', 'venue__handled_by']
     search_fields = ['title', 'booking_code', 'user__email']
+    search_index = booking_index
     ordering_fields = ['created_at', 'start_time', 'updated_at']
-    ordering = ['-created_at']
+    ordering = ['-created_at', '-id']
+    pagination_class = SelectablePagination
+
+    list_actions = ['list', 'pending', 'under_review', 'documents_pending']
+    query_budgets = {
+        'list': 3,
+        'retrieve': 7,
+    }
 
     def get_queryset(self):
         user = self.request.user
 
         queryset = Booking.objects.filter(requires_approval=True)
+        if self.action in self.list_actions:
+            queryset = queryset.for_list()
+        else:
+            queryset = queryset.for_detail()
+
         if user.user_type == 'staff':
-            staff_profile = StaffProfile.objects.get(user=user)
-            if staff_profile.department:
-                department = staff_profile.department
+            department = get_staff_department(user)
+            if department:
                 queryset = queryset.filter(venue__handled_by=department)
         elif user.user_type == 'student':
             queryset = queryset.filter(user=user)
@@ -44,7 +74,7 @@ class ApprovalViewSet(viewsets.ReadOnlyModelViewSet):
         return queryset
 
     def get_serializer_class(self):
-        if action in ['retrieve', 'destroy', 'partial-update', 'update']:
+        if self.action in ['retrieve', 'destroy', 'partial_update', 'update']:
             return BookingDetailSerializer
         return BookingListSerializer
 
@@ -63,6 +93,28 @@ class ApprovalViewSet(viewsets.ReadOnlyModelViewSet):
         queryset = self.get_queryset().filter(status=BookingStatus.DOCUMENTS_PENDING)
         return self._paginated_response(queryset)
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        serializer = BulkApprovalActionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        booking_ids = list(dict.fromkeys(serializer.validated_data['booking_ids']))
+        outcomes = apply_bulk_action(
+            request.user,
+            booking_ids,
+            serializer.validated_data['action'],
+            serializer.validated_data.get('comment', '')
+        )
+
+        return Response({
+            'action': serializer.validated_data['action'],
+            'updated': sum(1 for outcome in outcomes.values() if outcome == UPDATED),
+            'results': [
+                {'booking_id': booking_id, 'outcome': outcomes[booking_id]}
+                for booking_id in booking_ids
+            ]
+        })
+
     def _paginated_response(self, queryset):
         page = self.paginate_queryset(queryset)
         if page is not None:
@@ -73,11 +125,17 @@ class ApprovalViewSet(viewsets.ReadOnlyModelViewSet):
 
 
 class BookingApprovalActionView(APIView):
+    authentication_classes = CLAIMS_AUTHENTICATION
     permission_classes = [CanApproveBookings]
 
     def get_booking(self, booking_id):
-        return get_object_or_404(Booking, id=booking_id, requires_approval=True)
+        # Already loaded with its venue by CanApproveBookings for staff users
+        booking = get_request_booking(self.request, booking_id)
+        if booking is None or not booking.requires_approval:
+            raise Http404
+        return booking
 
+    @transaction.atomic
     def post(self, request, booking_id, action):
         booking = self.get_booking(booking_id)
         valid_actions = ['review', 'approve', 'reject', 'request-documents']
@@ -105,6 +163,7 @@ class BookingApprovalActionView(APIView):
         elif action == 'request-documents':
             booking.status = BookingStatus.DOCUMENTS_PENDING
 
+        validate_reactivation(booking, previous_status, booking.status)
         booking.save()
 
         history_entry = BookingHistory.objects.create(
@@ -135,6 +194,7 @@ class BookingApprovalActionView(APIView):
 
 
 class BookingApprovalHistoryView(APIView):
+    authentication_classes = CLAIMS_AUTHENTICATION
     permission_classes = [IsStaffOrAdmin]
 
     def get(self, request, booking_id):
@@ -145,6 +205,7 @@ class BookingApprovalHistoryView(APIView):
 
 
 class BookingCommentsView(APIView):
+    authentication_classes = CLAIMS_AUTHENTICATION
     permission_classes = [IsStaffOrAdmin]
 
     def get(self, request, booking_id):
@@ -179,10 +240,13 @@ class BookingCommentsView(APIView):
 
 
 class DocumentVerificationView(APIView):
+    authentication_classes = CLAIMS_AUTHENTICATION
     permission_classes = [IsStaffOrAdmin]
 
     def get(self, request, booking_id):
-        booking = get_object_or_404(Booking, id=booking_id)
+        booking = get_request_booking(request, booking_id)
+        if booking is None:
+            raise Http404
         documents = BookingFile.objects.filter(booking=booking)
         serializer = BookingFileSerializer(documents, many=True)
         return Response(serializer.data)
@@ -199,7 +263,7 @@ class DocumentVerificationView(APIView):
         document.verified_at = timezone.now()
         document.save()
 
-        booking = document.booking
+        booking = related(document, 'booking')
         all_verified = not BookingFile.objects.filter(
             booking=booking,
             is_verified=False
@@ -0,0 +1,120 @@
+"""
+Two-tier cache with tag-based invalidation.
+
+Entries live in an in-process LRU tier (the ``local`` cache alias) in front
+of a tier shared by every worker (the ``default`` alias). Each entry records
+the version of every tag it depends on; invalidating a tag writes a new
+version to the shared tier, so a stale entry is detected on the next read in
+any process, whichever tier it is found in.
+
+:class:`CachedResponseMixin` uses it to keep fully rendered JSON responses,
+so a hit skips the queryset, the serializer and the renderer.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+
+def get_response_timeout():
+    return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+
+
+class TieredCache:
+    def __init__(self, local_alias='local', shared_alias='default'):
+        self.local_alias = local_alias
+        self.shared_alias = shared_alias
+
+    @property
+    def local(self):
+        return caches[self.local_alias]
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    @staticmethod
+    def tag_key(tag):
+        return f'tag:{tag}'
+
+    def tag_versions(self, tags):
+        """Current version of each tag; tags never invalidated are at version 0."""
+        stored = self.shared.get_many([self.tag_key(tag) for tag in tags])
+        return {tag: stored.get(self.tag_key(tag), 0) for tag in tags}
+
+    def get(self, key, versions):
+        """Return the value cached under ``key`` if it was stored with ``versions``."""
+        entry = self.local.get(key)
+        if entry is None:
+            entry = self.shared.get(key)
+            if entry is not None:
+                self.local.set(key, entry)
+        if entry is None or entry['tags'] != versions:
+            return None
+        return entry['value']
+
+    def set(self, key, value, versions, timeout=None):
+        """Store ``value`` under ``key``, valid while its tags stay at ``versions``."""
+        timeout = get_response_timeout() if timeout is None else timeout
+        entry = {'tags': versions, 'value': value}
+        self.shared.set(key, entry, timeout)
+        self.local.set(key, entry, timeout)
+
+    def invalidate(self, *tags):
+        version = time.time_ns()
+        self.shared.set_many({self.tag_key(tag): version for tag in tags}, timeout=None)
+
+    def clear(self):
+        self.local.clear()
+        self.shared.clear()
+
+
+tiered_cache = TieredCache()
+
+
+class CachedResponseMixin:
+    """
+    Serve the actions listed in ``cached_actions`` from :data:`tiered_cache`.
+
+    Subclasses return the tags a response depends on from ``get_cache_tags``.
+    Only successful JSON responses are stored, keyed by the full URL, the
+    ``Accept`` header and ``get_cache_variant``, and only for safe methods.
+    """
+    cached_actions = ()
+
+    def get_cache_tags(self):
+        raise NotImplementedError
+
+    def get_cache_variant(self):
+        """Extra key material for responses that depend on more than the URL (e.g. today's date)."""
+        return ''
+
+    def get_cache_key(self, request):
+        raw = f'{request.build_absolute_uri()}|{request.META.get("HTTP_ACCEPT", "")}|{self.get_cache_variant()}'
+        return f'response:{self.basename}:{self.action}:{hashlib.sha1(raw.encode()).hexdigest()}'
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._response_cache = None
+        if self.action in self.cached_actions and request.method == 'GET':
+            key = self.get_cache_key(request)
+            versions = tiered_cache.tag_versions(self.get_cache_tags())
+            hit = tiered_cache.get(key, versions)
+            if hit is not None:
+                # dispatch() looks the handler up after initial(), so a hit replaces it
+                self.get = lambda *args, **kwargs: HttpResponse(hit[0], content_type=hit[1])
+            else:
+                self._response_cache = (key, versions)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        cached = getattr(self, '_response_cache', None)
+        if (cached and response.status_code == 200
+                and getattr(response, 'accepted_renderer', None) is not None
+                and response.accepted_renderer.format == 'json'):
+            response.render()
+            key, versions = cached
+            tiered_cache.set(key, (response.content, response['Content-Type']), versions)
+        return response
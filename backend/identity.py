@@ -0,0 +1,141 @@
+"""
+Request-scoped identity map.
+
+:class:`IdentityMapMiddleware` opens an empty map for every request and drops
+it when the response is returned. While it is open, :func:`fetch` returns the
+instance already loaded for a ``(model, pk)`` instead of querying again, and
+every instance it loads — together with the relations pulled in by
+``select_related`` — is remembered for the rest of the request. Permission
+classes, ``get_object`` (through :class:`IdentityMapMixin`) and serializer
+fields (through :class:`IdentityPrimaryKeyRelatedField`) all go through it,
+so a booking, venue or user row is read at most once per request.
+
+Outside a request (management commands, shells) there is no map and
+:func:`fetch` simply queries.
+"""
+from contextvars import ContextVar
+
+from rest_framework import serializers
+
+_current_map = ContextVar('identity_map', default=None)
+
+
+class IdentityMap:
+    def __init__(self):
+        self._instances = {}
+
+    @staticmethod
+    def key(model, pk):
+        return model._meta.concrete_model, str(pk)
+
+    def __contains__(self, key):
+        return key in self._instances
+
+    def get(self, model, pk):
+        return self._instances.get(self.key(model, pk))
+
+    def set(self, model, pk, instance):
+        self._instances[self.key(model, pk)] = instance
+
+    def add(self, instance):
+        """Remember ``instance`` and the related objects already cached on it."""
+        if instance is None or instance.pk is None:
+            return
+        key = self.key(type(instance), instance.pk)
+        if self._instances.get(key) is instance:
+            return
+        self._instances.setdefault(key, instance)
+        for related in instance._state.fields_cache.values():
+            if related is not None and hasattr(related, '_state'):
+                self.add(related)
+
+
+def current_map():
+    return _current_map.get()
+
+
+def fetch(queryset, pk):
+    """
+    Return the instance ``pk`` of ``queryset.model`` (``None`` if missing).
+
+    Only unfiltered querysets are answered from the map: a filtered one may
+    exclude rows another caller loaded, so it always queries and then
+    registers what it found.
+    """
+    identity_map = current_map()
+    model = queryset.model
+    cacheable = identity_map is not None and not queryset.query.where
+
+    if cacheable and IdentityMap.key(model, pk) in identity_map:
+        return identity_map.get(model, pk)
+
+    instance = queryset.filter(pk=pk).first()
+    if identity_map is not None:
+        identity_map.add(instance)
+        if cacheable and instance is None:
+            identity_map.set(model, pk, None)
+    return instance
+
+
+def related(instance, field_name, queryset=None):
+    """Resolve the foreign key ``field_name`` of ``instance`` through the map and cache it on ``instance``."""
+    field = instance._meta.get_field(field_name)
+    if field.is_cached(instance):
+        return getattr(instance, field_name)
+
+    pk = getattr(instance, field.attname)
+    if pk is None:
+        return None
+    obj = fetch(queryset if queryset is not None else field.related_model._default_manager.all(), pk)
+    if obj is not None:
+        field.set_cached_value(instance, obj)
+    return obj
+
+
+def remember(instance):
+    identity_map = current_map()
+    if identity_map is not None:
+        identity_map.add(instance)
+    return instance
+
+
+class IdentityMapMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _current_map.set(IdentityMap())
+        try:
+            return self.get_response(request)
+        finally:
+            _current_map.reset(token)
+
+
+class IdentityMapMixin:
+    """
+    Load the object of a detail view once, whatever the number of ``get_object``
+    calls, and register it (with its ``select_related`` relations) in the map.
+    """
+
+    def get_object(self):
+        obj = getattr(self, '_identity_object', None)
+        if obj is None:
+            obj = self._identity_object = remember(super().get_object())
+        return obj
+
+
+class IdentityPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """``PrimaryKeyRelatedField`` that resolves its value through the identity map."""
+
+    def to_internal_value(self, data):
+        if self.pk_field is not None:
+            data = self.pk_field.to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            instance = fetch(self.get_queryset(), data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if instance is None:
+            self.fail('does_not_exist', pk_value=data)
+        return instance
@@ -0,0 +1,168 @@
+"""
+Full-text search indexes.
+
+A :class:`SearchIndex` mirrors a few text columns of a table into an FTS5
+virtual table on SQLite, or into a ``tsvector`` column with a GIN index on
+PostgreSQL, keyed by the primary key of the source row. Lookups go through
+the index and return a relevance score, so their cost follows the number of
+matches instead of the size of the table. Other database vendors fall back
+to DRF's ``icontains`` search.
+
+Indexes are refreshed from SQL (``INSERT ... SELECT`` over the source
+table), so rebuilding all rows or the rows of one venue is a single
+statement rather than a loop over model instances.
+"""
+import re
+
+from django.db import connections
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+SUPPORTED_VENDORS = ('sqlite', 'postgresql')
+BATCH_SIZE = 500
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class SearchIndex:
+    """
+    ``source`` is the FROM clause the indexed values are read from, ``key``
+    the expression of the source primary key and ``columns`` maps index
+    column names to source expressions.
+    """
+
+    def __init__(self, table, source, key, columns):
+        self.table = table
+        self.source = source
+        self.key = key
+        self.columns = columns
+
+    @staticmethod
+    def is_supported(using='default'):
+        return connections[using].vendor in SUPPORTED_VENDORS
+
+    def create(self, connection):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} "
+                    f"USING fts5({', '.join(self.columns)}, tokenize='unicode61 remove_diacritics 2')"
+                )
+            elif connection.vendor == 'postgresql':
+                cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS {self.table} "
+                    f"(object_id bigint PRIMARY KEY, document tsvector NOT NULL)"
+                )
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {self.table}_document_idx "
+                    f"ON {self.table} USING GIN (document)"
+                )
+
+    def drop(self, connection):
+        if connection.vendor in SUPPORTED_VENDORS:
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE IF EXISTS {self.table}")
+
+    def _id_column(self, connection):
+        return 'rowid' if connection.vendor == 'sqlite' else 'object_id'
+
+    def _insert_sql(self, connection):
+        values = [f"COALESCE({expression}, '')" for expression in self.columns.values()]
+        if connection.vendor == 'sqlite':
+            return (
+                f"INSERT INTO {self.table} (rowid, {', '.join(self.columns)}) "
+                f"SELECT {self.key}, {', '.join(values)} FROM {self.source}"
+            )
+        return (
+            f"INSERT INTO {self.table} (object_id, document) "
+            f"SELECT {self.key}, to_tsvector('simple', concat_ws(' ', {', '.join(values)})) "
+            f"FROM {self.source}"
+        )
+
+    def reindex(self, where=None, params=(), using='default'):
+        """Rewrite the entries of the source rows matching ``where`` (all rows if omitted)."""
+        connection = connections[using]
+        if connection.vendor not in SUPPORTED_VENDORS:
+            return
+        id_column = self._id_column(connection)
+        with connection.cursor() as cursor:
+            if where is None:
+                cursor.execute(f"DELETE FROM {self.table}")
+                cursor.execute(self._insert_sql(connection))
+            else:
+                cursor.execute(
+                    f"DELETE FROM {self.table} WHERE {id_column} IN "
+                    f"(SELECT {self.key} FROM {self.source} WHERE {where})",
+                    params
+                )
+                cursor.execute(f"{self._insert_sql(connection)} WHERE {where}", params)
+
+    def update(self, pks, using='default'):
+        pks = list(pks)
+        for offset in range(0, len(pks), BATCH_SIZE):
+            batch = pks[offset:offset + BATCH_SIZE]
+            self.reindex(f"{self.key} IN ({', '.join(['%s'] * len(batch))})", batch, using)
+
+    def remove(self, pks, using='default'):
+        connection = connections[using]
+        if connection.vendor not in SUPPORTED_VENDORS:
+            return
+        pks = list(pks)
+        with connection.cursor() as cursor:
+            for offset in range(0, len(pks), BATCH_SIZE):
+                batch = pks[offset:offset + BATCH_SIZE]
+                cursor.execute(
+                    f"DELETE FROM {self.table} WHERE {self._id_column(connection)} "
+                    f"IN ({', '.join(['%s'] * len(batch))})",
+                    batch
+                )
+
+    def search(self, queryset, terms):
+        """
+        Restrict ``queryset`` to the rows matching every word of ``terms`` (as
+        prefixes) and annotate them with ``search_rank``, lower being better.
+        """
+        words = [word for term in terms for word in WORD_RE.findall(term)]
+        if not words:
+            return queryset.none()
+
+        connection = connections[queryset.db]
+        outer_pk = f'{connection.ops.quote_name(queryset.model._meta.db_table)}.' \
+                   f'{connection.ops.quote_name(queryset.model._meta.pk.column)}'
+        if connection.vendor == 'sqlite':
+            query = ' '.join(f'"{word}"*' for word in words)
+            matches = f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s"
+            rank = f"SELECT rank FROM {self.table} WHERE {self.table} MATCH %s AND rowid = {outer_pk}"
+        else:
+            query = ' & '.join(f'{word}:*' for word in words)
+            matches = f"SELECT object_id FROM {self.table} WHERE document @@ to_tsquery('simple', %s)"
+            rank = (
+                f"SELECT -ts_rank(document, to_tsquery('simple', %s)) FROM {self.table} "
+                f"WHERE object_id = {outer_pk}"
+            )
+
+        return queryset.filter(pk__in=RawSQL(matches, (query,))).annotate(
+            search_rank=RawSQL(rank, (query,))
+        )
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    ``SearchFilter`` answered by the view's ``search_index``, ranked by relevance.
+
+    Place it after ``OrderingFilter``: unless the client asked for an explicit
+    ``ordering``, results are sorted by rank with the view's ordering as the
+    tie-breaker. Views without an index, or databases without full-text
+    support, keep the ``icontains`` behaviour over ``search_fields``.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        index = getattr(view, 'search_index', None)
+        terms = self.get_search_terms(request)
+        if not terms or index is None or not index.is_supported(queryset.db):
+            return super().filter_queryset(request, queryset, view)
+
+        queryset = index.search(queryset, terms)
+        if 'search_rank' in queryset.query.annotations and api_settings.ORDERING_PARAM not in request.query_params:
+            queryset = queryset.order_by('search_rank', *queryset.query.order_by)
+        return queryset
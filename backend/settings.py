@@ -84,8 +84,26 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'backend.identity.IdentityMapMiddleware',
 ]
 
+# Venue catalog responses are cached in an in-process LRU tier in front of a
+# tier shared by all workers; point 'default' at Redis/Memcached in production
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / '.cache',
+        'TIMEOUT': 300,
+    },
+    'local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'vbms-local',
+        'TIMEOUT': 300,
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+}
+RESPONSE_CACHE_TIMEOUT = 300
+
 # CORS Configuration
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -172,3 +190,20 @@ STATIC_URL = 'static/'
 
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Booking conflict detection
+BOOKING_MAX_DURATION = timedelta(days=31)
+BOOKING_CONFLICT_INDEX_ENABLED = False
+BOOKING_CONFLICT_INDEX_TTL = 30
+
+# Booking codes reserved per worker process at a time
+BOOKING_CODE_BLOCK_SIZE = 1
+
+# Streaming calendar feeds
+CALENDAR_STREAM_CHUNK_SIZE = 2000
+CALENDAR_STREAM_MAX_DAYS = 200
+
+# Batch free/busy lookups
+FREEBUSY_MAX_DAYS = 62
+FREEBUSY_MAX_VENUES = 100
+BOOKING_SERIES_MAX_OCCURRENCES = 200
@@ -0,0 +1,106 @@
+"""
+Booking code allocation.
+
+Codes look like ``BK-YYYYMM-NNNN``. ``NNNN`` comes from a per-month counter row
+in ``BookingCodeSequence`` that is bumped with a single atomic ``UPDATE``, so
+allocation costs the same whatever the size of the month and two concurrent
+writers can never receive the same number.
+
+With ``BOOKING_CODE_BLOCK_SIZE`` above 1 every worker process reserves a block
+of numbers at once and hands them out locally; codes stay unique but may be
+issued out of order between processes and unused numbers are skipped when a
+process exits.
+"""
+import os
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Length
+from django.utils import timezone
+
+from .models import Booking, BookingCodeSequence
+
+CODE_PREFIX = 'BK'
+
+
+def current_period(moment=None):
+    moment = timezone.localtime(moment or timezone.now())
+    return f"{moment.year}{moment.month:02d}"
+
+
+def format_code(period, number):
+    return f"{CODE_PREFIX}-{period}-{number:04d}"
+
+
+def _highest_issued(period):
+    prefix = f"{CODE_PREFIX}-{period}-"
+    latest = (
+        Booking.objects.filter(booking_code__startswith=prefix)
+        .order_by(Length('booking_code').desc(), '-booking_code')
+        .values_list('booking_code', flat=True)
+        .first()
+    )
+    if latest is None:
+        return 0
+    try:
+        return int(latest[len(prefix):])
+    except ValueError:
+        return 0
+
+
+def reserve(period, count=1):
+    """Reserve ``count`` consecutive numbers for ``period`` and return them as a range."""
+    with transaction.atomic():
+        BookingCodeSequence.objects.get_or_create(
+            period=period,
+            defaults={'last_value': _highest_issued(period)},
+        )
+        BookingCodeSequence.objects.filter(period=period).update(last_value=F('last_value') + count)
+        last_value = BookingCodeSequence.objects.values_list('last_value', flat=True).get(period=period)
+    return range(last_value - count + 1, last_value + 1)
+
+
+class BookingCodeAllocator:
+    def __init__(self):
+        self._blocks = {}
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    @property
+    def block_size(self):
+        return max(1, getattr(settings, 'BOOKING_CODE_BLOCK_SIZE', 1))
+
+    def next_code(self, period=None):
+        return self.allocate(1, period)[0]
+
+    def allocate(self, count, period=None):
+        """Return ``count`` unused booking codes for ``period`` (defaults to this month)."""
+        period = period or current_period()
+        if self.block_size == 1 or count >= self.block_size:
+            return [format_code(period, number) for number in reserve(period, count)]
+
+        with self._lock:
+            if self._pid != os.getpid():
+                # Blocks reserved before a fork must not be shared with the parent
+                self._blocks.clear()
+                self._pid = os.getpid()
+
+            numbers = []
+            block = self._blocks.get(period)
+            while len(numbers) < count:
+                if not block:
+                    block = list(reserve(period, self.block_size))
+                taken = count - len(numbers)
+                numbers.extend(block[:taken])
+                block = block[taken:]
+            self._blocks[period] = block
+        return [format_code(period, number) for number in numbers]
+
+    def reset(self):
+        with self._lock:
+            self._blocks.clear()
+
+
+allocator = BookingCodeAllocator()
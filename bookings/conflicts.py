@@ -0,0 +1,182 @@
+"""
+Venue double-booking detection.
+
+Every check is a probe of the ``(venue, start_time, end_time)`` index bounded
+on both sides: a booking can only overlap ``[start, end)`` if it starts before
+``end`` and no earlier than ``start - BOOKING_MAX_DURATION``, so the range scan
+only touches the neighbours of the requested window instead of the venue's
+whole history.
+
+An optional in-process interval index (``BOOKING_CONFLICT_INDEX_ENABLED``)
+keeps the upcoming bookings of each venue in memory so repeated attempts
+against the same hall are answered by a primary-key lookup of the candidates
+instead of a range scan. The index is never trusted on its own: hits are
+confirmed against the database (another process may have cancelled or moved
+them; a stale index is dropped) and a miss always falls through to the
+database probe, so it can neither let a double booking through nor reject a
+slot that has been freed.
+"""
+import bisect
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from venues.models import Venue
+from .models import Booking, BookingStatus
+
+NON_BLOCKING_STATUSES = (BookingStatus.CANCELLED, BookingStatus.REJECTED)
+
+
+def get_max_duration():
+    return getattr(settings, 'BOOKING_MAX_DURATION', timedelta(days=31))
+
+
+def blocking_bookings():
+    return Booking.objects.exclude(status__in=NON_BLOCKING_STATUSES)
+
+
+def find_conflicts(venue_id, start_time, end_time, exclude_pk=None):
+    """Return the blocking bookings of ``venue_id`` overlapping ``[start_time, end_time)``."""
+    queryset = blocking_bookings().filter(
+        venue_id=venue_id,
+        start_time__gt=start_time - get_max_duration(),
+        start_time__lt=end_time,
+        end_time__gt=start_time,
+    )
+    if exclude_pk is not None:
+        queryset = queryset.exclude(pk=exclude_pk)
+    return queryset.order_by('start_time')
+
+
+class VenueIntervalIndex:
+    """
+    Upcoming blocking bookings of one venue, sorted by start time.
+
+    ``max_ends[i]`` is the latest end among the first ``i + 1`` intervals, which
+    lets an overlap query walk backwards from the insertion point of ``end``
+    and stop as soon as nothing further left can reach ``start``.
+    """
+
+    def __init__(self, intervals):
+        self.intervals = sorted(intervals)
+        self.starts = [interval[0] for interval in self.intervals]
+        self.max_ends = []
+        latest = None
+        for _, interval_end, _ in self.intervals:
+            latest = interval_end if latest is None or interval_end > latest else latest
+            self.max_ends.append(latest)
+        self.built_at = time.monotonic()
+
+    def overlapping(self, start_time, end_time, exclude_pk=None):
+        matches = []
+        index = bisect.bisect_left(self.starts, end_time) - 1
+        while index >= 0 and self.max_ends[index] > start_time:
+            interval_start, interval_end, pk = self.intervals[index]
+            if interval_end > start_time and pk != exclude_pk:
+                matches.append(pk)
+            index -= 1
+        return matches
+
+
+class IntervalIndexRegistry:
+    """Per-process cache of :class:`VenueIntervalIndex`, warmed lazily per venue."""
+
+    def __init__(self):
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'BOOKING_CONFLICT_INDEX_TTL', 30)
+
+    def get(self, venue_id):
+        with self._lock:
+            index = self._indexes.get(venue_id)
+        if index is None or time.monotonic() - index.built_at > self.ttl:
+            index = self._build(venue_id)
+            with self._lock:
+                self._indexes[venue_id] = index
+        return index
+
+    def invalidate(self, venue_id=None):
+        with self._lock:
+            if venue_id is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(venue_id, None)
+
+    def _build(self, venue_id):
+        rows = blocking_bookings().filter(
+            venue_id=venue_id,
+            end_time__gt=timezone.now(),
+        ).values_list('start_time', 'end_time', 'pk')
+        return VenueIntervalIndex(rows)
+
+
+interval_indexes = IntervalIndexRegistry()
+
+
+def index_enabled():
+    return getattr(settings, 'BOOKING_CONFLICT_INDEX_ENABLED', False)
+
+
+def has_conflict(venue_id, start_time, end_time, exclude_pk=None):
+    conflicts = find_conflicts(venue_id, start_time, end_time, exclude_pk)
+    if index_enabled() and end_time > timezone.now():
+        hits = interval_indexes.get(venue_id).overlapping(start_time, end_time, exclude_pk)
+        if hits:
+            if conflicts.filter(pk__in=hits).exists():
+                return True
+            interval_indexes.invalidate(venue_id)
+    return conflicts.exists()
+
+
+CONFLICT_MESSAGE = 'The venue is already booked for the requested time.'
+
+
+def validate_window_bounds(start_time, end_time):
+    """Raise ``ValidationError`` if the window is empty, reversed or too long."""
+    if start_time >= end_time:
+        raise serializers.ValidationError({'end_time': 'End time must be after start time.'})
+
+    if end_time - start_time > get_max_duration():
+        raise serializers.ValidationError({
+            'end_time': f'A booking cannot last longer than {get_max_duration()}.'
+        })
+
+
+def validate_booking_window(venue, start_time, end_time, exclude_pk=None):
+    """Raise ``ValidationError`` if the window is malformed or already taken."""
+    validate_window_bounds(start_time, end_time)
+
+    if has_conflict(venue.pk, start_time, end_time, exclude_pk):
+        raise serializers.ValidationError({'non_field_errors': [CONFLICT_MESSAGE]})
+
+
+def validate_reactivation(booking, previous_status, new_status):
+    """
+    Raise ``ValidationError`` if moving ``booking`` from a non-blocking
+    ``previous_status`` to ``new_status`` would make it overlap a booking that
+    took its slot meanwhile. Call inside a transaction: the venue is locked
+    first.
+    """
+    if previous_status in NON_BLOCKING_STATUSES and new_status not in NON_BLOCKING_STATUSES:
+        lock_venue(booking.venue)
+        validate_booking_window(booking.venue, booking.start_time, booking.end_time, exclude_pk=booking.pk)
+
+
+def lock_venue(venue):
+    """Serialize concurrent writers of ``venue`` until the current transaction ends."""
+    if transaction.get_connection().in_atomic_block:
+        Venue.objects.select_for_update().filter(pk=venue.pk).exists()
+
+
+def lock_venues(venue_ids):
+    """``lock_venue`` for several venues with one query, in a fixed order to avoid deadlocks."""
+    if venue_ids and transaction.get_connection().in_atomic_block:
+        list(Venue.objects.select_for_update().filter(pk__in=venue_ids).order_by('pk').values_list('pk', flat=True))
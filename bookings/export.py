@@ -0,0 +1,138 @@
+"""
+Streaming booking exports.
+
+Rows are read with ``iterator(chunk_size=...)`` over a ``values()``
+projection, the optional related data joined or subqueried into the same
+statement, and written as CSV or NDJSON a chunk at a time (optionally
+through a gzip stream), so memory stays flat whatever the number of rows.
+"""
+import csv
+import io
+import zlib
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, OuterRef, Subquery
+
+from .models import BookingHistory
+
+FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+}
+
+BASE_COLUMNS = [
+    'id', 'booking_code', 'title', 'status', 'start_time', 'end_time',
+    'attendees_count', 'payment_completed', 'documents_verified',
+    'created_at', 'updated_at', 'venue_id', 'user_id', 'series_id',
+]
+
+# Optional groups of columns: output name -> lookup path
+RELATED_COLUMNS = {
+    'venue': {
+        'venue_name': 'venue__name',
+        'venue_location': 'venue__location',
+        'venue_category': 'venue__category',
+    },
+    'user': {
+        'user_email': 'user__email',
+        'user_first_name': 'user__first_name',
+        'user_last_name': 'user__last_name',
+    },
+    'event_detail': {
+        'event_type': 'event_detail__event_type',
+        'organizer_name': 'event_detail__organizer_name',
+        'organizer_contact': 'event_detail__organizer_contact',
+        'budget': 'event_detail__budget',
+    },
+}
+HISTORY_COLUMNS = {
+    'last_changed_at': 'timestamp',
+    'last_change_status': 'new_status',
+    'last_change_comment': 'comment',
+}
+INCLUDES = tuple(RELATED_COLUMNS) + ('history',)
+
+
+def get_chunk_size():
+    return getattr(settings, 'BOOKING_EXPORT_CHUNK_SIZE', 2000)
+
+
+def parse_includes(value):
+    """Split a comma-separated ``include`` value, raising ``ValueError`` on unknown groups."""
+    includes = [name.strip() for name in (value or '').split(',') if name.strip()]
+    unknown = set(includes) - set(INCLUDES)
+    if unknown:
+        raise ValueError(f'Unknown include: {", ".join(sorted(unknown))}. Choose from {", ".join(INCLUDES)}')
+    return [name for name in INCLUDES if name in includes]
+
+
+def export_rows(queryset, includes=()):
+    """Return ``(columns, rows)`` with ``rows`` an iterator of dicts, one query in chunks."""
+    expressions = {}
+    for name in includes:
+        if name == 'history':
+            latest = BookingHistory.objects.filter(booking=OuterRef('pk')).order_by('-timestamp', '-id')
+            expressions.update({alias: Subquery(latest.values(field)[:1]) for alias, field in HISTORY_COLUMNS.items()})
+        else:
+            expressions.update({alias: F(path) for alias, path in RELATED_COLUMNS[name].items()})
+
+    columns = BASE_COLUMNS + list(expressions)
+    rows = queryset.values(*BASE_COLUMNS, **expressions).iterator(chunk_size=get_chunk_size())
+    return columns, rows
+
+
+def _format_value(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def csv_chunks(columns, rows, chunk_size):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow([_format_value(row[column]) for column in columns])
+        if count % chunk_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def ndjson_chunks(columns, rows, chunk_size):
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    lines = []
+    for row in rows:
+        lines.append(encoder.encode({column: row[column] for column in columns}))
+        if len(lines) >= chunk_size:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(queryset, export_format='csv', includes=(), compress=False):
+    """Bytes of the export of ``queryset``, produced lazily."""
+    columns, rows = export_rows(queryset, includes)
+    chunk_size = get_chunk_size()
+    writer = csv_chunks if export_format == 'csv' else ndjson_chunks
+    chunks = (text.encode('utf-8') for text in writer(columns, rows, chunk_size) if text)
+    return gzip_chunks(chunks) if compress else chunks
+
+
+def export_filename(export_format, compress, stamp):
+    extension = FORMATS[export_format][1]
+    return f'bookings-{stamp}.{extension}' + ('.gz' if compress else '')
@@ -0,0 +1,292 @@
+"""
+NDJSON booking import.
+
+Lines are read lazily and handled ``BOOKING_IMPORT_CHUNK_SIZE`` at a time.
+Each chunk is validated in memory, its venue and user references are
+resolved with one query per kind (and remembered for the following chunks),
+its windows are checked against the existing bookings of its venues with one
+range query, and its bookings, event details and initial history entries are
+written with ``bulk_create`` inside the chunk's own transaction, with booking
+codes reserved as one block. A bad line never aborts the import: it is
+reported with its line number and the other lines go on. A dry run writes
+nothing, so the windows it accepts are kept in memory for the whole import
+and later chunks are checked against them as they would be against the rows
+a real import commits.
+"""
+import bisect
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+from rest_framework import serializers
+
+from venues.models import Venue
+from .codes import allocator
+from .conflicts import (
+    CONFLICT_MESSAGE, NON_BLOCKING_STATUSES, VenueIntervalIndex, blocking_bookings, get_max_duration,
+    lock_venues
+)
+from .models import Booking, BookingHistory, BookingStatus, EventDetail
+from .search import booking_index
+from .serializers import BookingImportSerializer
+from .signals import bookings_bulk_changed
+
+User = get_user_model()
+
+IMPORT_COMMENT = 'Imported'
+
+
+def get_chunk_size():
+    return getattr(settings, 'BOOKING_IMPORT_CHUNK_SIZE', 500)
+
+
+class ImportReport:
+    def __init__(self, dry_run=False):
+        self.dry_run = dry_run
+        self.created = 0
+        self.errors = []
+
+    def fail(self, line, errors):
+        self.errors.append({'line': line, 'errors': errors})
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'failed': len(self.errors),
+            'dry_run': self.dry_run,
+            'errors': self.errors,
+        }
+
+
+def venue_key(row):
+    return ('id', row['venue_id']) if 'venue_id' in row else ('name', row['venue'])
+
+
+def user_key(row):
+    return ('id', row['user_id']) if 'user_id' in row else ('email', row['user_email'])
+
+
+class References:
+    """Venues by id or name and users by id or email, looked up per chunk and kept for the next ones."""
+
+    def __init__(self):
+        self.venues = {}
+        self.users = {}
+
+    def load(self, rows):
+        venues = Venue.objects.only('id', 'name', 'handled_by')
+        self._fetch(self.venues, venues, 'name', {venue_key(row) for row in rows})
+        self._fetch(self.users, User.objects.only('id', 'email'), 'email', {user_key(row) for row in rows})
+
+    @staticmethod
+    def _fetch(cache, queryset, name_field, keys):
+        keys -= set(cache)
+        if not keys:
+            return
+        for key in keys:
+            cache[key] = []
+        ids = [value for kind, value in keys if kind == 'id']
+        names = [value for kind, value in keys if kind == name_field]
+        for obj in queryset.filter(Q(pk__in=ids) | Q(**{f'{name_field}__in': names})):
+            for key in (('id', obj.pk), (name_field, getattr(obj, name_field))):
+                if key in keys:
+                    cache[key].append(obj)
+
+    def venue(self, row):
+        matches = self.venues.get(venue_key(row), [])
+        field = 'venue_id' if 'venue_id' in row else 'venue'
+        if not matches:
+            raise serializers.ValidationError({field: f'Unknown venue {row[field]}.'})
+        if len(matches) > 1:
+            raise serializers.ValidationError({field: 'Several venues have this name; use venue_id.'})
+        return matches[0]
+
+    def user(self, row):
+        matches = self.users.get(user_key(row), [])
+        field = 'user_id' if 'user_id' in row else 'user_email'
+        if not matches:
+            raise serializers.ValidationError({field: f'Unknown user {row[field]}.'})
+        return matches[0]
+
+
+def parse_lines(lines, report):
+    """Yield ``(line_number, payload)`` for the JSON objects of ``lines``, reporting the others."""
+    for number, line in enumerate(lines, start=1):
+        if isinstance(line, bytes):
+            try:
+                line = line.decode('utf-8')
+            except UnicodeDecodeError:
+                report.fail(number, {'non_field_errors': ['The line is not valid UTF-8.']})
+                continue
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            payload = json.loads(line)
+        except ValueError as error:
+            report.fail(number, {'non_field_errors': [f'Invalid JSON: {error}.']})
+            continue
+        if not isinstance(payload, dict):
+            report.fail(number, {'non_field_errors': ['Each line must be a JSON object.']})
+            continue
+        yield number, payload
+
+
+def chunked(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class AcceptedWindows:
+    """
+    Non-overlapping windows accepted so far, per venue and sorted by start:
+    only the last window starting before ``end`` can reach past ``start``.
+    """
+
+    def __init__(self):
+        self.starts = defaultdict(list)
+        self.ends = defaultdict(list)
+
+    def overlaps(self, venue_id, start_time, end_time):
+        index = bisect.bisect_left(self.starts[venue_id], end_time)
+        return index > 0 and self.ends[venue_id][index - 1] > start_time
+
+    def add(self, venue_id, start_time, end_time):
+        index = bisect.bisect_left(self.starts[venue_id], start_time)
+        self.starts[venue_id].insert(index, start_time)
+        self.ends[venue_id].insert(index, end_time)
+
+
+def without_conflicts(entries, report, taken=None):
+    """
+    Drop and report the blocking entries that overlap an existing booking or
+    an earlier entry, using one range query for all venues. Earlier entries
+    are those of the chunk, or of ``taken`` when it is carried across chunks.
+    """
+    blocking = [entry for entry in entries if entry[3]['status'] not in NON_BLOCKING_STATUSES]
+    if not blocking:
+        return entries
+
+    span_start = min(data['start_time'] for _, _, _, data in blocking)
+    span_end = max(data['end_time'] for _, _, _, data in blocking)
+    existing = defaultdict(list)
+    for venue_id, start_time, end_time, pk in blocking_bookings().filter(
+        venue_id__in={venue.pk for _, venue, _, _ in blocking},
+        start_time__gt=span_start - get_max_duration(),
+        start_time__lt=span_end,
+        end_time__gt=span_start,
+    ).values_list('venue_id', 'start_time', 'end_time', 'pk'):
+        existing[venue_id].append((start_time, end_time, pk))
+    indexes = {venue_id: VenueIntervalIndex(intervals) for venue_id, intervals in existing.items()}
+
+    accepted = []
+    taken = AcceptedWindows() if taken is None else taken
+    for entry in entries:
+        line, venue, _, data = entry
+        if data['status'] not in NON_BLOCKING_STATUSES:
+            start_time, end_time = data['start_time'], data['end_time']
+            index = indexes.get(venue.pk)
+            if (index and index.overlapping(start_time, end_time)) or taken.overlaps(venue.pk, start_time, end_time):
+                report.fail(line, {'non_field_errors': [CONFLICT_MESSAGE]})
+                continue
+            taken.add(venue.pk, start_time, end_time)
+        accepted.append(entry)
+    return accepted
+
+
+def write_chunk(entries, changed_by):
+    """Create the bookings of ``entries`` with their event details and history; return them."""
+    bookings = []
+    for code, (_, venue, owner, data) in zip(allocator.allocate(len(entries)), entries):
+        booking = Booking(
+            user=owner,
+            venue=venue,
+            booking_code=code,
+            title=data['title'],
+            description=data['description'],
+            start_time=data['start_time'],
+            end_time=data['end_time'],
+            attendees_count=data['attendees_count'],
+            status=data['status'],
+        )
+        booking.apply_venue_requirements(venue)
+        bookings.append(booking)
+    Booking.objects.bulk_create(bookings)
+
+    EventDetail.objects.bulk_create([
+        EventDetail(booking=booking, **data['event_detail'])
+        for booking, (_, _, _, data) in zip(bookings, entries)
+        if data.get('event_detail')
+    ])
+    BookingHistory.objects.bulk_create([
+        BookingHistory(
+            booking=booking,
+            previous_status=BookingStatus.DRAFT,
+            new_status=booking.status,
+            changed_by=changed_by,
+            comment=IMPORT_COMMENT,
+            handled_by_role=getattr(changed_by, 'user_type', '')
+        )
+        for booking in bookings
+    ])
+    return bookings
+
+
+def import_chunk(chunk, references, report, changed_by=None, taken=None):
+    valid = []
+    for line, payload in chunk:
+        serializer = BookingImportSerializer(data=payload)
+        if serializer.is_valid():
+            valid.append((line, serializer.validated_data))
+        else:
+            report.fail(line, serializer.errors)
+    if not valid:
+        return
+
+    references.load([data for _, data in valid])
+    entries = []
+    for line, data in valid:
+        try:
+            entries.append((line, references.venue(data), references.user(data), data))
+        except serializers.ValidationError as error:
+            report.fail(line, error.detail)
+    if not entries:
+        return
+
+    with transaction.atomic():
+        # Same lock as single bookings, taken for every venue of the chunk at once
+        lock_venues({venue.pk for _, venue, _, _ in entries})
+        entries = without_conflicts(entries, report, taken)
+        if not entries or report.dry_run:
+            report.created += len(entries)
+            return
+        bookings = write_chunk(entries, changed_by)
+
+    report.created += len(bookings)
+    booking_index.update(booking.pk for booking in bookings)
+    bookings_bulk_changed((booking.venue_id, booking.start_time, booking.end_time) for booking in bookings)
+
+
+def import_bookings(lines, changed_by=None, dry_run=False):
+    """
+    Import the NDJSON ``lines`` (``str`` or ``bytes``) and return an
+    ``ImportReport``; with ``dry_run`` everything is checked but nothing is
+    written.
+    """
+    report = ImportReport(dry_run=dry_run)
+    references = References()
+    # A real import finds earlier chunks in the table; a dry run has to remember them
+    taken = AcceptedWindows() if dry_run else None
+    for chunk in chunked(parse_lines(lines, report), get_chunk_size()):
+        import_chunk(chunk, references, report, changed_by, taken)
+    report.errors.sort(key=lambda error: error['line'])
+    return report
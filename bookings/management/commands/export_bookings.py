@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from bookings import export
+from bookings.models import Booking, BookingStatus
+from bookings.search import booking_index
+
+
+class Command(BaseCommand):
+    help = 'Stream bookings as CSV or NDJSON to a file or standard output.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', dest='export_format', choices=sorted(export.FORMATS), default='csv')
+        parser.add_argument(
+            '--include', default='',
+            help=f'Comma-separated related data among {", ".join(export.INCLUDES)}.'
+        )
+        parser.add_argument('--gzip', action='store_true', help='Compress the output with gzip.')
+        parser.add_argument('--output', '-o', help='Destination file (standard output by default).')
+        parser.add_argument('--status', action='append', choices=BookingStatus.values)
+        parser.add_argument('--venue', type=int, action='append', dest='venues')
+        parser.add_argument('--search', help='Full-text search terms.')
+
+    def handle(self, *args, **options):
+        try:
+            includes = export.parse_includes(options['include'])
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        queryset = Booking.objects.order_by('id')
+        if options['status']:
+            queryset = queryset.filter(status__in=options['status'])
+        if options['venues']:
+            queryset = queryset.filter(venue_id__in=options['venues'])
+        if options['search']:
+            if not booking_index.is_supported():
+                raise CommandError('Full-text search is not available on this database.')
+            queryset = booking_index.search(queryset, [options['search']])
+
+        chunks = export.export_stream(queryset, options['export_format'], includes, options['gzip'])
+        if options['output']:
+            with open(options['output'], 'wb') as output:
+                for chunk in chunks:
+                    output.write(chunk)
+            self.stderr.write(self.style.SUCCESS(f'Exported bookings to {options["output"]}'))
+            return
+
+        buffer = getattr(self.stdout, 'buffer', None)
+        if buffer is None and options['gzip']:
+            raise CommandError('--gzip needs --output when standard output is not a binary stream.')
+        for chunk in chunks:
+            if buffer is not None:
+                buffer.write(chunk)
+            else:
+                self.stdout.write(chunk.decode('utf-8'), ending='')
+        if buffer is not None:
+            buffer.flush()
@@ -0,0 +1,47 @@
+import json
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.utils.encoders import JSONEncoder
+
+from bookings import importer
+
+
+class Command(BaseCommand):
+    help = 'Import bookings from an NDJSON file, one booking object per line.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='NDJSON file to read, or - for standard input.')
+        parser.add_argument('--changed-by', help='Email of the user recorded in the initial history entries.')
+        parser.add_argument('--dry-run', action='store_true', help='Validate every line without writing anything.')
+        parser.add_argument('--report', help='Write the per-line errors to this file as NDJSON.')
+
+    def handle(self, *args, **options):
+        changed_by = None
+        if options['changed_by']:
+            try:
+                changed_by = get_user_model().objects.get(email=options['changed_by'])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f'Unknown user {options["changed_by"]}')
+
+        if options['path'] == '-':
+            report = importer.import_bookings(sys.stdin, changed_by, options['dry_run'])
+        else:
+            try:
+                with open(options['path'], 'rb') as lines:
+                    report = importer.import_bookings(lines, changed_by, options['dry_run'])
+            except OSError as error:
+                raise CommandError(str(error))
+
+        if options['report']:
+            with open(options['report'], 'w', encoding='utf-8') as output:
+                for error in report.errors:
+                    output.write(json.dumps(error, cls=JSONEncoder) + '\n')
+        else:
+            for error in report.errors:
+                self.stderr.write(f'Line {error["line"]}: {json.dumps(error["errors"], cls=JSONEncoder)}')
+
+        verb = 'Would import' if options['dry_run'] else 'Imported'
+        message = f'{verb} {report.created} bookings, {len(report.errors)} lines failed'
+        self.stdout.write(self.style.WARNING(message) if report.errors else self.style.SUCCESS(message))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from backend.search import SearchIndex
+from bookings.search import booking_index
+from venues.search import venue_index
+
+INDEXES = {
+    'venues': venue_index,
+    'bookings': booking_index,
+}
+
+
+class Command(BaseCommand):
+    help = 'Recreate the full-text search indexes of venues and bookings from their tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'indexes', nargs='*',
+            help=f'Indexes to rebuild among {", ".join(sorted(INDEXES))} (all of them by default).'
+        )
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        using = options['database']
+        connection = connections[using]
+        if not SearchIndex.is_supported(using):
+            raise CommandError(f'Full-text search is not supported on {connection.vendor}.')
+
+        names = options['indexes'] or sorted(INDEXES)
+        unknown = set(names) - set(INDEXES)
+        if unknown:
+            raise CommandError(f'Unknown search index: {", ".join(sorted(unknown))}')
+
+        for name in names:
+            index = INDEXES[name]
+            with transaction.atomic(using=using):
+                index.drop(connection)
+                index.create(connection)
+                index.reindex(using=using)
+            with connection.cursor() as cursor:
+                cursor.execute(f'SELECT COUNT(*) FROM {index.table}')
+                count = cursor.fetchone()[0]
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt {name} index ({count} rows)'))
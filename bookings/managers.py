@@ -0,0 +1,24 @@
+from django.db import models
+
+
+class BookingQuerySet(models.QuerySet):
+    # Columns read by BookingListSerializer; the description text is never loaded for lists
+    LIST_FIELDS = (
+        'id', 'booking_code', 'title', 'start_time', 'end_time', 'status',
+        'created_at', 'payment_required', 'payment_completed',
+        'documents_required', 'documents_verified',
+        'venue', 'venue__name', 'venue__location',
+        'user', 'user__first_name', 'user__last_name', 'user__email',
+    )
+
+    def for_list(self):
+        return self.select_related('venue', 'user').only(*self.LIST_FIELDS)
+
+    def for_detail(self):
+        from .models import BookingFeedback
+
+        return self.select_related('venue', 'user', 'event_detail').prefetch_related(
+            'files',
+            'history__changed_by',
+            models.Prefetch('feedback', queryset=BookingFeedback.objects.select_related('staff')),
+        )
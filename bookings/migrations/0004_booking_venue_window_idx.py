@@ -0,0 +1,20 @@
+# Generated by Django 5.2 on 2026-10-17 11:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0003_alter_booking_status'),
+        ('venues', '0002_venue_required_document_types'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['venue', 'start_time', 'end_time'], name='booking_venue_window_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-17 11:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0004_booking_venue_window_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingCodeSequence',
+            fields=[
+                ('period', models.CharField(help_text='Month the counter belongs to, as YYYYMM', max_length=6, primary_key=True, serialize=False)),
+                ('last_value', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Booking Code Sequence',
+                'verbose_name_plural': 'Booking Code Sequences',
+                'db_table': 'booking_code_sequence',
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2 on 2026-10-17 11:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0005_bookingcodesequence'),
+        ('venues', '0002_venue_required_document_types'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['-created_at', '-id'], name='booking_created_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['start_time', 'id'], name='booking_start_keyset_idx'),
+        ),
+    ]
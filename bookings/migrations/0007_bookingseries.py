@@ -0,0 +1,44 @@
+# Generated by Django 5.2 on 2026-10-17 11:34
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0006_booking_keyset_indexes'),
+        ('venues', '0003_venueoccupancy'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingSeries',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('attendees_count', models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+                ('first_start', models.DateTimeField(help_text='Start of the first occurrence')),
+                ('duration', models.DurationField()),
+                ('rrule', models.CharField(help_text='Recurrence rule, e.g. FREQ=WEEKLY;BYDAY=MO,WE;COUNT=12', max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='booking_series', to=settings.AUTH_USER_MODEL)),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='booking_series', to='venues.venue')),
+            ],
+            options={
+                'verbose_name': 'Booking Series',
+                'verbose_name_plural': 'Booking Series',
+                'db_table': 'booking_series',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='series',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='bookings', to='bookings.bookingseries'),
+        ),
+    ]
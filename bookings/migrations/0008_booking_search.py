@@ -0,0 +1,58 @@
+from django.db import migrations
+
+# Frozen copy of bookings.search.booking_index as of this migration: later
+# changes to the index ship their own migration instead of rewriting this one.
+SOURCE = 'booking b JOIN venue v ON v.id = b.venue_id JOIN auth_user u ON u.id = b.user_id'
+VALUES = (
+    "COALESCE(b.title, ''), COALESCE(b.description, ''), COALESCE(b.booking_code, ''), "
+    "COALESCE(v.name, ''), COALESCE(u.email, '')"
+)
+
+FORWARD_SQL = {
+    'sqlite': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS booking_search "
+        "USING fts5(title, description, booking_code, venue_name, user_email, "
+        "tokenize='unicode61 remove_diacritics 2')",
+        "DELETE FROM booking_search",
+        "INSERT INTO booking_search (rowid, title, description, booking_code, venue_name, user_email) "
+        f"SELECT b.id, {VALUES} FROM {SOURCE}",
+    ],
+    'postgresql': [
+        "CREATE TABLE IF NOT EXISTS booking_search (object_id bigint PRIMARY KEY, document tsvector NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS booking_search_document_idx ON booking_search USING GIN (document)",
+        "DELETE FROM booking_search",
+        "INSERT INTO booking_search (object_id, document) "
+        f"SELECT b.id, to_tsvector('simple', concat_ws(' ', {VALUES})) FROM {SOURCE}",
+    ],
+}
+
+REVERSE_SQL = {
+    'sqlite': ["DROP TABLE IF EXISTS booking_search"],
+    'postgresql': ["DROP TABLE IF EXISTS booking_search"],
+}
+
+
+def execute(schema_editor, statements):
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def create_index(apps, schema_editor):
+    execute(schema_editor, FORWARD_SQL)
+
+
+def drop_index(apps, schema_editor):
+    execute(schema_editor, REVERSE_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0007_bookingseries'),
+        ('venues', '0005_venue_search'),
+        ('accounts', '0003_rename_room_number_studentprofile_roomnumber'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
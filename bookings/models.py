@@ -4,6 +4,7 @@ from django.utils.translation import gettext_lazy as _
 from django.core.validators import MinValueValidator
 from django.utils import timezone
 from venues.models import Venue
+from .managers import BookingQuerySet
 
 User = get_user_model()
 
@@ -20,9 +21,44 @@ class BookingStatus(models.TextChoices):
     DOCUMENTS_PENDING = 'documents_pending', _('Documents Pending')
 
 
+class BookingSeries(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='booking_series')
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='booking_series')
+    title = models.CharField(max_length=255)
+    description = models.TextField(blank=True)
+    attendees_count = models.PositiveIntegerField(validators=[MinValueValidator(1)])
+    first_start = models.DateTimeField(help_text="Start of the first occurrence")
+    duration = models.DurationField()
+    rrule = models.CharField(max_length=255, help_text="Recurrence rule, e.g. FREQ=WEEKLY;BYDAY=MO,WE;COUNT=12")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        db_table = 'booking_series'
+        verbose_name = 'Booking Series'
+        verbose_name_plural = 'Booking Series'
+
+    def __str__(self):
+        return f"{self.title} ({self.rrule})"
+
+    def get_rule(self):
+        from .recurrence import RecurrenceRule
+        return RecurrenceRule.parse(self.rrule)
+
+    def occurrences(self, window_start=None, window_end=None):
+        """Lazily yield ``(start, end)`` of every occurrence overlapping the window."""
+        if window_start is not None:
+            # An occurrence starting up to one duration earlier still overlaps the window
+            window_start -= self.duration
+        for start in self.get_rule().occurrences(self.first_start, window_start, window_end):
+            yield start, start + self.duration
+
+
 class Booking(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='bookings')
     venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='bookings')
+    series = models.ForeignKey(BookingSeries, on_delete=models.SET_NULL, null=True, blank=True,
+                               related_name='bookings')
 
     booking_code = models.CharField(max_length=20, unique=True, editable=False)
     title = models.CharField(max_length=255)
@@ -52,6 +88,8 @@ class Booking(models.Model):
     documents_required = models.BooleanField(default=False)
     documents_verified = models.BooleanField(default=False)
 
+    objects = BookingQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         indexes = [
@@ -59,6 +97,9 @@ class Booking(models.Model):
             models.Index(fields=['user']),
             models.Index(fields=['venue']),
             models.Index(fields=['start_time', 'end_time']),
+            models.Index(fields=['venue', 'start_time', 'end_time'], name='booking_venue_window_idx'),
+            models.Index(fields=['-created_at', '-id'], name='booking_created_keyset_idx'),
+            models.Index(fields=['start_time', 'id'], name='booking_start_keyset_idx'),
         ]
         db_table = 'booking'
 
@@ -77,22 +118,32 @@ class Booking(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.booking_code:
-            now = timezone.now()
-            year = now.year
-            month = now.month
-            count = Booking.objects.filter(
-                created_at__year=year,
-                created_at__month=month
-            ).count() + 1
-            self.booking_code = f"BK-{year}{month:02d}-{count:04d}"
+            from .codes import allocator
+            self.booking_code = allocator.next_code()
 
         if not self.pk:
-            handled_by = self.venue.handled_by
-            self.payment_required = handled_by == 'ppk'
-            self.documents_required = handled_by == 'sa' or handled_by == 'ppk'
+            self.apply_venue_requirements(self.venue)
 
         super().save(*args, **kwargs)
 
+    def apply_venue_requirements(self, venue):
+        handled_by = venue.handled_by
+        self.payment_required = handled_by == 'ppk'
+        self.documents_required = handled_by == 'sa' or handled_by == 'ppk'
+
+
+class BookingCodeSequence(models.Model):
+    period = models.CharField(max_length=6, primary_key=True, help_text="Month the counter belongs to, as YYYYMM")
+    last_value = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'booking_code_sequence'
+        verbose_name = 'Booking Code Sequence'
+        verbose_name_plural = 'Booking Code Sequences'
+
+    def __str__(self):
+        return f"{self.period}: {self.last_value}"
+
 
 class EventDetail(models.Model):
     booking = models.OneToOneField(Booking, on_delete=models.CASCADE, related_name='event_detail')
@@ -0,0 +1,80 @@
+from rest_framework.pagination import BasePagination, CursorPagination, PageNumberPagination
+
+
+class BookingCursorPagination(CursorPagination):
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class CalendarCursorPagination(CursorPagination):
+    ordering = ('start_time', 'id')
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+
+class SelectablePagination(BasePagination):
+    """
+    Page-number pagination by default, keyset pagination on request.
+
+    Clients opt in with ``?pagination=cursor`` and then follow the ``next`` and
+    ``previous`` links, which carry a ``cursor`` parameter. A keyset page is a
+    single index range scan and never runs a ``COUNT(*)``, so its cost does not
+    grow with how deep the client pages.
+    """
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+    page_number_class = PageNumberPagination
+    cursor_class = BookingCursorPagination
+
+    def __init__(self):
+        self.delegate = None
+
+    def use_cursor(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == self.cursor_mode
+            or self.cursor_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_cursor(request):
+            self.delegate = self.cursor_class()
+        elif self.page_number_class is not None:
+            self.delegate = self.page_number_class()
+        else:
+            self.delegate = None
+            return None
+        return self.delegate.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.delegate.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return (self.page_number_class or self.cursor_class)().get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = [{
+            'name': self.mode_query_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Set to "cursor" for keyset pagination.',
+            'schema': {'type': 'string', 'enum': [self.cursor_mode]},
+        }]
+        for pagination_class in (self.page_number_class, self.cursor_class):
+            if pagination_class is not None:
+                parameters.extend(pagination_class().get_schema_operation_parameters(view))
+        return parameters
+
+    def to_html(self):
+        return self.delegate.to_html() if self.delegate else ''
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.delegate, 'display_page_controls', False)
+
+
+class CalendarPagination(SelectablePagination):
+    """Calendar feeds stay unpaginated unless keyset pagination is requested."""
+    page_number_class = None
+    cursor_class = CalendarCursorPagination
@@ -1,58 +1,50 @@
 from rest_framework import permissions
+from backend.identity import fetch, related
 from .models import Booking, BookingStatus
 
+OWNER_MANAGEABLE_STATUSES = (BookingStatus.PENDING, BookingStatus.APPROVED)
 
-class CanManageBooking(permissions.BasePermission):
+
+def get_request_booking(request, booking_pk):
+    """
+    Load booking ``booking_pk`` with its venue in one joined query.
+
+    The row goes through the request's identity map, so permissions and the
+    view that follows share the same instance.
+    """
+    try:
+        return fetch(Booking.objects.select_related('venue'), booking_pk)
+    except (ValueError, TypeError):
+        return None
+
+
+def can_manage_booking(user, booking):
     """
-    Permission to check if user can manage a booking:
+    Whether ``user`` can manage ``booking``:
     - Owner can manage if booking is in pending or approved status
     - Staff/admin can manage regardless of status
     """
+    if user.is_staff or user.is_superuser:
+        return True
+
+    return booking.user_id == user.pk and booking.status in OWNER_MANAGEABLE_STATUSES
 
+
+class CanManageBooking(permissions.BasePermission):
     def has_permission(self, request, view):
-        # Get the booking
         booking_pk = view.kwargs.get('booking_pk')
         if not booking_pk:
             return False
 
-        try:
-            booking = Booking.objects.get(pk=booking_pk)
-        except Booking.DoesNotExist:
-            return False
-
-        # Check if user is staff/admin
-        if request.user.is_staff or request.user.is_superuser:
-            return True
-
-        # Check if user is the owner
-        if booking.user != request.user:
-            return False
-
-        # Owner can only manage in certain statuses
-        if booking.status in [BookingStatus.PENDING, BookingStatus.APPROVED]:
-            return True
-
-        return False
+        booking = get_request_booking(request, booking_pk)
+        return booking is not None and can_manage_booking(request.user, booking)
 
     def has_object_permission(self, request, view, obj):
-        # Get the booking
         if isinstance(obj, Booking):
             booking = obj
-        elif hasattr(obj, 'booking'):
-            booking = obj.booking
+        elif hasattr(obj, 'booking_id'):
+            booking = related(obj, 'booking', Booking.objects.select_related('venue'))
         else:
             return False
 
-        # Check if user is staff/admin
-        if request.user.is_staff or request.user.is_superuser:
-            return True
-
-        # Check if user is the owner
-        if booking.user != request.user:
-            return False
-
-        # Owner can only manage in certain statuses
-        if booking.status in [BookingStatus.PENDING, BookingStatus.APPROVED]:
-            return True
-
-        return False
\ No newline at end of file
+        return booking is not None and can_manage_booking(request.user, booking)
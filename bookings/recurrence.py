@@ -0,0 +1,125 @@
+"""
+A small RRULE subset for recurring bookings.
+
+Supported parts: ``FREQ`` (``DAILY`` or ``WEEKLY``), ``INTERVAL``, ``BYDAY``
+(weekly rules only), ``COUNT`` and ``UNTIL``, e.g.
+``FREQ=WEEKLY;INTERVAL=1;BYDAY=MO,WE;UNTIL=20270131``.
+
+Occurrences are generated lazily and in local wall-clock time, so a weekly
+09:00 booking stays at 09:00 across DST changes.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.utils import timezone
+
+WEEKDAYS = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+FREQUENCIES = ('DAILY', 'WEEKLY')
+
+
+class RecurrenceRule:
+    def __init__(self, freq, interval=1, byday=None, count=None, until=None):
+        self.freq = freq
+        self.interval = interval
+        self.byday = sorted(byday) if byday else None
+        self.count = count
+        self.until = until
+
+    @classmethod
+    def parse(cls, value):
+        """Parse an RRULE string, raising ``ValueError`` with a readable message."""
+        parts = {}
+        for part in value.strip().upper().removeprefix('RRULE:').split(';'):
+            if not part:
+                continue
+            key, _, item = part.partition('=')
+            if not item:
+                raise ValueError(f'Malformed rule part "{part}".')
+            parts[key] = item
+
+        unknown = set(parts) - {'FREQ', 'INTERVAL', 'BYDAY', 'COUNT', 'UNTIL'}
+        if unknown:
+            raise ValueError(f'Unsupported rule parts: {", ".join(sorted(unknown))}.')
+
+        freq = parts.get('FREQ')
+        if freq not in FREQUENCIES:
+            raise ValueError(f'FREQ must be one of {", ".join(FREQUENCIES)}.')
+
+        try:
+            interval = int(parts.get('INTERVAL', 1))
+            count = int(parts['COUNT']) if 'COUNT' in parts else None
+        except ValueError:
+            raise ValueError('INTERVAL and COUNT must be integers.')
+        if interval < 1 or (count is not None and count < 1):
+            raise ValueError('INTERVAL and COUNT must be positive.')
+
+        byday = None
+        if 'BYDAY' in parts:
+            if freq != 'WEEKLY':
+                raise ValueError('BYDAY is only supported for weekly rules.')
+            try:
+                byday = {WEEKDAYS.index(day) for day in parts['BYDAY'].split(',')}
+            except ValueError:
+                raise ValueError(f'BYDAY values must be among {", ".join(WEEKDAYS)}.')
+
+        until = None
+        if 'UNTIL' in parts:
+            until = cls._parse_until(parts['UNTIL'])
+
+        if count is not None and until is not None:
+            raise ValueError('COUNT and UNTIL cannot be combined.')
+
+        return cls(freq, interval=interval, byday=byday, count=count, until=until)
+
+    @staticmethod
+    def _parse_until(value):
+        for fmt in ('%Y%m%dT%H%M%SZ', '%Y%m%dT%H%M%S', '%Y%m%d'):
+            try:
+                moment = datetime.strptime(value, fmt)
+            except ValueError:
+                continue
+            if fmt == '%Y%m%d':
+                moment = moment.replace(hour=23, minute=59, second=59)
+            if fmt.endswith('Z'):
+                return moment.replace(tzinfo=dt_timezone.utc)
+            return timezone.make_aware(moment)
+        raise ValueError('UNTIL must be formatted as YYYYMMDD or YYYYMMDDTHHMMSSZ.')
+
+    @property
+    def is_bounded(self):
+        return self.count is not None or self.until is not None
+
+    def _candidate_dates(self, first_date):
+        if self.freq == 'DAILY':
+            step = timedelta(days=self.interval)
+            day = first_date
+            while True:
+                yield day
+                day += step
+
+        weekdays = self.byday or [first_date.weekday()]
+        week_start = first_date - timedelta(days=first_date.weekday())
+        step = timedelta(weeks=self.interval)
+        while True:
+            for weekday in weekdays:
+                day = week_start + timedelta(days=weekday)
+                if day >= first_date:
+                    yield day
+            week_start += step
+
+    def occurrences(self, dtstart, window_start=None, window_end=None):
+        """Yield aware occurrence starts from ``dtstart``, optionally limited to a window."""
+        local_start = timezone.localtime(dtstart)
+        wall_clock = local_start.time().replace(tzinfo=None)
+        produced = 0
+
+        for day in self._candidate_dates(local_start.date()):
+            moment = timezone.make_aware(datetime.combine(day, wall_clock))
+            if self.until is not None and moment > self.until:
+                return
+            if window_end is not None and moment >= window_end:
+                return
+            produced += 1
+            if window_start is None or moment >= window_start:
+                yield moment
+            if self.count is not None and produced >= self.count:
+                return
@@ -0,0 +1,16 @@
+from backend.search import SearchIndex
+
+# The venue name and the owner's email are copied into the entry, so the
+# bookings of a venue or user are reindexed when those change.
+booking_index = SearchIndex(
+    table='booking_search',
+    source='booking b JOIN venue v ON v.id = b.venue_id JOIN auth_user u ON u.id = b.user_id',
+    key='b.id',
+    columns={
+        'title': 'b.title',
+        'description': 'b.description',
+        'booking_code': 'b.booking_code',
+        'venue_name': 'v.name',
+        'user_email': 'u.email',
+    },
+)
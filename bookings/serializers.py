@@ -1,10 +1,12 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from venues.models import Venue
 from venues.serializers import VenueSerializer
 from datetime import datetime
 from .models import (
     Booking,
+    BookingSeries,
     EventDetail,
     BookingFile,
     BookingHistory,
@@ -14,9 +16,26 @@ from .models import (
 )
 from django.utils import timezone
 from accounts.serializers import UserMinimalSerializer
+from backend.identity import IdentityPrimaryKeyRelatedField
+from .conflicts import (
+    validate_booking_window, validate_window_bounds, validate_reactivation, lock_venue, get_max_duration
+)
+from .recurrence import RecurrenceRule
 
 User = get_user_model()
 
+STATUS_COLORS = {
+    'pending': '#FFC107',  # Amber
+    'approved': '#4CAF50',  # Green
+    'rejected': '#F44336',  # Red
+    'cancelled': '#9E9E9E',  # Grey
+    'completed': '#2196F3',  # Blue
+    'under_review': '#FF9800',  # Orange
+    'payment_pending': '#E91E63',  # Pink
+    'documents_pending': '#673AB7',  # Deep Purple
+}
+DEFAULT_STATUS_COLOR = '#9C27B0'  # Purple
+
 
 class BookingFileSerializer(serializers.ModelSerializer):
     document_type_display = serializers.CharField(source='document_type', read_only=True)
@@ -119,7 +138,7 @@ class BookingListSerializer(serializers.ModelSerializer):
 
 class BookingDetailSerializer(serializers.ModelSerializer):
     venue = VenueSerializer(read_only=True)
-    venue_id = serializers.PrimaryKeyRelatedField(
+    venue_id = IdentityPrimaryKeyRelatedField(
         queryset=Venue.objects.all(),
         write_only=True,
         source='venue'
@@ -154,14 +173,15 @@ class BookingDetailSerializer(serializers.ModelSerializer):
 
     def get_feedback(self, obj):
         request = self.context.get('request')
-        queryset = obj.feedback.all()
+        # Filter in memory so a prefetched feedback list is reused instead of re-queried
+        feedback = obj.feedback.all()
 
         if request and request.user.is_authenticated:
             if request.user.is_staff or request.user.is_superuser:
-                return BookingFeedbackSerializer(queryset, many=True).data
+                return BookingFeedbackSerializer(feedback, many=True).data
 
-        queryset = queryset.filter(is_internal=False)
-        return BookingFeedbackSerializer(queryset, many=True).data
+        feedback = [entry for entry in feedback if not entry.is_internal]
+        return BookingFeedbackSerializer(feedback, many=True).data
 
     def create(self, validated_data):
         request = self.context.get('request')
@@ -195,8 +215,25 @@ class BookingDetailSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError({
                 'attendees_count': 'Attendees count must be greater than zero.'
             })
+        if self.instance is not None and {'venue', 'start_time', 'end_time'} & set(data):
+            validate_booking_window(*self._window(data), exclude_pk=self.instance.pk)
         return data
 
+    def _window(self, data):
+        return (
+            data.get('venue', self.instance.venue),
+            data.get('start_time', self.instance.start_time),
+            data.get('end_time', self.instance.end_time),
+        )
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        if {'venue', 'start_time', 'end_time'} & set(validated_data):
+            venue, start_time, end_time = self._window(validated_data)
+            lock_venue(venue)
+            validate_booking_window(venue, start_time, end_time, exclude_pk=instance.pk)
+        return super().update(instance, validated_data)
+
 
 class BookingStatusUpdateSerializer(serializers.ModelSerializer):
     comment = serializers.CharField(required=False, write_only=True)
@@ -209,6 +246,7 @@ class BookingStatusUpdateSerializer(serializers.ModelSerializer):
         model = Booking
         fields = ('status', 'comment', 'handled_by_role', 'feedback', 'feedback_is_internal', 'feedback_type')
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         request = self.context.get('request')
         user = request.user if request and request.user.is_authenticated else None
@@ -223,6 +261,7 @@ class BookingStatusUpdateSerializer(serializers.ModelSerializer):
         # Track old status for history
         old_status = instance.status
         new_status = validated_data.get('status', old_status)
+        validate_reactivation(instance, old_status, new_status)
 
         # Update booking status
         instance = super().update(instance, validated_data)
@@ -258,7 +297,7 @@ class BookingStatusUpdateSerializer(serializers.ModelSerializer):
 
 
 class BookingCreateSerializer(serializers.ModelSerializer):
-    venue_id = serializers.PrimaryKeyRelatedField(
+    venue_id = IdentityPrimaryKeyRelatedField(
         queryset=Venue.objects.all(),
         source='venue'
     )
@@ -271,7 +310,16 @@ class BookingCreateSerializer(serializers.ModelSerializer):
             'end_time', 'attendees_count', 'event_detail', 'id', 'booking_code'
         )
 
+    def validate(self, data):
+        validate_booking_window(data['venue'], data['start_time'], data['end_time'])
+        return data
+
+    @transaction.atomic
     def create(self, validated_data):
+        # Re-check under the venue lock so concurrent requests cannot both pass validation
+        lock_venue(validated_data['venue'])
+        validate_booking_window(validated_data['venue'], validated_data['start_time'], validated_data['end_time'])
+
         # Extract event detail data if present
         event_detail_data = validated_data.pop('event_detail', None)
 
@@ -311,14 +359,88 @@ class BookingCalendarSerializer(serializers.ModelSerializer):
         return None
 
     def get_color(self, obj):
-        status_colors = {
-            'pending': '#FFC107',  # Amber
-            'approved': '#4CAF50',  # Green
-            'rejected': '#F44336',  # Red
-            'cancelled': '#9E9E9E',  # Grey
-            'completed': '#2196F3',  # Blue
-            'under_review': '#FF9800',  # Orange
-            'payment_pending': '#E91E63',  # Pink
-            'documents_pending': '#673AB7',  # Deep Purple
-        }
-        return status_colors.get(obj.status, '#9C27B0')  # Default: Purple
\ No newline at end of file
+        return STATUS_COLORS.get(obj.status, DEFAULT_STATUS_COLOR)
+
+
+class BookingSeriesSerializer(serializers.ModelSerializer):
+    venue_id = IdentityPrimaryKeyRelatedField(
+        queryset=Venue.objects.all(),
+        source='venue'
+    )
+    venue_name = serializers.CharField(source='venue.name', read_only=True)
+    start_time = serializers.DateTimeField(source='first_start')
+    end_time = serializers.DateTimeField(write_only=True)
+    occurrence_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = BookingSeries
+        fields = (
+            'id', 'venue_id', 'venue_name', 'title', 'description',
+            'attendees_count', 'start_time', 'end_time', 'duration',
+            'rrule', 'occurrence_count', 'created_at'
+        )
+        read_only_fields = ('duration', 'created_at')
+
+    def validate_rrule(self, value):
+        try:
+            rule = RecurrenceRule.parse(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        if not rule.is_bounded:
+            raise serializers.ValidationError('The rule must end with COUNT or UNTIL.')
+        return value
+
+    def validate(self, data):
+        end_time = data.pop('end_time')
+        if end_time <= data['first_start']:
+            raise serializers.ValidationError({'end_time': 'End time must be after start time.'})
+        data['duration'] = end_time - data['first_start']
+        if data['duration'] > get_max_duration():
+            raise serializers.ValidationError({
+                'end_time': f'An occurrence cannot last longer than {get_max_duration()}.'
+            })
+        return data
+
+    @transaction.atomic
+    def create(self, validated_data):
+        from .series import materialize
+
+        request = self.context.get('request')
+        if request and request.user.is_authenticated:
+            validated_data['user'] = request.user
+
+        series = super().create(validated_data)
+        series.occurrence_count = len(materialize(series))
+        return series
+
+
+class ImportedEventDetailSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = EventDetail
+        exclude = ('booking',)
+
+
+class BookingImportSerializer(serializers.Serializer):
+    """
+    One line of a booking import. Venue and user references are only checked
+    for shape here; ``bookings.importer`` resolves them in batches.
+    """
+    venue_id = serializers.IntegerField(min_value=1, required=False)
+    venue = serializers.CharField(max_length=100, required=False, help_text="Venue name")
+    user_id = serializers.IntegerField(min_value=1, required=False)
+    user_email = serializers.EmailField(required=False)
+    title = serializers.CharField(max_length=255)
+    description = serializers.CharField(required=False, allow_blank=True, default='')
+    start_time = serializers.DateTimeField()
+    end_time = serializers.DateTimeField()
+    attendees_count = serializers.IntegerField(min_value=1)
+    status = serializers.ChoiceField(choices=BookingStatus.choices, default=BookingStatus.DRAFT)
+    event_detail = ImportedEventDetailSerializer(required=False)
+
+    def validate(self, data):
+        if 'venue_id' not in data and 'venue' not in data:
+            raise serializers.ValidationError({'venue_id': 'Either venue_id or venue is required.'})
+        if 'user_id' not in data and 'user_email' not in data:
+            raise serializers.ValidationError({'user_id': 'Either user_id or user_email is required.'})
+        validate_window_bounds(data['start_time'], data['end_time'])
+        return data
@@ -0,0 +1,92 @@
+"""Materialization of recurring booking series."""
+from django.conf import settings
+from django.db import transaction
+from rest_framework import serializers
+
+from .codes import allocator
+from .conflicts import VenueIntervalIndex, blocking_bookings, get_max_duration, lock_venue
+from .models import Booking
+from .search import booking_index
+from .signals import bookings_bulk_changed
+
+
+def get_max_occurrences():
+    return getattr(settings, 'BOOKING_SERIES_MAX_OCCURRENCES', 200)
+
+
+def expand(series):
+    """Return every ``(start, end)`` of a bounded series, refusing oversized ones."""
+    limit = get_max_occurrences()
+    windows = []
+    for window in series.occurrences():
+        windows.append(window)
+        if len(windows) > limit:
+            raise serializers.ValidationError({
+                'rrule': f'A series cannot have more than {limit} occurrences.'
+            })
+    if not windows:
+        raise serializers.ValidationError({'rrule': 'The rule does not produce any occurrence.'})
+    return windows
+
+
+def find_conflicts(venue_id, windows):
+    """
+    Return the windows that overlap an existing blocking booking or each other.
+
+    Existing bookings for the whole span are loaded with one range query and
+    matched in memory, instead of probing the database once per occurrence.
+    """
+    span_start = min(start for start, _ in windows)
+    span_end = max(end for _, end in windows)
+    existing = blocking_bookings().filter(
+        venue_id=venue_id,
+        start_time__gt=span_start - get_max_duration(),
+        start_time__lt=span_end,
+        end_time__gt=span_start,
+    ).values_list('start_time', 'end_time', 'pk')
+    index = VenueIntervalIndex(existing)
+
+    conflicts = []
+    previous_end = None
+    for start, end in sorted(windows):
+        if index.overlapping(start, end) or (previous_end is not None and start < previous_end):
+            conflicts.append((start, end))
+        previous_end = end if previous_end is None else max(previous_end, end)
+    return conflicts
+
+
+@transaction.atomic
+def materialize(series, status=None):
+    """Create one Booking per occurrence of ``series`` with a single ``bulk_create``."""
+    windows = expand(series)
+    lock_venue(series.venue)
+
+    conflicts = find_conflicts(series.venue_id, windows)
+    if conflicts:
+        field = serializers.DateTimeField()
+        raise serializers.ValidationError({
+            'conflicts': [field.to_representation(start) for start, _ in conflicts]
+        })
+
+    extra = {'status': status} if status else {}
+    bookings = []
+    for code, (start, end) in zip(allocator.allocate(len(windows)), windows):
+        booking = Booking(
+            user=series.user,
+            venue=series.venue,
+            series=series,
+            booking_code=code,
+            title=series.title,
+            description=series.description,
+            start_time=start,
+            end_time=end,
+            attendees_count=series.attendees_count,
+            **extra
+        )
+        booking.apply_venue_requirements(series.venue)
+        bookings.append(booking)
+
+    created = Booking.objects.bulk_create(bookings, batch_size=500)
+    booking_index.reindex('b.series_id = %s', [series.pk])
+    bookings_bulk_changed((series.venue_id, start, end) for start, end in windows)
+    return created
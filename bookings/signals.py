@@ -47,4 +47,97 @@
 #                 new_status=BookingStatus.DOCUMENTS_PENDING,
 #                 changed_by=None,
 #                 comment="Automatic status update: Documents required"
-#             )
\ No newline at end of file
+#             )
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+from venues.models import Venue
+from venues.occupancy import booking_days
+from venues.signals import venue_days_changed
+from .conflicts import interval_indexes
+from .models import Booking
+from .search import booking_index
+
+User = get_user_model()
+
+SEARCH_FIELDS = {'title', 'description', 'booking_code', 'venue', 'user'}
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def invalidate_interval_index(sender, instance, **kwargs):
+    interval_indexes.invalidate(instance.venue_id)
+
+
+@receiver(pre_save, sender=Booking)
+def remember_booking_window(sender, instance, **kwargs):
+    # The days a booking occupied before the save must be refreshed as well
+    instance._previous_window = None
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and not {'venue', 'start_time', 'end_time'} & set(update_fields):
+        return
+    if instance.pk:
+        instance._previous_window = Booking.objects.filter(pk=instance.pk).values_list(
+            'venue_id', 'start_time', 'end_time'
+        ).first()
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def booking_days_changed(sender, instance, **kwargs):
+    if isinstance(kwargs.get('origin'), Venue):
+        return
+    days = booking_days(instance.venue_id, instance.start_time, instance.end_time)
+    previous_window = getattr(instance, '_previous_window', None)
+    if previous_window:
+        days |= booking_days(*previous_window)
+    venue_days_changed.send(sender=sender, days=days)
+
+
+@receiver(post_save, sender=Booking)
+def index_booking(sender, instance, **kwargs):
+    update_fields = kwargs.get('update_fields')
+    if update_fields is None or SEARCH_FIELDS & set(update_fields):
+        booking_index.update([instance.pk])
+
+
+@receiver(post_delete, sender=Booking)
+def unindex_booking(sender, instance, **kwargs):
+    booking_index.remove([instance.pk])
+
+
+@receiver(pre_save, sender=Venue)
+@receiver(pre_save, sender=User)
+def remember_indexed_name(sender, instance, **kwargs):
+    # The venue name and the owner's email are copied into booking entries
+    field = 'name' if sender is Venue else 'email'
+    instance._previous_indexed_name = None
+    update_fields = kwargs.get('update_fields')
+    if instance.pk and (update_fields is None or field in update_fields):
+        instance._previous_indexed_name = sender.objects.filter(pk=instance.pk).values_list(
+            field, flat=True
+        ).first()
+
+
+@receiver(post_save, sender=Venue)
+@receiver(post_save, sender=User)
+def reindex_named_bookings(sender, instance, created, **kwargs):
+    field, column = ('name', 'b.venue_id') if sender is Venue else ('email', 'b.user_id')
+    previous = getattr(instance, '_previous_indexed_name', None)
+    if not created and previous is not None and previous != getattr(instance, field):
+        booking_index.reindex(f'{column} = %s', [instance.pk])
+
+
+def bookings_bulk_changed(windows):
+    """
+    Stand-in for the model signals above after bulk writes (``bulk_create``,
+    ``QuerySet.update``) that bypass them. ``windows`` is an iterable of
+    ``(venue_id, start_time, end_time)``.
+    """
+    days = set()
+    for venue_id, start_time, end_time in windows:
+        days |= booking_days(venue_id, start_time, end_time)
+        interval_indexes.invalidate(venue_id)
+    if days:
+        venue_days_changed.send(sender=Booking, days=days)
@@ -0,0 +1,103 @@
+"""
+Incremental JSON output for large booking feeds.
+
+Rows are read with ``iterator(chunk_size=...)`` over a ``values_list``
+projection and written out a chunk at a time, so the memory of a response
+stays bounded by the chunk size rather than by the number of bookings.
+"""
+from datetime import datetime, time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import serializers
+
+from .models import BookingStatus
+from .serializers import STATUS_COLORS, DEFAULT_STATUS_COLOR
+
+CALENDAR_COLUMNS = (
+    'id', 'title', 'start_time', 'end_time',
+    'venue__name', 'venue__location', 'status',
+)
+
+
+def get_chunk_size():
+    return getattr(settings, 'CALENDAR_STREAM_CHUNK_SIZE', 2000)
+
+
+def get_max_window():
+    return getattr(settings, 'CALENDAR_STREAM_MAX_DAYS', 200)
+
+
+def parse_bound(value):
+    """Parse a ``start``/``end`` query value given as an ISO date or datetime."""
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            return None
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def validate_window(start, end):
+    """Return an error message if ``[start, end]`` is not a bounded calendar window."""
+    if start is None or end is None:
+        return 'Streaming requires both start and end (YYYY-MM-DD or ISO 8601 datetime).'
+    if end < start:
+        return 'end must not be before start.'
+    if (end - start).days > get_max_window():
+        return f'The streaming window cannot exceed {get_max_window()} days.'
+    return None
+
+
+def calendar_rows(queryset, url_prefix):
+    datetime_field = serializers.DateTimeField()
+    status_labels = dict(BookingStatus.choices)
+    rows = queryset.order_by('start_time', 'id').values_list(*CALENDAR_COLUMNS)
+
+    for pk, title, start_time, end_time, venue_name, venue_location, status in rows.iterator(
+            chunk_size=get_chunk_size()):
+        yield {
+            'id': pk,
+            'title': title,
+            'start_time': datetime_field.to_representation(start_time),
+            'end_time': datetime_field.to_representation(end_time),
+            'venue_name': venue_name,
+            'venue_location': venue_location,
+            'status': status,
+            'status_display': str(status_labels.get(status, status)),
+            'url': f'{url_prefix}{pk}/' if url_prefix else None,
+            'color': STATUS_COLORS.get(status, DEFAULT_STATUS_COLOR),
+        }
+
+
+def stream_json_array(rows, chunk_size=None):
+    chunk_size = chunk_size or get_chunk_size()
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    yield '['
+    buffer = []
+    first = True
+    for row in rows:
+        buffer.append(encoder.encode(row))
+        if len(buffer) >= chunk_size:
+            yield ('' if first else ',') + ','.join(buffer)
+            first = False
+            buffer = []
+    if buffer:
+        yield ('' if first else ',') + ','.join(buffer)
+    yield ']'
+
+
+def calendar_stream_response(queryset, request):
+    url_prefix = request.build_absolute_uri('/api/bookings/') if request else None
+    return StreamingHttpResponse(
+        stream_json_array(calendar_rows(queryset, url_prefix)),
+        content_type='application/json',
+    )
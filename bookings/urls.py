@@ -7,13 +7,15 @@ from .views import (
     BookingViewSet,
     EventDetailViewSet,
     BookingFileViewSet,
-    CalendarViewSet
+    CalendarViewSet,
+    BookingSeriesViewSet
 )
 
 # Main router for bookings
 router = DefaultRouter()
 router.register(r'bookings', BookingViewSet, basename='booking')
 router.register(r'calendar', CalendarViewSet, basename='calendar')
+router.register(r'booking-series', BookingSeriesViewSet, basename='booking-series')
 
 # Nested router for event details
 booking_router = routers.NestedSimpleRouter(router, r'bookings', lookup='booking')
@@ -28,6 +30,8 @@ urlpatterns = [
 """
 # Bookings
 GET    /api/bookings/                       # List bookings (filtered by user role)
+GET    /api/bookings/export/                # Stream bookings as CSV/NDJSON (?export_format=&include=&compress=gzip)
+POST   /api/bookings/import/                # Import NDJSON bookings with a per-line error report (staff, ?dry_run=true)
 POST   /api/bookings/                       # Create new booking request
 GET    /api/bookings/{id}/                  # Get booking details
 PUT    /api/bookings/{id}/                  # Update booking (if still pending)
@@ -47,6 +51,12 @@ GET    /api/bookings/{id}/files/             # Get uploaded files list
 GET    /api/bookings/{id}/files/{file_id}/   # Download specific file
 DELETE /api/bookings/{id}/files/{file_id}/   # Delete uploaded file
 
+# Recurring Bookings
+POST   /api/booking-series/                 # Create a series and materialize its occurrences
+GET    /api/booking-series/                 # List own series (all for staff)
+GET    /api/booking-series/{id}/            # Get series details
+GET    /api/booking-series/{id}/occurrences/?start=&end=  # Expand occurrences over a window
+
 # Booking Calendar
 GET    /api/calendar/                       # Get calendar events (bookings)
 GET    /api/calendar/venue/{id}/            # Get calendar for specific venue
@@ -1,19 +1,28 @@
-from rest_framework import viewsets, generics, status, filters
+from rest_framework import viewsets, generics, status, filters, mixins
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.exceptions import PermissionDenied
-from django.shortcuts import get_object_or_404
+from rest_framework import serializers
 from django.utils import timezone
-from django.http import FileResponse
+from datetime import timedelta
+from django.http import FileResponse, Http404, StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from accounts.permissions import IsOwnerOrStaff, IsStaffOrReadOnly
-from .permissions import CanManageBooking
-from django.db.models import Q
+from backend.identity import IdentityMapMixin, fetch
+from backend.search import FullTextSearchFilter
+from .permissions import CanManageBooking, get_request_booking
+from .pagination import SelectablePagination, CalendarPagination
+from .streaming import calendar_stream_response, parse_bound, validate_window
+from .search import booking_index
+from .parsers import NDJSONParser
+from . import export, importer
+from django.db.models import Q, Count
 
 from .models import (
     Booking,
+    BookingSeries,
     EventDetail,
     BookingFile,
     BookingFeedback,
@@ -30,25 +39,40 @@ from .serializers import (
     BookingFileSerializer,
     BookingFeedbackSerializer,
     BookingHistorySerializer,
-    BookingCalendarSerializer
+    BookingCalendarSerializer,
+    BookingSeriesSerializer
 )
 
 
-class BookingViewSet(viewsets.ModelViewSet):
+class BookingViewSet(IdentityMapMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['status', 'venue', 'payment_completed', 'documents_verified']
     search_fields = ['title', 'description', 'booking_code', 'venue__name']
+    search_index = booking_index
     ordering_fields = ['created_at', 'start_time', 'end_time', 'status']
-    ordering = ['-created_at']
+    ordering = ['-created_at', '-id']
+    pagination_class = SelectablePagination
+    detail_actions = ['retrieve', 'update', 'partial_update']
+    # Maximum number of queries each action may issue, whatever the number of rows
+    query_budgets = {
+        'list': 2,
+        'retrieve': 6,
+    }
 
     def get_queryset(self):
         user = self.request.user
 
+        queryset = Booking.objects.all()
+        if self.action == 'list':
+            queryset = queryset.for_list()
+        elif self.action in self.detail_actions:
+            queryset = queryset.for_detail()
+
         if user.is_staff or user.is_superuser:
-            return Booking.objects.all()
+            return queryset
 
-        return Booking.objects.filter(user=user)
+        return queryset.filter(user=user)
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -89,6 +113,54 @@ class BookingViewSet(viewsets.ModelViewSet):
 
         return super().update(request, *args, **kwargs)
 
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        # ``format`` is taken by DRF's renderer negotiation
+        export_format = request.query_params.get('export_format', 'csv')
+        if export_format not in export.FORMATS:
+            return Response(
+                {'detail': f'export_format must be one of {", ".join(export.FORMATS)}.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            includes = export.parse_includes(request.query_params.get('include'))
+        except ValueError as error:
+            return Response({'detail': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        compress = request.query_params.get('compress') == 'gzip'
+
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            export.export_stream(queryset, export_format, includes, compress),
+            content_type='application/gzip' if compress else export.FORMATS[export_format][0],
+        )
+        filename = export.export_filename(export_format, compress, timezone.localdate().strftime('%Y%m%d'))
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @action(detail=False, methods=['post'], url_path='import',
+            permission_classes=[IsAuthenticated, IsAdminUser],
+            parser_classes=[NDJSONParser, MultiPartParser])
+    def import_bookings(self, request):
+        if request.content_type.startswith('multipart/'):
+            lines = request.FILES.get('file')
+            if lines is None:
+                return Response(
+                    {'error': 'Upload the NDJSON document as "file"'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        else:
+            lines = request.data
+
+        report = importer.import_bookings(
+            lines,
+            changed_by=request.user,
+            dry_run=request.query_params.get('dry_run') in ('1', 'true'),
+        )
+        return Response(
+            report.as_dict(),
+            status=status.HTTP_201_CREATED if report.created and not report.dry_run else status.HTTP_200_OK
+        )
+
     @action(detail=True, methods=['put'], url_path='status')
     def update_status(self, request, pk=None):
         booking = self.get_object()
@@ -109,6 +181,8 @@ class BookingViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(booking, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
+            # Re-read so the response includes the history and feedback just written
+            booking = Booking.objects.for_detail().get(pk=booking.pk)
             return Response(BookingDetailSerializer(booking, context={'request': request}).data)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -147,8 +221,15 @@ class EventDetailViewSet(viewsets.GenericViewSet):
     serializer_class = EventDetailSerializer
 
     def get_booking(self):
+        # event_detail is joined so the hasattr() checks below cost no query
         booking_id = self.kwargs.get('booking_pk')
-        return get_object_or_404(Booking, pk=booking_id)
+        try:
+            booking = fetch(Booking.objects.select_related('event_detail'), booking_id)
+        except (ValueError, TypeError):
+            booking = None
+        if booking is None:
+            raise Http404
+        return booking
 
     def retrieve(self, request, booking_pk=None, pk=None):
         booking = self.get_booking()
@@ -203,19 +284,26 @@ class EventDetailViewSet(viewsets.GenericViewSet):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class BookingFileViewSet(viewsets.ModelViewSet):
+class BookingFileViewSet(IdentityMapMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated, CanManageBooking]
     serializer_class = BookingFileSerializer
     parser_classes = [MultiPartParser, FormParser]
+    query_budgets = {
+        'list': 3,
+        'retrieve': 2,
+        'create': 2,
+    }
+
+    def get_booking(self):
+        # Loaded and authorized by CanManageBooking earlier in the request
+        return get_request_booking(self.request, self.kwargs.get('booking_pk'))
 
     def get_queryset(self):
-        booking_id = self.kwargs.get('booking_pk')
-        return BookingFile.objects.filter(booking_id=booking_id)
+        return BookingFile.objects.filter(booking=self.get_booking())
 
     def perform_create(self, serializer):
-        booking_id = self.kwargs.get('booking_pk')
         serializer.save(
-            booking_id=booking_id,
+            booking=self.get_booking(),
             uploaded_by=self.request.user
         )
 
@@ -245,12 +333,13 @@ class CalendarViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = BookingCalendarSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['status', 'venue']
+    pagination_class = CalendarPagination
 
     def get_queryset(self):
-        start_date = self.request.query_params.get('start')
-        end_date = self.request.query_params.get('end')
+        start_date = parse_bound(self.request.query_params.get('start'))
+        end_date = parse_bound(self.request.query_params.get('end'))
 
-        queryset = Booking.objects.all()
+        queryset = Booking.objects.select_related('venue')
 
         if start_date:
             queryset = queryset.filter(end_time__gte=start_date)
@@ -269,8 +358,7 @@ class CalendarViewSet(viewsets.ReadOnlyModelViewSet):
                 )
             )
 
-        serializer = self.get_serializer(queryset, many=True, context={'request': request})
-        return Response(serializer.data)
+        return self._calendar_response(queryset)
 
     @action(detail=False, methods=['get'], url_path='venue/(?P<venue_id>[^/.]+)')
     def venue_calendar(self, request, venue_id=None):
@@ -281,11 +369,72 @@ class CalendarViewSet(viewsets.ReadOnlyModelViewSet):
                 Q(status=BookingStatus.APPROVED) | Q(user=request.user)
             )
 
-        serializer = self.get_serializer(queryset, many=True, context={'request': request})
-        return Response(serializer.data)
+        return self._calendar_response(queryset)
 
     @action(detail=False, methods=['get'], url_path='user')
     def user_calendar(self, request):
         queryset = self.filter_queryset(self.get_queryset().filter(user=request.user))
-        serializer = self.get_serializer(queryset, many=True, context={'request': request})
-        return Response(serializer.data)
\ No newline at end of file
+        return self._calendar_response(queryset)
+
+    def _calendar_response(self, queryset):
+        if self.request.query_params.get('stream') in ('1', 'true'):
+            start = parse_bound(self.request.query_params.get('start'))
+            end = parse_bound(self.request.query_params.get('end'))
+            error = validate_window(start, end)
+            if error:
+                return Response({'detail': error}, status=status.HTTP_400_BAD_REQUEST)
+            return calendar_stream_response(queryset, self.request)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+
+class BookingSeriesViewSet(IdentityMapMixin,
+                           mixins.CreateModelMixin,
+                           mixins.ListModelMixin,
+                           mixins.RetrieveModelMixin,
+                           viewsets.GenericViewSet):
+    permission_classes = [IsAuthenticated]
+    serializer_class = BookingSeriesSerializer
+
+    def get_queryset(self):
+        user = self.request.user
+        queryset = BookingSeries.objects.select_related('venue').annotate(occurrence_count=Count('bookings'))
+
+        if user.is_staff or user.is_superuser:
+            return queryset
+
+        return queryset.filter(user=user)
+
+    @action(detail=True, methods=['get'])
+    def occurrences(self, request, pk=None):
+        """Expand the series over ?start=&end= without touching rows outside the window."""
+        series = self.get_object()
+        start = parse_bound(request.query_params.get('start')) or timezone.now()
+        end = parse_bound(request.query_params.get('end')) or start + timedelta(days=90)
+        if end <= start:
+            return Response(
+                {'detail': 'end must be after start.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        materialized = {
+            booking['start_time']: booking
+            for booking in series.bookings.filter(start_time__lt=end, end_time__gt=start).values(
+                'id', 'start_time', 'status'
+            )
+        }
+        field = serializers.DateTimeField()
+        return Response([
+            {
+                'start_time': field.to_representation(occurrence_start),
+                'end_time': field.to_representation(occurrence_end),
+                'booking_id': materialized.get(occurrence_start, {}).get('id'),
+                'status': materialized.get(occurrence_start, {}).get('status'),
+            }
+            for occurrence_start, occurrence_end in series.occurrences(start, end)
+        ])
@@ -6,12 +6,14 @@ import random
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 django.setup()
 
-from venues.models import Venue, VenueAvailability
+from venues.models import Venue, VenueAvailability, VenueAvailabilityTemplate
+from venues.schedule import weekday_mask
 
 
 def clear_existing_data():
     """Clear existing venue data"""
     print("Clearing existing venue data...")
+    VenueAvailabilityTemplate.objects.all().delete()
     VenueAvailability.objects.all().delete()
     Venue.objects.all().delete()
     print("✓ Existing data cleared.")
@@ -215,56 +217,48 @@ def create_venues(count=25):
 
 
 def create_availability_schedules(venues):
-    """Create availability schedules for venues"""
+    """Create weekly availability templates for venues, with a few one-off closures"""
     print("Creating availability schedules...")
 
-    # Generate availability for the next 60 days
+    # Templates cover the next 60 days; the resolver expands them on demand
     start_date = datetime.now().date()
     end_date = start_date + timedelta(days=60)
 
-    time_slots = [
-        (time(8, 0), time(10, 0)),   # 8:00-10:00
-        (time(10, 0), time(12, 0)),  # 10:00-12:00
-        (time(12, 0), time(14, 0)),  # 12:00-14:00
-        (time(14, 0), time(16, 0)),  # 14:00-16:00
-        (time(16, 0), time(18, 0)),  # 16:00-18:00
-        (time(9, 0), time(12, 0)),   # 9:00-12:00
-        (time(13, 0), time(17, 0)),  # 13:00-17:00
-        (time(8, 0), time(17, 0)),   # 8:00-17:00 (full day)
+    weekly_patterns = [
+        ([0, 1, 2, 3, 4], time(8, 0), time(18, 0)),     # Mon-Fri 8:00-18:00
+        ([0, 1, 2, 3, 4], time(9, 0), time(17, 0)),     # Mon-Fri 9:00-17:00
+        ([0, 2, 4], time(8, 0), time(12, 0)),           # Mon/Wed/Fri mornings
+        ([1, 3], time(13, 0), time(17, 0)),             # Tue/Thu afternoons
+        ([5], time(9, 0), time(13, 0)),                 # Saturday mornings
     ]
 
-    availability_count = 0
-
+    templates = []
+    closures = []
     for venue in venues:
-        current_date = start_date
-
-        while current_date <= end_date:
-            # Skip some weekends
-            if current_date.weekday() >= 5 and random.choice([True, False]):
-                current_date += timedelta(days=1)
-                continue
-
-            # Randomly decide number of slots for this date
-            num_slots = random.choices([0, 1, 2, 3, 4], weights=[15, 30, 35, 15, 5])[0]
-
-            if num_slots > 0:
-                selected_slots = random.sample(time_slots, min(num_slots, len(time_slots)))
-
-                for start_time, end_time in selected_slots:
-                    is_available = random.choices([True, False], weights=[75, 25])[0]
-
-                    VenueAvailability.objects.create(
-                        venue=venue,
-                        date=current_date,
-                        start_time=start_time,
-                        end_time=end_time,
-                        is_available=is_available
-                    )
-                    availability_count += 1
-
-            current_date += timedelta(days=1)
-
-    print(f"✓ Created {availability_count} availability slots.")
+        for weekdays, start_time, end_time in random.sample(weekly_patterns, random.choice([1, 2])):
+            templates.append(VenueAvailabilityTemplate(
+                venue=venue,
+                weekdays=weekday_mask(weekdays),
+                start_time=start_time,
+                end_time=end_time,
+                valid_from=start_date,
+                valid_until=end_date,
+            ))
+
+        # Exceptions: a couple of days closed for maintenance or holidays
+        for offset in random.sample(range(61), random.choice([0, 1, 2])):
+            closures.append(VenueAvailability(
+                venue=venue,
+                date=start_date + timedelta(days=offset),
+                start_time=time(0, 0),
+                end_time=time(0, 0),
+                is_available=False,
+            ))
+
+    VenueAvailabilityTemplate.objects.bulk_create(templates)
+    VenueAvailability.objects.bulk_create(closures, ignore_conflicts=True)
+
+    print(f"✓ Created {len(templates)} availability templates and {len(closures)} closures.")
 
 
 def print_summary():
@@ -273,7 +267,8 @@ def print_summary():
     print("DATABASE POPULATION COMPLETE")
     print("="*50)
     print(f"Total Venues: {Venue.objects.count()}")
-    print(f"Total Availability Slots: {VenueAvailability.objects.count()}")
+    print(f"Total Availability Templates: {VenueAvailabilityTemplate.objects.count()}")
+    print(f"Total Availability Exceptions: {VenueAvailability.objects.count()}")
     print(f"Available Venues: {Venue.objects.filter(is_available=True).count()}")
     print("\nVenues by Category:")
     for category in ['conference', 'meeting', 'event', 'boardroom']:
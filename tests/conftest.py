@@ -0,0 +1,10 @@
+import pytest
+
+from backend.cache import tiered_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    tiered_cache.clear()
+    yield
+    tiered_cache.clear()
@@ -0,0 +1,170 @@
+import datetime
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from accounts.authentication import ClaimsJWTAuthentication
+from accounts.models import StaffProfile
+from accounts.tokens import ClaimsRefreshToken, get_claims_version, get_staff_department, revoke_user_tokens
+from bookings.models import Booking, BookingStatus
+from venues.models import Venue
+
+
+@pytest.fixture
+def staff_user(create_user):
+    user = create_user(email='staff@example.com', user_type='staff')
+    profile = StaffProfile.objects.get(user=user)
+    profile.department = 'ppk'
+    profile.save()
+    return user
+
+
+@pytest.fixture
+def ppk_booking(create_user):
+    venue = Venue.objects.create(name='Main Hall', location='Campus', capacity=100, handled_by='ppk')
+    start_time = timezone.now() + datetime.timedelta(days=5)
+    return Booking.objects.create(
+        user=create_user(email='student@example.com'),
+        venue=venue,
+        title='Club Meeting',
+        start_time=start_time,
+        end_time=start_time + datetime.timedelta(hours=2),
+        attendees_count=20,
+        status=BookingStatus.PENDING
+    )
+
+
+def login(api_client, email, password='testpass123'):
+    response = api_client.post(reverse('login'), {'email': email, 'password': password})
+    assert response.status_code == status.HTTP_200_OK
+    return response.data['tokens']
+
+
+@pytest.mark.django_db
+class TestClaimsTokens:
+    def test_login_embeds_claims(self, api_client, staff_user):
+        tokens = login(api_client, staff_user.email)
+        access = AccessToken(tokens['access'])
+
+        assert access['user_type'] == 'staff'
+        assert access['is_staff'] is True
+        assert access['is_superuser'] is False
+        assert access['department'] == 'ppk'
+
+    def test_authentication_builds_user_without_queries(self, staff_user):
+        token = ClaimsRefreshToken.for_user(staff_user).access_token
+        with CaptureQueriesContext(connection) as queries:
+            user = ClaimsJWTAuthentication().get_user(token)
+            department = get_staff_department(user)
+
+        assert len(queries) == 0
+        assert user.pk == staff_user.pk
+        assert user == staff_user
+        assert user.is_staff and user.user_type == 'staff'
+        assert department == 'ppk'
+
+    def test_tokens_without_claims_fall_back_to_database(self, staff_user):
+        token = RefreshToken.for_user(staff_user).access_token
+        user = ClaimsJWTAuthentication().get_user(token)
+
+        assert user.pk == staff_user.pk
+        assert not hasattr(user, 'department')
+        assert get_staff_department(user) == 'ppk'
+
+    def test_approval_list_with_claims_token(self, api_client, staff_user):
+        tokens = login(api_client, staff_user.email)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(reverse('approval-list'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not any('staff_profile' in query['sql'] for query in queries.captured_queries)
+        assert not any('"auth_user"' in query['sql'] for query in queries.captured_queries)
+
+    def test_department_change_revokes_refresh_tokens(self, api_client, staff_user):
+        tokens = login(api_client, staff_user.email)
+
+        profile = StaffProfile.objects.get(user=staff_user)
+        profile.department = 'sa'
+        profile.save()
+
+        response = api_client.post(reverse('token_refresh'), {'refresh': tokens['refresh']})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        tokens = login(api_client, staff_user.email)
+        assert AccessToken(tokens['access'])['department'] == 'sa'
+
+    def test_unrelated_profile_change_keeps_tokens(self, api_client, staff_user):
+        tokens = login(api_client, staff_user.email)
+
+        profile = StaffProfile.objects.get(user=staff_user)
+        profile.position = 'Coordinator'
+        profile.save()
+
+        response = api_client.post(reverse('token_refresh'), {'refresh': tokens['refresh']})
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_inactive_claims_are_refused(self, staff_user):
+        token = ClaimsRefreshToken.for_user(staff_user).access_token
+        assert token['is_active'] is True
+        token['is_active'] = False
+
+        with pytest.raises(AuthenticationFailed):
+            ClaimsJWTAuthentication().get_user(token)
+
+    def test_approval_with_claims_token_skips_user_lookup(self, api_client, staff_user, ppk_booking):
+        tokens = login(api_client, staff_user.email)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(reverse('approval-approve', kwargs={'booking_id': ppk_booking.id}), {})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not any('staff_profile' in query['sql'] for query in queries.captured_queries)
+        assert not any('FROM "auth_user"' in query['sql'] for query in queries.captured_queries)
+
+    def test_changed_claims_fall_back_to_database(self, staff_user, django_capture_on_commit_callbacks):
+        token = ClaimsRefreshToken.for_user(staff_user).access_token
+        with django_capture_on_commit_callbacks(execute=True):
+            revoke_user_tokens(staff_user.pk)
+
+        user = ClaimsJWTAuthentication().get_user(token)
+        assert not hasattr(user, 'department')
+        reissued = ClaimsRefreshToken.for_user(staff_user).access_token
+        assert reissued['claims_version'] == get_claims_version(staff_user.pk)
+
+    def test_deactivated_staff_cannot_act_with_issued_access_token(self, api_client, staff_user, ppk_booking,
+                                                                   django_capture_on_commit_callbacks):
+        tokens = login(api_client, staff_user.email)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            staff_user.is_active = False
+            staff_user.save()
+
+        response = api_client.post(reverse('approval-review', kwargs={'booking_id': ppk_booking.id}), {})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        ppk_booking.refresh_from_db()
+        assert ppk_booking.status == BookingStatus.PENDING
+
+    def test_demoted_staff_cannot_act_with_issued_access_token(self, api_client, staff_user, ppk_booking,
+                                                               django_capture_on_commit_callbacks):
+        tokens = login(api_client, staff_user.email)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        url = reverse('approval-review', kwargs={'booking_id': ppk_booking.id})
+
+        with django_capture_on_commit_callbacks(execute=True):
+            staff_user.is_staff = False
+            staff_user.user_type = 'student'
+            staff_user.save()
+
+        assert api_client.post(url, {}).status_code == status.HTTP_403_FORBIDDEN
+        ppk_booking.refresh_from_db()
+        assert ppk_booking.status == BookingStatus.PENDING
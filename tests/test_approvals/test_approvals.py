@@ -5,7 +5,7 @@ from rest_framework import status
 from django.contrib.auth import get_user_model
 
 from bookings.models import (
-    BookingStatus, BookingHistory,
+    Booking, BookingStatus, BookingHistory,
     BookingFeedback, BookingFile, DocumentType
 )
 from accounts.models import StaffProfile
@@ -117,6 +117,26 @@ class TestBookingApprovalActionView:
         assert booking.approved_by == staff_user
         assert booking.approval_date is not None
 
+    def test_approve_rejected_booking_into_taken_window(self, api_client, staff_user, booking, staff_profile):
+        Booking.objects.filter(pk=booking.pk).update(status=BookingStatus.REJECTED)
+        Booking.objects.create(
+            user=booking.user,
+            venue=booking.venue,
+            title='Later Booking',
+            start_time=booking.start_time,
+            end_time=booking.end_time,
+            attendees_count=10,
+            status=BookingStatus.APPROVED
+        )
+        api_client.force_authenticate(user=staff_user)
+        url = reverse('approval-approve', kwargs={'booking_id': booking.id})
+        response = api_client.post(url, {'comment': 'Booking approved'})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        booking.refresh_from_db()
+        assert booking.status == BookingStatus.REJECTED
+        assert not BookingHistory.objects.filter(booking=booking).exists()
+
     def test_reject_booking(self, api_client, staff_user, booking, staff_profile):
         api_client.force_authenticate(user=staff_user)
         url = reverse('approval-reject', kwargs={'booking_id': booking.id})
@@ -0,0 +1,152 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from bookings.models import Booking, BookingFeedback, BookingHistory, BookingStatus
+from venues.models import Venue
+
+
+def make_bookings(user, venue, count):
+    start = timezone.now() + timezone.timedelta(days=10)
+    return [
+        Booking.objects.create(
+            user=user,
+            venue=venue,
+            title=f'Bulk Booking {index}',
+            start_time=start + timezone.timedelta(hours=3 * index),
+            end_time=start + timezone.timedelta(hours=3 * index + 2),
+            status=BookingStatus.PENDING,
+            requires_approval=True,
+            attendees_count=10
+        )
+        for index in range(count)
+    ]
+
+
+@pytest.mark.django_db
+class TestBulkApprovalAction:
+    def test_bulk_approve(self, api_client, staff_user, staff_profile, normal_user, venue):
+        bookings = make_bookings(normal_user, venue, 3)
+        api_client.force_authenticate(user=staff_user)
+
+        response = api_client.post(reverse('approval-bulk'), {
+            'booking_ids': [booking.id for booking in bookings],
+            'action': 'approve',
+            'comment': 'Approved in bulk'
+        }, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['updated'] == 3
+        assert all(item['outcome'] == 'updated' for item in response.data['results'])
+        for booking in bookings:
+            booking.refresh_from_db()
+            assert booking.status == BookingStatus.APPROVED
+            assert booking.approved_by == staff_user
+            assert booking.approval_date is not None
+        assert BookingHistory.objects.filter(new_status=BookingStatus.APPROVED).count() == 3
+        assert BookingFeedback.objects.filter(feedback_type='approval').count() == 3
+
+    def test_reports_each_outcome(self, api_client, staff_user, staff_profile, normal_user, venue):
+        other_venue = Venue.objects.create(
+            name='Student Lounge', category='Lounge', handled_by='sa', capacity=30
+        )
+        own, already_done = make_bookings(normal_user, venue, 2)
+        foreign = make_bookings(normal_user, other_venue, 1)[0]
+        Booking.objects.filter(pk=already_done.pk).update(status=BookingStatus.REJECTED)
+        api_client.force_authenticate(user=staff_user)
+
+        response = api_client.post(reverse('approval-bulk'), {
+            'booking_ids': [own.id, already_done.id, foreign.id, 999999],
+            'action': 'reject',
+        }, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        outcomes = {item['booking_id']: item['outcome'] for item in response.data['results']}
+        assert outcomes == {
+            own.id: 'updated',
+            already_done.id: 'unchanged',
+            foreign.id: 'forbidden',
+            999999: 'not_found',
+        }
+        foreign.refresh_from_db()
+        assert foreign.status == BookingStatus.PENDING
+        assert BookingHistory.objects.count() == 1
+        assert not BookingFeedback.objects.exists()
+
+    def test_bulk_approve_reports_conflicting_reactivations(
+        self, api_client, staff_user, staff_profile, normal_user, venue
+    ):
+        taken, clashing, first, second = make_bookings(normal_user, venue, 4)
+        # clashing overlaps an approved booking; second overlaps first, both rejected
+        Booking.objects.filter(pk=taken.pk).update(status=BookingStatus.APPROVED)
+        Booking.objects.filter(pk=clashing.pk).update(
+            start_time=taken.start_time + timezone.timedelta(hours=1),
+            end_time=taken.end_time + timezone.timedelta(hours=1),
+            status=BookingStatus.REJECTED
+        )
+        Booking.objects.filter(pk=second.pk).update(
+            start_time=first.start_time + timezone.timedelta(minutes=30),
+            end_time=first.end_time + timezone.timedelta(minutes=30),
+            status=BookingStatus.REJECTED
+        )
+        Booking.objects.filter(pk=first.pk).update(status=BookingStatus.REJECTED)
+        api_client.force_authenticate(user=staff_user)
+
+        response = api_client.post(reverse('approval-bulk'), {
+            'booking_ids': [clashing.id, first.id, second.id],
+            'action': 'approve',
+        }, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        outcomes = {item['booking_id']: item['outcome'] for item in response.data['results']}
+        assert outcomes == {clashing.id: 'conflict', first.id: 'updated', second.id: 'conflict'}
+        statuses = dict(Booking.objects.values_list('pk', 'status'))
+        assert statuses[clashing.id] == statuses[second.id] == BookingStatus.REJECTED
+        assert statuses[first.id] == BookingStatus.APPROVED
+        assert BookingHistory.objects.count() == 1
+
+    def test_query_count_does_not_grow_with_batch(self, api_client, staff_user, staff_profile, normal_user, venue):
+        api_client.force_authenticate(user=staff_user)
+        url = reverse('approval-bulk')
+
+        small = make_bookings(normal_user, venue, 2)
+        with CaptureQueriesContext(connection) as small_queries:
+            api_client.post(url, {
+                'booking_ids': [booking.id for booking in small], 'action': 'review', 'comment': 'x'
+            }, format='json')
+
+        Booking.objects.all().delete()
+        large = make_bookings(normal_user, venue, 20)
+        with CaptureQueriesContext(connection) as large_queries:
+            api_client.post(url, {
+                'booking_ids': [booking.id for booking in large], 'action': 'review', 'comment': 'x'
+            }, format='json')
+
+        assert len(large_queries) == len(small_queries)
+
+    def test_invalid_payload(self, api_client, staff_user):
+        api_client.force_authenticate(user=staff_user)
+        response = api_client.post(reverse('approval-bulk'), {
+            'booking_ids': [], 'action': 'approve'
+        }, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = api_client.post(reverse('approval-bulk'), {
+            'booking_ids': [1], 'action': 'archive'
+        }, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_unauthorized_user(self, api_client, normal_user, venue):
+        booking = make_bookings(normal_user, venue, 1)[0]
+        api_client.force_authenticate(user=normal_user)
+
+        response = api_client.post(reverse('approval-bulk'), {
+            'booking_ids': [booking.id], 'action': 'approve'
+        }, format='json')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        booking.refresh_from_db()
+        assert booking.status == BookingStatus.PENDING
@@ -0,0 +1,88 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from approvals.views import ApprovalViewSet
+from bookings.models import Booking, BookingFeedback, BookingHistory, BookingStatus
+
+
+@pytest.fixture
+def bookings_with_feedback(normal_user, venue, admin_user):
+    bookings = []
+    for offset in range(12):
+        booking = Booking.objects.create(
+            user=normal_user,
+            venue=venue,
+            title=f'Approval {offset}',
+            start_time=timezone.now() + timezone.timedelta(days=offset + 1),
+            end_time=timezone.now() + timezone.timedelta(days=offset + 1, hours=2),
+            status=BookingStatus.PENDING,
+            attendees_count=10,
+        )
+        for _ in range(4):
+            BookingFeedback.objects.create(booking=booking, staff=admin_user, content='Note')
+            BookingHistory.objects.create(
+                booking=booking,
+                previous_status=BookingStatus.DRAFT,
+                new_status=BookingStatus.PENDING,
+                changed_by=admin_user,
+            )
+        bookings.append(booking)
+    return bookings
+
+
+@pytest.mark.django_db
+class TestApprovalQueryBudgets:
+    def test_list_budget(self, api_client, staff_user, staff_profile, bookings_with_feedback,
+                         django_assert_max_num_queries):
+        api_client.force_authenticate(user=staff_user)
+        with django_assert_max_num_queries(ApprovalViewSet.query_budgets['list']):
+            response = api_client.get(reverse('approval-list'))
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 10
+
+    def test_retrieve_budget(self, api_client, admin_user, bookings_with_feedback,
+                             django_assert_max_num_queries):
+        api_client.force_authenticate(user=admin_user)
+        url = reverse('approval-detail', kwargs={'pk': bookings_with_feedback[0].pk})
+        with django_assert_max_num_queries(ApprovalViewSet.query_budgets['retrieve']):
+            response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['feedback']) == 4
+        assert response.data['feedback'][0]['staff']['email'] == admin_user.email
+
+
+@pytest.mark.django_db
+class TestApprovalKeysetPagination:
+    def test_pending_cursor_pages(self, api_client, admin_user, bookings_with_feedback):
+        api_client.force_authenticate(user=admin_user)
+        url = f"{reverse('approval-pending')}?pagination=cursor"
+        ids = []
+        while url:
+            response = api_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert 'count' not in response.data
+            ids.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+        assert sorted(ids) == sorted(b.id for b in bookings_with_feedback)
+
+
+
+@pytest.mark.django_db
+class TestApprovalActionQueries:
+    def test_action_loads_booking_once(self, api_client, staff_user, staff_profile, booking):
+        api_client.force_authenticate(user=staff_user)
+        url = reverse('approval-approve', kwargs={'booking_id': booking.id})
+        with CaptureQueriesContext(connection) as captured:
+            response = api_client.post(url, {'comment': 'Approved'})
+
+        assert response.status_code == status.HTTP_200_OK
+        # Permission and view share one joined booking/venue read
+        booking_reads = [
+            query['sql'] for query in captured.captured_queries
+            if query['sql'].startswith('SELECT "booking"."id"') and 'JOIN "venue' in query['sql']
+        ]
+        assert len(booking_reads) == 1
@@ -168,6 +168,14 @@ class TestBookingStatusUpdate:
         assert history.new_status == BookingStatus.APPROVED
         assert history.comment == 'Approved by admin'
 
+    def test_update_status_response_includes_new_history(self, admin_client, booking):
+        url = reverse('booking-update-status', kwargs={'pk': booking.id})
+        data = {'status': BookingStatus.APPROVED, 'comment': 'Approved by admin'}
+        response = admin_client.put(url, data, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['status'] == BookingStatus.APPROVED
+        assert [entry['comment'] for entry in response.data['history']] == ['Approved by admin']
+
     def test_update_status_with_feedback(self, admin_client, booking):
         url = reverse('booking-update-status', kwargs={'pk': booking.id})
         data = {
@@ -0,0 +1,61 @@
+import datetime
+
+import pytest
+from django.utils import timezone
+
+from bookings.codes import allocator, current_period, format_code, reserve
+from bookings.models import Booking, BookingCodeSequence
+
+
+@pytest.fixture(autouse=True)
+def reset_allocator():
+    allocator.reset()
+    yield
+    allocator.reset()
+
+
+def make_booking(user, venue, **kwargs):
+    start_time = timezone.now() + datetime.timedelta(days=1)
+    return Booking.objects.create(
+        user=user,
+        venue=venue,
+        title='Sequenced Booking',
+        start_time=start_time,
+        end_time=start_time + datetime.timedelta(hours=1),
+        attendees_count=5,
+        **kwargs
+    )
+
+
+@pytest.mark.django_db
+class TestBookingCodeAllocation:
+    def test_codes_are_sequential(self, user, venue):
+        first = make_booking(user, venue)
+        second = make_booking(user, venue)
+        period = current_period()
+        assert first.booking_code == format_code(period, 1)
+        assert second.booking_code == format_code(period, 2)
+        assert BookingCodeSequence.objects.get(period=period).last_value == 2
+
+    def test_counter_seeded_from_existing_codes(self, user, venue):
+        period = current_period()
+        make_booking(user, venue, booking_code=format_code(period, 41))
+        assert make_booking(user, venue).booking_code == format_code(period, 42)
+
+    def test_reserve_returns_consecutive_block(self, db):
+        assert list(reserve('202001', 3)) == [1, 2, 3]
+        assert list(reserve('202001', 2)) == [4, 5]
+
+    def test_block_preallocation(self, settings, db):
+        settings.BOOKING_CODE_BLOCK_SIZE = 10
+        codes = [allocator.next_code('202002') for _ in range(3)]
+        assert codes == [format_code('202002', n) for n in (1, 2, 3)]
+        assert BookingCodeSequence.objects.get(period='202002').last_value == 10
+
+    def test_bulk_allocation_spans_blocks(self, settings, db):
+        settings.BOOKING_CODE_BLOCK_SIZE = 4
+        allocator.next_code('202003')
+        allocator.allocate(2, '202003')
+        codes = allocator.allocate(3, '202003')
+        assert codes == [format_code('202003', n) for n in (4, 5, 6)]
+        assert BookingCodeSequence.objects.get(period='202003').last_value == 8
@@ -0,0 +1,155 @@
+import datetime
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from bookings.conflicts import VenueIntervalIndex, find_conflicts, has_conflict, interval_indexes
+from bookings.models import Booking, BookingStatus
+from venues.models import Venue
+
+
+def window(booking, start_offset, end_offset):
+    return (
+        booking.start_time + datetime.timedelta(hours=start_offset),
+        booking.start_time + datetime.timedelta(hours=end_offset),
+    )
+
+
+@pytest.mark.django_db
+class TestConflictDetection:
+    def test_overlapping_window_conflicts(self, booking):
+        start, end = window(booking, 1, 3)
+        assert list(find_conflicts(booking.venue_id, start, end)) == [booking]
+
+    def test_adjacent_window_does_not_conflict(self, booking):
+        start, end = window(booking, 2, 4)
+        assert not has_conflict(booking.venue_id, start, end)
+
+    def test_cancelled_booking_does_not_block(self, booking):
+        booking.status = BookingStatus.CANCELLED
+        booking.save()
+        start, end = window(booking, 0, 1)
+        assert not has_conflict(booking.venue_id, start, end)
+
+    def test_exclude_self(self, booking):
+        start, end = window(booking, 0, 1)
+        assert not has_conflict(booking.venue_id, start, end, exclude_pk=booking.pk)
+
+    def test_interval_index_matches_database(self, settings, booking):
+        settings.BOOKING_CONFLICT_INDEX_ENABLED = True
+        interval_indexes.invalidate()
+        start, end = window(booking, 1, 3)
+        assert has_conflict(booking.venue_id, start, end)
+        start, end = window(booking, 2, 4)
+        assert not has_conflict(booking.venue_id, start, end)
+
+    def test_stale_interval_index_hit_is_confirmed(self, settings, booking):
+        settings.BOOKING_CONFLICT_INDEX_ENABLED = True
+        interval_indexes.invalidate()
+        start, end = window(booking, 0, 1)
+        assert has_conflict(booking.venue_id, start, end)
+
+        # As another process would: no signal reaches this process's index
+        Booking.objects.filter(pk=booking.pk).update(status=BookingStatus.CANCELLED)
+        assert interval_indexes.get(booking.venue_id).overlapping(start, end)
+        assert not has_conflict(booking.venue_id, start, end)
+        assert not interval_indexes.get(booking.venue_id).overlapping(start, end)
+
+    def test_interval_index_skips_shadowed_intervals(self):
+        base = timezone.now()
+        hours = lambda n: base + datetime.timedelta(hours=n)
+        index = VenueIntervalIndex([
+            (hours(0), hours(10), 1),
+            (hours(1), hours(2), 2),
+            (hours(3), hours(4), 3),
+        ])
+        assert sorted(index.overlapping(hours(5), hours(6))) == [1]
+        assert sorted(index.overlapping(hours(1), hours(3.5))) == [1, 2, 3]
+        assert index.overlapping(hours(10), hours(11)) == []
+
+
+@pytest.mark.django_db
+class TestBookingConflictEndpoints:
+    def test_create_overlapping_booking_rejected(self, authenticated_client, booking):
+        start, end = window(booking, 1, 2)
+        data = {
+            'title': 'Clashing Booking',
+            'venue_id': booking.venue_id,
+            'start_time': start.isoformat(),
+            'end_time': end.isoformat(),
+            'attendees_count': 10,
+        }
+        response = authenticated_client.post(reverse('booking-list'), data, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert Booking.objects.count() == 1
+
+    def test_create_adjacent_booking_allowed(self, authenticated_client, booking):
+        start, end = window(booking, 2, 3)
+        data = {
+            'title': 'Follow-up Booking',
+            'venue_id': booking.venue_id,
+            'start_time': start.isoformat(),
+            'end_time': end.isoformat(),
+            'attendees_count': 10,
+        }
+        response = authenticated_client.post(reverse('booking-list'), data, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+
+    def test_create_inverted_window_rejected(self, authenticated_client, booking_data):
+        data = dict(booking_data, start_time=booking_data['end_time'], end_time=booking_data['start_time'])
+        response = authenticated_client.post(reverse('booking-list'), data, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_update_into_occupied_window_rejected(self, admin_client, booking, approved_booking):
+        approved_booking.start_time += datetime.timedelta(days=1)
+        approved_booking.end_time += datetime.timedelta(days=1)
+        approved_booking.save()
+        approved_booking.status = BookingStatus.PENDING
+        approved_booking.save()
+
+        url = reverse('booking-detail', kwargs={'pk': approved_booking.id})
+        data = {
+            'start_time': booking.start_time.isoformat(),
+            'end_time': booking.end_time.isoformat(),
+            'attendees_count': 10,
+        }
+        response = admin_client.patch(url, data, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_move_to_occupied_venue_rejected(self, admin_client, booking, user):
+        other_venue = Venue.objects.create(name='Annex', location='Campus', capacity=50, handled_by='sa')
+        moving = Booking.objects.create(
+            user=user,
+            venue=other_venue,
+            title='Moving Booking',
+            start_time=booking.start_time,
+            end_time=booking.end_time,
+            attendees_count=10,
+            status=BookingStatus.PENDING
+        )
+
+        url = reverse('booking-detail', kwargs={'pk': moving.id})
+        response = admin_client.patch(url, {'venue_id': booking.venue_id, 'attendees_count': 10}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        moving.refresh_from_db()
+        assert moving.venue == other_venue
+
+    def test_reactivating_into_taken_window_rejected(self, admin_client, booking, approved_booking):
+        Booking.objects.filter(pk=booking.pk).update(status=BookingStatus.REJECTED)
+
+        url = reverse('booking-update-status', kwargs={'pk': booking.id})
+        response = admin_client.put(url, {'status': BookingStatus.PENDING}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        booking.refresh_from_db()
+        assert booking.status == BookingStatus.REJECTED
+
+    def test_reactivating_into_free_window_allowed(self, admin_client, booking):
+        Booking.objects.filter(pk=booking.pk).update(status=BookingStatus.CANCELLED)
+
+        url = reverse('booking-update-status', kwargs={'pk': booking.id})
+        response = admin_client.put(url, {'status': BookingStatus.PENDING}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        booking.refresh_from_db()
+        assert booking.status == BookingStatus.PENDING
@@ -0,0 +1,125 @@
+import csv
+import datetime
+import gzip
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from bookings.models import Booking, BookingHistory, BookingStatus, EventDetail
+
+
+def streamed(response):
+    return b''.join(response.streaming_content)
+
+
+def csv_rows(content):
+    return list(csv.DictReader(io.StringIO(content.decode('utf-8'))))
+
+
+def ndjson_rows(content):
+    return [json.loads(line) for line in content.decode('utf-8').splitlines()]
+
+
+@pytest.fixture
+def admin_booking(admin_user, venue):
+    start_time = timezone.now() + datetime.timedelta(days=3)
+    return Booking.objects.create(
+        user=admin_user,
+        venue=venue,
+        title='Staff Meeting',
+        start_time=start_time,
+        end_time=start_time + datetime.timedelta(hours=1),
+        attendees_count=10,
+        status=BookingStatus.APPROVED
+    )
+
+
+@pytest.mark.django_db
+class TestBookingExport:
+    url = reverse('booking-export')
+
+    def test_csv_export(self, admin_client, booking, admin_booking):
+        response = admin_client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'text/csv'
+        assert response['Content-Disposition'].startswith('attachment; filename="bookings-')
+        rows = csv_rows(streamed(response))
+        assert {int(row['id']) for row in rows} == {booking.id, admin_booking.id}
+        row = next(row for row in rows if int(row['id']) == booking.id)
+        assert row['booking_code'] == booking.booking_code
+        assert row['status'] == BookingStatus.PENDING
+        assert 'venue_name' not in row
+
+    def test_ndjson_export_with_includes(self, admin_client, booking, admin_user):
+        event_detail = EventDetail.objects.create(booking=booking, event_type='conference', purpose='Testing')
+        BookingHistory.objects.create(
+            booking=booking, changed_by=admin_user,
+            previous_status=BookingStatus.PENDING, new_status=BookingStatus.APPROVED, comment='Looks good'
+        )
+        response = admin_client.get(self.url, {'export_format': 'ndjson', 'include': 'venue,user,event_detail,history'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'application/x-ndjson'
+        [row] = ndjson_rows(streamed(response))
+        assert row['id'] == booking.id
+        assert row['venue_name'] == booking.venue.name
+        assert row['user_email'] == booking.user.email
+        assert row['event_type'] == event_detail.event_type
+        assert row['last_change_status'] == BookingStatus.APPROVED
+        assert row['last_change_comment'] == 'Looks good'
+
+    def test_gzip_export(self, admin_client, booking):
+        response = admin_client.get(self.url, {'export_format': 'ndjson', 'compress': 'gzip'})
+
+        assert response['Content-Type'] == 'application/gzip'
+        assert response['Content-Disposition'].endswith('.ndjson.gz"')
+        rows = ndjson_rows(gzip.decompress(streamed(response)))
+        assert [row['id'] for row in rows] == [booking.id]
+
+    def test_export_applies_list_filters(self, admin_client, booking, admin_booking):
+        response = admin_client.get(self.url, {'status': BookingStatus.APPROVED})
+
+        assert [int(row['id']) for row in csv_rows(streamed(response))] == [admin_booking.id]
+
+    def test_users_only_export_their_bookings(self, authenticated_client, booking, admin_booking):
+        response = authenticated_client.get(self.url)
+
+        assert [int(row['id']) for row in csv_rows(streamed(response))] == [booking.id]
+
+    @pytest.mark.parametrize('params', [{'export_format': 'xml'}, {'include': 'venue,payments'}])
+    def test_invalid_parameters(self, admin_client, params):
+        response = admin_client.get(self.url, params)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_export_reads_in_one_query(self, admin_client, booking, admin_booking, django_assert_max_num_queries):
+        response = admin_client.get(self.url, {'include': 'venue,user,event_detail,history'})
+        with django_assert_max_num_queries(1):
+            rows = csv_rows(streamed(response))
+        assert len(rows) == 2
+
+
+@pytest.mark.django_db
+class TestExportBookingsCommand:
+    def test_writes_file(self, tmp_path, booking, admin_booking):
+        output = tmp_path / 'bookings.csv.gz'
+        call_command(
+            'export_bookings', '--gzip', '--include', 'venue',
+            '--status', BookingStatus.PENDING, '--output', str(output), stderr=io.StringIO()
+        )
+
+        rows = csv_rows(gzip.decompress(output.read_bytes()))
+        assert [int(row['id']) for row in rows] == [booking.id]
+        assert rows[0]['venue_name'] == booking.venue.name
+
+    def test_writes_stdout(self, booking):
+        out = io.StringIO()
+        call_command('export_bookings', '--format', 'ndjson', stdout=out)
+
+        assert [json.loads(line)['id'] for line in out.getvalue().splitlines()] == [booking.id]
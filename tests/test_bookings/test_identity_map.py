@@ -0,0 +1,99 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from backend.identity import IdentityMapMiddleware, fetch, related
+from bookings.models import Booking, BookingFile
+from venues.models import Venue
+
+
+def in_request(func):
+    """Run ``func`` the way a view runs, inside an open identity map."""
+    return IdentityMapMiddleware(lambda request: func())(None)
+
+
+def booking_reads(captured):
+    return [
+        query['sql'] for query in captured.captured_queries
+        if query['sql'].startswith('SELECT "booking"."id"')
+    ]
+
+
+@pytest.mark.django_db
+class TestIdentityMap:
+    def test_fetch_reuses_instance_within_request(self, booking):
+        def run():
+            with CaptureQueriesContext(connection) as captured:
+                first = fetch(Booking.objects.select_related('venue'), booking.pk)
+                second = fetch(Booking.objects.all(), str(booking.pk))
+                venue = fetch(Venue.objects.all(), booking.venue_id)
+            return first, second, venue, len(captured)
+
+        first, second, venue, queries = in_request(run)
+        assert first is second
+        assert venue is first.venue
+        assert queries == 1
+
+    def test_fetch_without_request_always_queries(self, booking):
+        with CaptureQueriesContext(connection) as captured:
+            first = fetch(Booking.objects.all(), booking.pk)
+            second = fetch(Booking.objects.all(), booking.pk)
+        assert first is not second
+        assert len(captured) == 2
+
+    def test_filtered_queryset_is_not_answered_from_map(self, booking):
+        def run():
+            fetch(Booking.objects.all(), booking.pk)
+            return fetch(Booking.objects.filter(title='Other'), booking.pk)
+
+        assert in_request(run) is None
+
+    def test_missing_rows_are_remembered(self, db):
+        def run():
+            with CaptureQueriesContext(connection) as captured:
+                fetch(Booking.objects.all(), 999)
+                fetch(Booking.objects.all(), 999)
+            return len(captured)
+
+        assert in_request(run) == 1
+
+    def test_related_uses_map(self, booking, booking_file):
+        def run():
+            loaded = fetch(Booking.objects.all(), booking.pk)
+            document = BookingFile.objects.get(pk=booking_file.pk)
+            with CaptureQueriesContext(connection) as captured:
+                resolved = related(document, 'booking')
+            return loaded, resolved, document.booking, len(captured)
+
+        loaded, resolved, cached, queries = in_request(run)
+        assert resolved is loaded is cached
+        assert queries == 0
+
+
+@pytest.mark.django_db
+class TestIdentityMapViews:
+    def test_update_loads_booking_once(self, authenticated_client, booking):
+        url = reverse('booking-detail', args=[booking.id])
+        with CaptureQueriesContext(connection) as captured:
+            response = authenticated_client.patch(url, {'title': 'Renamed', 'attendees_count': 40}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(booking_reads(captured)) == 1
+
+    def test_event_detail_lookup_is_one_query(self, authenticated_client, booking):
+        url = reverse('booking-event-detail-detail', kwargs={'booking_pk': booking.id, 'pk': 1})
+        with CaptureQueriesContext(connection) as captured:
+            response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert len(captured) == 1
+
+    def test_file_endpoints_load_booking_once(self, authenticated_client, booking, booking_file):
+        url = reverse('booking-file-detail', kwargs={'booking_pk': booking.id, 'pk': booking_file.id})
+        with CaptureQueriesContext(connection) as captured:
+            response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(booking_reads(captured)) == 1
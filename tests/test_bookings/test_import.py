@@ -0,0 +1,192 @@
+import datetime
+import io
+import json
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from bookings import importer
+from bookings.models import Booking, BookingHistory, BookingStatus, EventDetail
+from bookings.search import booking_index
+
+
+def line(venue, user, start, hours=1, **fields):
+    payload = {
+        'venue_id': venue.id,
+        'user_email': user.email,
+        'title': 'Imported meeting',
+        'start_time': start.isoformat(),
+        'end_time': (start + datetime.timedelta(hours=hours)).isoformat(),
+        'attendees_count': 10,
+        'status': BookingStatus.APPROVED,
+    }
+    payload.update(fields)
+    return json.dumps(payload)
+
+
+def ndjson(*lines):
+    return '\n'.join(lines) + '\n'
+
+
+@pytest.fixture
+def start():
+    return (timezone.now() + datetime.timedelta(days=10)).replace(hour=9, minute=0, second=0, microsecond=0)
+
+
+@pytest.mark.django_db
+class TestImportBookings:
+    def test_creates_bookings_with_details_and_history(self, user, admin_user, venue, start):
+        lines = [
+            line(venue, user, start, title='Alumni dinner', event_detail={
+                'event_type': 'dinner', 'purpose': 'Reunion', 'organizer_name': 'Alumni office'
+            }),
+            line(venue, user, start + datetime.timedelta(hours=2)),
+        ]
+        by_name = json.loads(lines[1])
+        by_name['venue'] = venue.name
+        del by_name['venue_id']
+        lines[1] = json.dumps(by_name)
+
+        report = importer.import_bookings(lines, changed_by=admin_user)
+
+        assert report.as_dict() == {'created': 2, 'failed': 0, 'dry_run': False, 'errors': []}
+        bookings = list(Booking.objects.order_by('start_time'))
+        assert [booking.venue_id for booking in bookings] == [venue.id, venue.id]
+        assert all(booking.booking_code.startswith('BK-') for booking in bookings)
+        assert len({booking.booking_code for booking in bookings}) == 2
+        assert bookings[0].status == BookingStatus.APPROVED
+        assert EventDetail.objects.get().booking == bookings[0]
+        history = BookingHistory.objects.get(booking=bookings[0])
+        assert (history.new_status, history.changed_by) == (BookingStatus.APPROVED, admin_user)
+        assert list(booking_index.search(Booking.objects.all(), ['alumni'])) == [bookings[0]]
+
+    def test_reports_bad_lines_and_keeps_the_others(self, user, venue, booking, start):
+        lines = [
+            line(venue, user, start),
+            '{not json',
+            '[1, 2]',
+            line(venue, user, start + datetime.timedelta(hours=3), venue_id=999999),
+            line(venue, user, start + datetime.timedelta(hours=3), user_email='nobody@example.com'),
+            line(venue, user, start + datetime.timedelta(hours=3), attendees_count=0),
+            line(venue, user, booking.start_time),
+            line(venue, user, start + datetime.timedelta(minutes=30)),
+            line(venue, user, start, status=BookingStatus.CANCELLED),
+        ]
+
+        report = importer.import_bookings(lines)
+
+        assert report.created == 2
+        errors = {error['line']: error['errors'] for error in report.errors}
+        assert set(errors) == {2, 3, 4, 5, 6, 7, 8}
+        assert 'venue_id' in errors[4]
+        assert 'user_email' in errors[5]
+        assert 'attendees_count' in errors[6]
+        assert errors[7] == errors[8] == {'non_field_errors': ['The venue is already booked for the requested time.']}
+
+    def test_conflicts_are_found_across_chunks(self, settings, user, venue, start):
+        settings.BOOKING_IMPORT_CHUNK_SIZE = 2
+        lines = [line(venue, user, start + datetime.timedelta(hours=hour)) for hour in range(3)]
+        lines.append(line(venue, user, start))
+
+        report = importer.import_bookings(lines)
+
+        assert report.created == 3
+        assert [error['line'] for error in report.errors] == [4]
+
+    def test_dry_run_writes_nothing(self, user, venue, start):
+        report = importer.import_bookings([line(venue, user, start)], dry_run=True)
+
+        assert report.created == 1
+        assert not Booking.objects.exists()
+
+    def test_dry_run_finds_conflicts_across_chunks(self, settings, user, venue, start):
+        settings.BOOKING_IMPORT_CHUNK_SIZE = 1
+        lines = [
+            line(venue, user, start, hours=2),
+            line(venue, user, start + datetime.timedelta(hours=3)),
+            line(venue, user, start + datetime.timedelta(hours=1)),
+            line(venue, user, start + datetime.timedelta(hours=3, minutes=30)),
+            line(venue, user, start + datetime.timedelta(hours=1), status=BookingStatus.CANCELLED),
+        ]
+
+        dry_run = importer.import_bookings(lines, dry_run=True)
+        assert not Booking.objects.exists()
+        real = importer.import_bookings(lines)
+
+        assert dry_run.created == real.created == 3
+        assert [error['line'] for error in dry_run.errors] == [error['line'] for error in real.errors] == [3, 4]
+
+    def test_queries_do_not_grow_with_rows(self, user, venue, start):
+        def count(first_day, rows):
+            lines = [
+                line(venue, user, start + datetime.timedelta(days=first_day, hours=2 * index))
+                for index in range(rows)
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                assert importer.import_bookings(lines).created == rows
+            return len(queries)
+
+        count(0, 1)  # creates the month's code sequence
+        assert count(30, 5) == count(60, 5 * 4)
+
+
+@pytest.mark.django_db
+class TestImportBookingsEndpoint:
+    url = reverse('booking-import-bookings')
+
+    def test_staff_imports_ndjson_body(self, admin_client, user, venue, start):
+        body = ndjson(line(venue, user, start), '{broken')
+        response = admin_client.post(self.url, data=body, content_type='application/x-ndjson')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['created'] == 1
+        assert response.data['errors'][0]['line'] == 2
+        assert Booking.objects.count() == 1
+
+    def test_staff_imports_uploaded_file(self, admin_client, user, venue, start):
+        upload = SimpleUploadedFile('bookings.ndjson', ndjson(line(venue, user, start)).encode())
+        response = admin_client.post(self.url, {'file': upload}, format='multipart')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Booking.objects.count() == 1
+
+    def test_dry_run(self, admin_client, user, venue, start):
+        response = admin_client.post(
+            f'{self.url}?dry_run=true', data=ndjson(line(venue, user, start)), content_type='application/x-ndjson'
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['created'] == 1
+        assert not Booking.objects.exists()
+
+    def test_requires_staff(self, authenticated_client, user, venue, start):
+        response = authenticated_client.post(
+            self.url, data=ndjson(line(venue, user, start)), content_type='application/x-ndjson'
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert not Booking.objects.exists()
+
+
+@pytest.mark.django_db
+class TestImportBookingsCommand:
+    def test_imports_file_and_writes_report(self, tmp_path, user, admin_user, venue, start):
+        source = tmp_path / 'bookings.ndjson'
+        source.write_text(ndjson(line(venue, user, start), line(venue, user, start)))
+        report = tmp_path / 'errors.ndjson'
+        out = io.StringIO()
+
+        call_command(
+            'import_bookings', str(source), '--changed-by', admin_user.email,
+            '--report', str(report), stdout=out
+        )
+
+        assert 'Imported 1 bookings, 1 lines failed' in out.getvalue()
+        assert [json.loads(entry)['line'] for entry in report.read_text().splitlines()] == [2]
+        assert BookingHistory.objects.get().changed_by == admin_user
@@ -0,0 +1,61 @@
+import datetime
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from bookings.models import Booking, BookingStatus
+
+
+@pytest.fixture
+def paged_bookings(user, venue):
+    bookings = []
+    for offset in range(25):
+        start_time = timezone.now() + datetime.timedelta(days=25 - offset)
+        bookings.append(Booking.objects.create(
+            user=user,
+            venue=venue,
+            title=f'Paged {offset}',
+            start_time=start_time,
+            end_time=start_time + datetime.timedelta(hours=1),
+            attendees_count=10,
+            status=BookingStatus.APPROVED,
+        ))
+    return bookings
+
+
+def follow(client, url):
+    ids = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        ids.extend(item['id'] for item in response.data['results'])
+        url = response.data['next']
+    return ids
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    def test_page_number_is_default(self, admin_client, paged_bookings):
+        response = admin_client.get(reverse('booking-list'))
+        assert response.data['count'] == 25
+
+    def test_cursor_mode_walks_all_rows_newest_first(self, admin_client, paged_bookings):
+        ids = follow(admin_client, f"{reverse('booking-list')}?pagination=cursor")
+        expected = [b.id for b in sorted(paged_bookings, key=lambda b: (b.created_at, b.id), reverse=True)]
+        assert ids == expected
+
+    def test_cursor_mode_skips_count(self, admin_client, paged_bookings, django_assert_num_queries):
+        with django_assert_num_queries(1) as captured:
+            response = admin_client.get(f"{reverse('booking-list')}?pagination=cursor")
+        assert 'count' not in response.data
+        assert 'COUNT(' not in captured.captured_queries[0]['sql'].upper()
+
+    def test_calendar_unpaginated_by_default(self, admin_client, paged_bookings):
+        response = admin_client.get(reverse('calendar-list'))
+        assert len(response.data) == 25
+
+    def test_calendar_cursor_orders_by_start_time(self, admin_client, paged_bookings):
+        ids = follow(admin_client, f"{reverse('calendar-list')}?pagination=cursor&page_size=10")
+        assert ids == [b.id for b in sorted(paged_bookings, key=lambda b: b.start_time)]
@@ -0,0 +1,114 @@
+import datetime
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from bookings.models import (
+    Booking, BookingFeedback, BookingFile, BookingHistory, BookingStatus, DocumentType
+)
+from bookings.views import BookingViewSet, BookingFileViewSet
+
+
+@pytest.fixture
+def many_bookings(user, venue, admin_user):
+    bookings = []
+    for offset in range(15):
+        start_time = timezone.now() + datetime.timedelta(days=offset + 1)
+        booking = Booking.objects.create(
+            user=user,
+            venue=venue,
+            title=f'Booking {offset}',
+            description='x' * 500,
+            start_time=start_time,
+            end_time=start_time + datetime.timedelta(hours=1),
+            attendees_count=10,
+            status=BookingStatus.PENDING,
+        )
+        for _ in range(3):
+            BookingHistory.objects.create(
+                booking=booking,
+                previous_status=BookingStatus.DRAFT,
+                new_status=BookingStatus.PENDING,
+                changed_by=admin_user,
+            )
+            BookingFeedback.objects.create(booking=booking, staff=admin_user, content='Looks fine')
+        bookings.append(booking)
+    return bookings
+
+
+@pytest.mark.django_db
+class TestBookingQueryBudgets:
+    def test_list_budget(self, admin_client, many_bookings, django_assert_max_num_queries):
+        with django_assert_max_num_queries(BookingViewSet.query_budgets['list']):
+            response = admin_client.get(reverse('booking-list'))
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 10
+        assert response.data['results'][0]['user_name'] == 'Test User'
+
+    def test_list_skips_description(self, admin_client, many_bookings, django_assert_max_num_queries):
+        with django_assert_max_num_queries(BookingViewSet.query_budgets['list']) as captured:
+            admin_client.get(reverse('booking-list'))
+        page_query = captured.captured_queries[-1]['sql']
+        assert '"booking"."description"' not in page_query
+
+    def test_retrieve_budget(self, admin_client, many_bookings, django_assert_max_num_queries):
+        url = reverse('booking-detail', kwargs={'pk': many_bookings[0].pk})
+        with django_assert_max_num_queries(BookingViewSet.query_budgets['retrieve']):
+            response = admin_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['history']) == 3
+        assert len(response.data['feedback']) == 3
+
+    def test_owner_sees_only_public_feedback(self, authenticated_client, many_bookings, admin_user,
+                                             django_assert_max_num_queries):
+        booking = many_bookings[0]
+        BookingFeedback.objects.create(booking=booking, staff=admin_user, content='Public', is_internal=False)
+        url = reverse('booking-detail', kwargs={'pk': booking.pk})
+        with django_assert_max_num_queries(BookingViewSet.query_budgets['retrieve']):
+            response = authenticated_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert [entry['content'] for entry in response.data['feedback']] == ['Public']
+
+
+@pytest.mark.django_db
+class TestBookingFileQueryBudgets:
+    def test_list_budget(self, authenticated_client, booking, booking_file, django_assert_max_num_queries):
+        url = reverse('booking-file-list', kwargs={'booking_pk': booking.id})
+        with django_assert_max_num_queries(BookingFileViewSet.query_budgets['list']):
+            response = authenticated_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_retrieve_budget(self, authenticated_client, booking, booking_file, django_assert_max_num_queries):
+        url = reverse('booking-file-detail', kwargs={'booking_pk': booking.id, 'pk': booking_file.id})
+        with django_assert_max_num_queries(BookingFileViewSet.query_budgets['retrieve']):
+            response = authenticated_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['id'] == booking_file.id
+
+    def test_create_budget(self, authenticated_client, booking, django_assert_max_num_queries):
+        url = reverse('booking-file-list', kwargs={'booking_pk': booking.id})
+        upload = SimpleUploadedFile('letter.pdf', b'letter', content_type='application/pdf')
+        with django_assert_max_num_queries(BookingFileViewSet.query_budgets['create']):
+            response = authenticated_client.post(url, {
+                'file': upload,
+                'file_name': 'letter.pdf',
+                'file_type': 'application/pdf',
+                'document_type': DocumentType.PERMISSION_LETTER,
+            }, format='multipart')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert BookingFile.objects.get(pk=response.data['id']).booking_id == booking.id
+
+    def test_other_users_booking_is_forbidden(self, api_client, booking, django_user_model):
+        other = django_user_model.objects.create_user(
+            email='other@example.com', password='otherpass123', user_type='student'
+        )
+        api_client.force_authenticate(user=other)
+        response = api_client.get(reverse('booking-file-list', kwargs={'booking_pk': booking.id}))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_unknown_booking_is_forbidden(self, authenticated_client):
+        response = authenticated_client.get(reverse('booking-file-list', kwargs={'booking_pk': 'abc'}))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,115 @@
+import datetime
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from bookings.models import Booking, BookingStatus
+from bookings.search import booking_index
+from venues.models import Venue
+from venues.search import venue_index
+
+
+def index_ids(index):
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT rowid FROM {index.table}')
+        return {row[0] for row in cursor.fetchall()}
+
+
+def result_ids(response):
+    return [item['id'] for item in response.json()['results']]
+
+
+@pytest.fixture
+def hall():
+    return Venue.objects.create(
+        name='Convocation Hall',
+        description='Is an area that you can rent for multiple events',
+        location='In the university',
+        capacity=1000,
+        handled_by='ppk',
+    )
+
+
+@pytest.fixture
+def other_booking(user, hall):
+    start_time = timezone.now() + datetime.timedelta(days=2)
+    return Booking.objects.create(
+        user=user,
+        venue=hall,
+        title='Annual Chess Tournament',
+        description='Chess matches for the whole club',
+        start_time=start_time,
+        end_time=start_time + datetime.timedelta(hours=3),
+        attendees_count=20,
+        status=BookingStatus.PENDING
+    )
+
+
+@pytest.mark.django_db
+class TestSearchIndexSync:
+    def test_saved_bookings_are_indexed(self, booking, other_booking):
+        assert index_ids(booking_index) >= {booking.id, other_booking.id}
+
+        results = booking_index.search(Booking.objects.all(), ['chess tourn'])
+        assert list(results.values_list('id', flat=True)) == [other_booking.id]
+
+    def test_deleted_booking_is_removed(self, booking):
+        booking_id = booking.id
+        booking.delete()
+        assert booking_id not in index_ids(booking_index)
+
+    def test_venue_rename_reindexes_its_bookings(self, booking, venue):
+        venue.name = 'Riverside Pavilion'
+        venue.save()
+
+        assert list(booking_index.search(Booking.objects.all(), ['riverside'])) == [booking]
+        assert list(venue_index.search(Venue.objects.all(), ['pavilion'])) == [venue]
+
+
+@pytest.mark.django_db
+class TestSearchFilter:
+    def test_booking_list_search_is_ranked(self, authenticated_client, booking, other_booking):
+        url = reverse('booking-list')
+        response = authenticated_client.get(url, {'search': 'chess'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert result_ids(response) == [other_booking.id]
+
+    def test_search_matches_booking_code_and_venue(self, authenticated_client, booking, other_booking):
+        url = reverse('booking-list')
+        by_code = authenticated_client.get(url, {'search': booking.booking_code})
+        by_venue = authenticated_client.get(url, {'search': other_booking.venue.name})
+
+        assert result_ids(by_code) == [booking.id]
+        assert other_booking.id in result_ids(by_venue)
+
+    def test_venue_search_action_uses_index(self, api_client, venue, hall):
+        url = reverse('venue-search')
+        response = api_client.get(url, {'search': 'convocation'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['id'] for item in response.json()] == [hall.id]
+
+    def test_punctuation_only_query_matches_nothing(self, authenticated_client, booking):
+        response = authenticated_client.get(reverse('booking-list'), {'search': '"*'})
+        assert result_ids(response) == []
+
+
+@pytest.mark.django_db
+class TestRebuildSearchIndex:
+    def test_rebuild_restores_missing_rows(self, booking, venue):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {booking_index.table}')
+            cursor.execute(f'DELETE FROM {venue_index.table}')
+
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+
+        assert booking.id in index_ids(booking_index)
+        assert venue.id in index_ids(venue_index)
+        assert 'Rebuilt bookings index' in out.getvalue()
@@ -0,0 +1,179 @@
+import datetime
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from bookings.models import Booking, BookingSeries, BookingStatus
+from bookings.recurrence import RecurrenceRule
+from bookings.series import find_conflicts
+
+
+def next_monday_at(hour):
+    today = timezone.localdate()
+    monday = today + datetime.timedelta(days=7 - today.weekday())
+    return timezone.make_aware(datetime.datetime.combine(monday, datetime.time(hour)))
+
+
+def series_payload(venue, rrule, start=None):
+    start = start or next_monday_at(9)
+    return {
+        'venue_id': venue.id,
+        'title': 'Weekly Seminar',
+        'description': 'Recurring seminar',
+        'attendees_count': 20,
+        'start_time': start.isoformat(),
+        'end_time': (start + datetime.timedelta(hours=2)).isoformat(),
+        'rrule': rrule,
+    }
+
+
+class TestRecurrenceRule:
+    def test_parse_weekly_rule(self):
+        rule = RecurrenceRule.parse('FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,WE;COUNT=4')
+        assert rule.freq == 'WEEKLY'
+        assert rule.interval == 2
+        assert rule.byday == [0, 2]
+        assert rule.count == 4
+        assert rule.is_bounded
+
+    @pytest.mark.parametrize('value', [
+        'FREQ=YEARLY;COUNT=2',
+        'FREQ=DAILY;BYDAY=MO;COUNT=2',
+        'FREQ=DAILY;COUNT=2;UNTIL=20300101',
+        'FREQ=DAILY;INTERVAL=0',
+        'FREQ=DAILY;BYMONTH=1',
+    ])
+    def test_parse_rejects_unsupported_rules(self, value):
+        with pytest.raises(ValueError):
+            RecurrenceRule.parse(value)
+
+    def test_parse_utc_until(self):
+        rule = RecurrenceRule.parse('FREQ=WEEKLY;UNTIL=20270131T000000Z')
+        assert rule.until == datetime.datetime(2027, 1, 31, tzinfo=datetime.timezone.utc)
+        assert rule.is_bounded
+
+    def test_weekly_byday_occurrences(self):
+        start = next_monday_at(9)
+        rule = RecurrenceRule.parse('FREQ=WEEKLY;BYDAY=MO,WE;COUNT=4')
+        occurrences = list(rule.occurrences(start))
+        assert [o.weekday() for o in occurrences] == [0, 2, 0, 2]
+        assert all(timezone.localtime(o).hour == 9 for o in occurrences)
+
+    def test_occurrences_respect_window(self):
+        start = next_monday_at(9)
+        rule = RecurrenceRule.parse('FREQ=DAILY;COUNT=10')
+        window = list(rule.occurrences(
+            start,
+            start + datetime.timedelta(days=3),
+            start + datetime.timedelta(days=5),
+        ))
+        assert len(window) == 2
+
+
+@pytest.mark.django_db
+class TestBookingSeriesCreation:
+    def test_create_materializes_occurrences(self, authenticated_client, user, venue):
+        url = reverse('booking-series-list')
+        response = authenticated_client.post(
+            url, series_payload(venue, 'FREQ=WEEKLY;BYDAY=MO,WE;COUNT=6'), format='json'
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['occurrence_count'] == 6
+        bookings = Booking.objects.filter(series_id=response.data['id'])
+        assert bookings.count() == 6
+        assert all(b.user == user and b.booking_code for b in bookings)
+        assert len({b.booking_code for b in bookings}) == 6
+
+    def test_create_with_utc_until(self, authenticated_client, venue):
+        start = next_monday_at(9)
+        until = (start + datetime.timedelta(days=14, hours=1)).astimezone(datetime.timezone.utc)
+        response = authenticated_client.post(
+            reverse('booking-series-list'),
+            series_payload(venue, f'FREQ=WEEKLY;UNTIL={until:%Y%m%dT%H%M%SZ}', start),
+            format='json'
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['occurrence_count'] == 3
+
+    def test_create_rejects_conflicting_occurrence(self, authenticated_client, user, venue):
+        start = next_monday_at(9)
+        Booking.objects.create(
+            user=user,
+            venue=venue,
+            title='Blocking Booking',
+            start_time=start + datetime.timedelta(days=7, hours=1),
+            end_time=start + datetime.timedelta(days=7, hours=3),
+            attendees_count=5,
+            status=BookingStatus.APPROVED
+        )
+
+        url = reverse('booking-series-list')
+        response = authenticated_client.post(
+            url, series_payload(venue, 'FREQ=WEEKLY;COUNT=3', start), format='json'
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert len(response.data['conflicts']) == 1
+        assert not BookingSeries.objects.exists()
+        assert Booking.objects.count() == 1
+
+    def test_create_rejects_unbounded_rule(self, authenticated_client, venue):
+        url = reverse('booking-series-list')
+        response = authenticated_client.post(url, series_payload(venue, 'FREQ=DAILY'), format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'rrule' in response.data
+
+    def test_create_rejects_too_many_occurrences(self, authenticated_client, venue, settings):
+        settings.BOOKING_SERIES_MAX_OCCURRENCES = 5
+        url = reverse('booking-series-list')
+        response = authenticated_client.post(url, series_payload(venue, 'FREQ=DAILY;COUNT=6'), format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'rrule' in response.data
+        assert not Booking.objects.exists()
+
+    def test_find_conflicts_detects_self_overlap(self, venue):
+        start = next_monday_at(9)
+        windows = [
+            (start, start + datetime.timedelta(hours=2)),
+            (start + datetime.timedelta(hours=1), start + datetime.timedelta(hours=3)),
+        ]
+        assert find_conflicts(venue.id, windows) == [windows[1]]
+
+
+@pytest.mark.django_db
+class TestBookingSeriesOccurrences:
+    def test_occurrences_expand_lazily_over_window(self, authenticated_client, venue):
+        url = reverse('booking-series-list')
+        created = authenticated_client.post(
+            url, series_payload(venue, 'FREQ=DAILY;COUNT=10'), format='json'
+        )
+        start = next_monday_at(0)
+
+        url = reverse('booking-series-occurrences', args=[created.data['id']])
+        response = authenticated_client.get(url, {
+            'start': (start + datetime.timedelta(days=2)).isoformat(),
+            'end': (start + datetime.timedelta(days=4)).isoformat(),
+        })
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 2
+        assert all(item['booking_id'] for item in response.data)
+
+    def test_other_users_cannot_see_series(self, api_client, authenticated_client, venue, django_user_model):
+        url = reverse('booking-series-list')
+        created = authenticated_client.post(
+            url, series_payload(venue, 'FREQ=DAILY;COUNT=2'), format='json'
+        )
+        other = django_user_model.objects.create_user(
+            email='other@example.com', password='otherpass123', user_type='student'
+        )
+        api_client.force_authenticate(user=other)
+
+        response = api_client.get(reverse('booking-series-detail', args=[created.data['id']]))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,54 @@
+import datetime
+import json
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from bookings.streaming import stream_json_array
+
+
+def window_params(days=7):
+    today = timezone.localdate()
+    return f"start={today.isoformat()}&end={(today + datetime.timedelta(days=days)).isoformat()}"
+
+
+def read_stream(response):
+    assert response.streaming
+    return json.loads(b''.join(response.streaming_content))
+
+
+@pytest.mark.django_db
+class TestStreamingCalendar:
+    def test_stream_matches_serializer_output(self, admin_client, booking, approved_booking):
+        url = f"{reverse('calendar-list')}?{window_params()}"
+        regular = admin_client.get(url).data
+        streamed = read_stream(admin_client.get(f"{url}&stream=1"))
+        assert sorted(streamed, key=lambda row: row['id']) == sorted(
+            (dict(row) for row in regular), key=lambda row: row['id']
+        )
+
+    def test_stream_requires_window(self, admin_client, booking):
+        response = admin_client.get(f"{reverse('calendar-list')}?stream=1")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_stream_rejects_oversized_window(self, admin_client, booking, settings):
+        settings.CALENDAR_STREAM_MAX_DAYS = 5
+        response = admin_client.get(f"{reverse('calendar-list')}?stream=1&{window_params(days=30)}")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_venue_calendar_stream_hides_other_users_pending(self, authenticated_client, booking, approved_booking,
+                                                             admin_user):
+        booking.user = admin_user
+        booking.save()
+        url = reverse('calendar-venue-calendar', kwargs={'venue_id': booking.venue_id})
+        rows = read_stream(authenticated_client.get(f"{url}?stream=1&{window_params()}"))
+        assert [row['id'] for row in rows] == [approved_booking.id]
+
+
+def test_stream_json_array_chunks():
+    rows = [{'id': n} for n in range(5)]
+    chunks = list(stream_json_array(iter(rows), chunk_size=2))
+    assert json.loads(''.join(chunks)) == rows
+    assert json.loads(''.join(stream_json_array(iter([])))) == []
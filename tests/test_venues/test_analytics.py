@@ -0,0 +1,143 @@
+import datetime
+from datetime import time, timedelta
+
+import numpy as np
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from bookings.models import Booking, BookingStatus
+from venues import analytics
+from venues.models import Venue
+
+User = get_user_model()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def normal_user():
+    return User.objects.create_user(email='user@example.com', password='testpass123', user_type='student')
+
+
+@pytest.fixture
+def staff_user():
+    return User.objects.create_user(email='staff@example.com', password='testpass123', user_type='staff',
+                                    is_staff=True)
+
+
+@pytest.fixture
+def venues():
+    return [
+        Venue.objects.create(name='Grand Hall', capacity=100, location='Downtown', category='Hall'),
+        Venue.objects.create(name='Annex', capacity=20, location='Downtown', category='Room'),
+    ]
+
+
+@pytest.fixture
+def monday():
+    today = timezone.localdate()
+    return today + timedelta(days=7 - today.weekday())
+
+
+def book(venue, user, day, start, end, attendees=10, status=BookingStatus.APPROVED):
+    return Booking.objects.create(
+        user=user,
+        venue=venue,
+        title='Occupying',
+        start_time=timezone.make_aware(datetime.datetime.combine(day, start)),
+        end_time=timezone.make_aware(datetime.datetime.combine(day, end)),
+        attendees_count=attendees,
+        status=status,
+    )
+
+
+def test_bucket_totals_match_interval_overlap():
+    rng = np.random.default_rng(7)
+    first = rng.uniform(0, 40, 500)
+    last = np.minimum(first + rng.uniform(0, 8, 500), 48)
+    index = rng.integers(0, 3, 500)
+    weights = rng.integers(1, 50, 500).astype(float)
+
+    totals = analytics._bucket_totals(index, first, last, weights, 3, 48)
+
+    expected = np.zeros((3, 48))
+    for venue, start, end, weight in zip(index, first, last, weights):
+        for bucket in range(48):
+            expected[venue, bucket] += weight * max(0.0, min(end, bucket + 1) - max(start, bucket))
+    assert np.allclose(totals, expected)
+
+
+@pytest.mark.django_db
+class TestOccupancyMatrix:
+    def test_matrix_bins_bookings_by_hour(self, venues, normal_user, monday):
+        hall, annex = venues
+        book(hall, normal_user, monday, time(9, 30), time(11), attendees=60)
+        book(annex, normal_user, monday, time(10), time(10, 15))
+        book(annex, normal_user, monday, time(12), time(14), status=BookingStatus.CANCELLED)
+
+        matrix = analytics.occupancy_matrix(monday, monday)
+
+        assert matrix.occupied.shape == (2, 24)
+        assert list(matrix.occupied[0, 8:12]) == [0.0, 0.5, 1.0, 0.0]
+        assert list(matrix.seats[0, 9:11]) == [30.0, 60.0]
+        assert matrix.occupied[1, 10] == 0.25
+        assert matrix.occupied[1, 12:14].sum() == 0
+
+    def test_reports(self, venues, normal_user, monday):
+        hall, _ = venues
+        book(hall, normal_user, monday, time(8), time(15), attendees=50)
+        matrix = analytics.occupancy_matrix(monday, monday + timedelta(days=6))
+
+        utilization = analytics.utilization(matrix, (8, 22))
+        assert utilization[hall.id]['booked_hours'] == 7
+        assert utilization[hall.id]['utilization'] == round(7 / 98, 4)
+        assert utilization[hall.id]['weeks'][0]['week_start'] == monday
+        assert utilization[hall.id]['hours'][8] == round(1 / 7, 4)
+
+        peaks = analytics.peak_hours(matrix, top=1)
+        assert peaks == [{'weekday': 0, 'hour': 8, 'occupancy': 0.5}]
+
+        idle = analytics.idle_capacity(matrix, (8, 22))[hall.id]
+        assert idle['offered_seat_hours'] == 9800
+        assert idle['used_seat_hours'] == 350
+        assert idle['idle_hours'] == 91
+
+
+@pytest.mark.django_db
+class TestAnalyticsEndpoint:
+    def test_staff_reports(self, api_client, staff_user, venues, normal_user, monday, django_assert_num_queries):
+        book(venues[0], normal_user, monday, time(9), time(11))
+        api_client.force_authenticate(user=staff_user)
+        params = {'start': monday.isoformat(), 'end': (monday + timedelta(days=13)).isoformat(), 'open_hours': '9-17'}
+
+        for report in ('utilization', 'peak-hours', 'idle-capacity'):
+            with django_assert_num_queries(2):
+                response = api_client.get(reverse('venue-analytics', args=[report]), params)
+            assert response.status_code == status.HTTP_200_OK
+            assert response.data['open_hours'] == [9, 17]
+
+        assert response.data['results'][str(venues[0].id)]['idle_hours'] == 110
+
+    def test_invalid_parameters(self, api_client, staff_user, monday, settings):
+        settings.ANALYTICS_MAX_DAYS = 30
+        api_client.force_authenticate(user=staff_user)
+        url = reverse('venue-analytics', args=['utilization'])
+        start = monday.isoformat()
+
+        for params in ({'start': start, 'end': (monday + timedelta(days=30)).isoformat()},
+                       {'start': start, 'end': start, 'open_hours': '22-8'},
+                       {'start': start}):
+            assert api_client.get(url, params).status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_staff_only(self, api_client, normal_user, monday):
+        api_client.force_authenticate(user=normal_user)
+        url = reverse('venue-analytics', args=['peak-hours'])
+        response = api_client.get(url, {'start': monday.isoformat(), 'end': monday.isoformat()})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
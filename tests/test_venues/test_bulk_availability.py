@@ -0,0 +1,135 @@
+from datetime import time, timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from venues import occupancy
+from venues.models import Venue, VenueAvailability, VenueOccupancy
+
+User = get_user_model()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def staff_user():
+    return User.objects.create_user(email='staff@example.com', password='testpass123', user_type='staff',
+                                    is_staff=True)
+
+
+@pytest.fixture
+def venues():
+    return [
+        Venue.objects.create(name=f'Room {n}', capacity=30, location='Block A', category='Room')
+        for n in range(2)
+    ]
+
+
+@pytest.fixture
+def first_day():
+    return timezone.localdate() + timedelta(days=1)
+
+
+def slot(venue, day, start='09:00', end='12:00', **extra):
+    return {'venue': venue.id, 'date': day.isoformat(), 'start_time': start, 'end_time': end, **extra}
+
+
+@pytest.mark.django_db
+class TestBulkAvailability:
+    def test_inserts_and_reports_duplicates(self, api_client, staff_user, venues, first_day):
+        first, second = venues
+        VenueAvailability.objects.create(venue=first, date=first_day, start_time=time(9), end_time=time(12))
+        api_client.force_authenticate(user=staff_user)
+
+        response = api_client.post(reverse('venue-bulk-availability'), {'slots': [
+            slot(first, first_day),
+            slot(first, first_day, '13:00', '17:00'),
+            slot(second, first_day),
+            slot(second, first_day),
+        ]}, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data == {'inserted': 2, 'skipped': 2}
+        assert VenueAvailability.objects.count() == 3
+
+    def test_large_payload_is_batched(self, api_client, staff_user, venues, first_day, settings,
+                                      django_assert_max_num_queries):
+        settings.AVAILABILITY_BULK_BATCH_SIZE = 100
+        api_client.force_authenticate(user=staff_user)
+        slots = [
+            slot(venue, first_day + timedelta(days=offset), f'{hour:02d}:00', f'{hour + 1:02d}:00')
+            for venue in venues for offset in range(30) for hour in range(8, 12)
+        ]
+
+        # Venue check, savepoint, duplicate read, 3 inserts, occupancy and summary refresh, release
+        with django_assert_max_num_queries(13):
+            response = api_client.post(reverse('venue-bulk-availability'), {'slots': slots}, format='json')
+
+        assert response.data == {'inserted': 240, 'skipped': 0}
+
+    def test_refreshes_occupancy_once(self, api_client, staff_user, venues, first_day):
+        venue = venues[0]
+        assert not occupancy.free_venue_ids([venue.id], first_day, time(9), time(10))
+        api_client.force_authenticate(user=staff_user)
+
+        api_client.post(reverse('venue-bulk-availability'), {'slots': [slot(venue, first_day)]}, format='json')
+        assert occupancy.free_venue_ids([venue.id], first_day, time(9), time(10)) == [venue.id]
+
+    def test_invalid_payloads(self, api_client, staff_user, venues, first_day, settings):
+        settings.AVAILABILITY_BULK_MAX_ITEMS = 2
+        api_client.force_authenticate(user=staff_user)
+        url = reverse('venue-bulk-availability')
+        venue = venues[0]
+
+        for slots in ([], [slot(venue, first_day, '12:00', '09:00')],
+                      [{**slot(venue, first_day), 'venue': 999}], [slot(venue, first_day)] * 3):
+            response = api_client.post(url, {'slots': slots}, format='json')
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not VenueAvailability.objects.exists()
+
+    def test_requires_staff(self, api_client, venues, first_day):
+        user = User.objects.create_user(email='user@example.com', password='testpass123', user_type='student')
+        api_client.force_authenticate(user=user)
+        response = api_client.post(reverse('venue-bulk-availability'), {'slots': [slot(venues[0], first_day)]},
+                                   format='json')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestDeleteAvailabilityRange:
+    def test_deletes_range_and_refreshes_once(self, api_client, staff_user, venues, first_day,
+                                              django_assert_max_num_queries):
+        venue = venues[0]
+        for offset in range(5):
+            VenueAvailability.objects.create(venue=venue, date=first_day + timedelta(days=offset),
+                                             start_time=time(9), end_time=time(12))
+        occupancy.load([venue.id], first_day)
+        api_client.force_authenticate(user=staff_user)
+        url = reverse('venue-delete-availability-range', args=[
+            venue.id, first_day.isoformat(), (first_day + timedelta(days=3)).isoformat()
+        ])
+
+        response = api_client.delete(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert VenueAvailability.objects.filter(venue=venue).count() == 1
+        available = occupancy.from_bytes(VenueOccupancy.objects.get(venue=venue, date=first_day).available)
+        assert available == 0
+
+    def test_empty_or_inverted_range(self, api_client, staff_user, venues, first_day):
+        api_client.force_authenticate(user=staff_user)
+        venue = venues[0]
+        day = first_day.isoformat()
+        earlier = (first_day - timedelta(days=1)).isoformat()
+
+        url = reverse('venue-delete-availability-range', args=[venue.id, day, day])
+        assert api_client.delete(url).status_code == status.HTTP_404_NOT_FOUND
+        url = reverse('venue-delete-availability-range', args=[venue.id, day, earlier])
+        assert api_client.delete(url).status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,120 @@
+from datetime import date, time, timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from backend.cache import tiered_cache
+from venues.models import Venue, VenueAvailability
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def venue():
+    return Venue.objects.create(
+        name='Grand Hall',
+        capacity=500,
+        location='Downtown',
+        category='Hall',
+        handled_by='sa',
+    )
+
+
+class TestTieredCache:
+    def test_entries_follow_tag_versions(self):
+        versions = tiered_cache.tag_versions(['a', 'b'])
+        tiered_cache.set('key', 'value', versions)
+        assert tiered_cache.get('key', tiered_cache.tag_versions(['a', 'b'])) == 'value'
+
+        tiered_cache.invalidate('b')
+        assert tiered_cache.get('key', tiered_cache.tag_versions(['a', 'b'])) is None
+
+    def test_shared_tier_fills_local_tier(self):
+        versions = tiered_cache.tag_versions(['a'])
+        tiered_cache.set('key', 'value', versions)
+        tiered_cache.local.clear()
+
+        assert tiered_cache.get('key', versions) == 'value'
+        assert tiered_cache.local.get('key') is not None
+
+
+@pytest.mark.django_db
+class TestVenueResponseCache:
+    def test_list_hit_skips_database(self, api_client, venue):
+        url = reverse('venue-list')
+        first = api_client.get(url)
+
+        with CaptureQueriesContext(connection) as captured:
+            second = api_client.get(url)
+
+        assert second.status_code == status.HTTP_200_OK
+        assert second.content == first.content
+        assert len(captured) == 0
+
+    def test_venue_write_invalidates_catalog(self, api_client, venue, django_capture_on_commit_callbacks):
+        url = reverse('venue-list')
+        api_client.get(url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            venue.name = 'Renamed Hall'
+            venue.save()
+
+        response = api_client.get(url)
+        assert response.json()['results'][0]['name'] == 'Renamed Hall'
+
+    def test_invalidation_waits_for_commit(self, api_client, venue, django_capture_on_commit_callbacks):
+        url = reverse('venue-list')
+        api_client.get(url)
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            venue.name = 'Renamed Hall'
+            venue.save()
+        assert api_client.get(url).json()['results'][0]['name'] == 'Grand Hall'
+
+        for callback in callbacks:
+            callback()
+        assert api_client.get(url).json()['results'][0]['name'] == 'Renamed Hall'
+
+    def test_search_is_cached_per_query(self, api_client, venue, django_capture_on_commit_callbacks):
+        url = reverse('venue-search')
+        assert len(api_client.get(url, {'min_capacity': 100}).json()) == 1
+        assert len(api_client.get(url, {'min_capacity': 1000}).json()) == 0
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Venue.objects.create(name='Arena', capacity=2000, location='North', handled_by='ppk')
+        assert len(api_client.get(url, {'min_capacity': 1000}).json()) == 1
+
+    def test_availability_write_invalidates_only_that_venue(self, api_client, venue,
+                                                            django_capture_on_commit_callbacks):
+        other = Venue.objects.create(name='Annex', capacity=20, location='East', handled_by='sa')
+        detail_url = reverse('venue-detail', args=[venue.id])
+        other_url = reverse('venue-detail', args=[other.id])
+        api_client.get(detail_url)
+        api_client.get(other_url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            VenueAvailability.objects.create(
+                venue=venue,
+                date=date.today() + timedelta(days=1),
+                start_time=time(9),
+                end_time=time(17),
+            )
+
+        assert len(api_client.get(detail_url).json()['availability']) == 1
+        with CaptureQueriesContext(connection) as captured:
+            api_client.get(other_url)
+        assert len(captured) == 0
+
+    def test_errors_are_not_cached(self, api_client):
+        url = reverse('venue-detail', args=[999])
+        assert api_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+        Venue.objects.create(id=999, name='Late Venue', capacity=10, location='West', handled_by='sa')
+        assert api_client.get(url).status_code == status.HTTP_200_OK
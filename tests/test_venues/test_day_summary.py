@@ -0,0 +1,155 @@
+import datetime
+from datetime import time, timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from bookings.models import Booking, BookingStatus
+from venues import schedule
+from venues.models import Venue, VenueAvailability, VenueAvailabilityTemplate, VenueDaySummary
+
+User = get_user_model()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def normal_user():
+    return User.objects.create_user(email='user@example.com', password='testpass123', user_type='student')
+
+
+@pytest.fixture
+def staff_user():
+    return User.objects.create_user(email='staff@example.com', password='testpass123', user_type='staff',
+                                    is_staff=True)
+
+
+@pytest.fixture
+def venue():
+    return Venue.objects.create(name='Grand Hall', capacity=500, location='Downtown', category='Hall')
+
+
+@pytest.fixture
+def day(venue):
+    day = timezone.localdate() + timedelta(days=2)
+    VenueAvailability.objects.create(venue=venue, date=day, start_time=time(8), end_time=time(18))
+    return day
+
+
+def book(venue, user, day, start_hour, end_hour, status=BookingStatus.APPROVED, attendees=10):
+    start = timezone.make_aware(datetime.datetime.combine(day, time(start_hour)))
+    return Booking.objects.create(
+        user=user,
+        venue=venue,
+        title='Occupying',
+        start_time=start,
+        end_time=start + timedelta(hours=end_hour - start_hour),
+        attendees_count=attendees,
+        status=status,
+    )
+
+
+@pytest.mark.django_db
+class TestDaySummary:
+    def test_availability_and_bookings_update_summary(self, venue, normal_user, day):
+        book(venue, normal_user, day, 9, 11, attendees=40)
+        book(venue, normal_user, day, 13, 14, status=BookingStatus.PENDING, attendees=80)
+        book(venue, normal_user, day, 15, 16, status=BookingStatus.CANCELLED, attendees=200)
+
+        summary = VenueDaySummary.objects.get(venue=venue, date=day)
+        assert summary.available_minutes == 600
+        assert summary.booked_minutes == 180
+        assert summary.free_minutes == 420
+        assert summary.booking_count == 2
+        assert summary.peak_attendees == 80
+        assert summary.status_counts == {'approved': 1, 'pending': 1, 'cancelled': 1}
+
+    def test_moving_a_booking_updates_both_days(self, venue, normal_user, day):
+        booking = book(venue, normal_user, day, 9, 11)
+        next_day = day + timedelta(days=1)
+        booking.start_time += timedelta(days=1)
+        booking.end_time += timedelta(days=1)
+        booking.save()
+
+        assert VenueDaySummary.objects.get(venue=venue, date=day).booking_count == 0
+        assert VenueDaySummary.objects.get(venue=venue, date=next_day).booked_minutes == 120
+
+    def test_rebuild_command(self, venue, normal_user, day):
+        book(venue, normal_user, day, 9, 11)
+        VenueDaySummary.objects.all().delete()
+
+        out = StringIO()
+        call_command('rebuild_day_summaries', stdout=out)
+
+        summary = VenueDaySummary.objects.get(venue=venue, date=day)
+        assert (summary.available_minutes, summary.booked_minutes) == (600, 120)
+        assert 'Rebuilt' in out.getvalue()
+
+
+@pytest.mark.django_db
+class TestSummaryEndpoints:
+    def test_heatmap_reads_summary_table(self, api_client, venue, normal_user, day, django_assert_num_queries):
+        book(venue, normal_user, day, 9, 11)
+        api_client.force_authenticate(user=normal_user)
+        params = {'start': day.isoformat(), 'end': (day + timedelta(days=6)).isoformat()}
+
+        # The summary rows and the templates that could open days without one
+        with django_assert_num_queries(2):
+            response = api_client.get(reverse('venue-heatmap'), params)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['venues'][str(venue.id)][day.isoformat()] == {
+            'available_minutes': 600,
+            'booked_minutes': 120,
+            'free_minutes': 480,
+            'booking_count': 1,
+        }
+
+    def test_utilization_totals(self, api_client, venue, normal_user, staff_user, day):
+        book(venue, normal_user, day, 8, 13)
+        api_client.force_authenticate(user=staff_user)
+
+        response = api_client.get(reverse('venue-utilization'), {
+            'start': day.isoformat(), 'end': day.isoformat(), 'venues': str(venue.id)
+        })
+
+        totals = response.data['venues'][str(venue.id)]
+        assert totals['utilization'] == 0.5
+        assert totals['status_counts'] == {'approved': 1}
+
+    def test_template_days_are_summarized(self, api_client, venue, normal_user, staff_user):
+        first = timezone.localdate() + timedelta(days=2)
+        VenueAvailabilityTemplate.objects.create(venue=venue, weekdays=schedule.weekday_mask(range(7)),
+                                                 start_time=time(8), end_time=time(18), valid_from=first)
+        book(venue, normal_user, first, 9, 11)
+        api_client.force_authenticate(user=staff_user)
+        params = {'start': first.isoformat(), 'end': (first + timedelta(days=6)).isoformat()}
+
+        totals = api_client.get(reverse('venue-utilization'), params).data['venues'][str(venue.id)]
+        assert (totals['available_minutes'], totals['booked_minutes']) == (4200, 120)
+        assert totals['utilization'] == 0.0286
+
+        days = api_client.get(reverse('venue-heatmap'), params).data['venues'][str(venue.id)]
+        assert len(days) == 7
+        assert days[(first + timedelta(days=6)).isoformat()]['free_minutes'] == 600
+
+    def test_utilization_is_staff_only(self, api_client, normal_user, day):
+        api_client.force_authenticate(user=normal_user)
+        response = api_client.get(reverse('venue-utilization'), {'start': day.isoformat(), 'end': day.isoformat()})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_invalid_range(self, api_client, normal_user, day):
+        api_client.force_authenticate(user=normal_user)
+        url = reverse('venue-heatmap')
+        assert api_client.get(url, {'start': day.isoformat()}).status_code == status.HTTP_400_BAD_REQUEST
+        assert api_client.get(url, {'start': day.isoformat(), 'end': '2000-01-01'}).status_code == \
+            status.HTTP_400_BAD_REQUEST
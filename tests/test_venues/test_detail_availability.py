@@ -0,0 +1,90 @@
+from datetime import time, timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from venues import schedule
+from venues.models import Venue, VenueAvailability, VenueAvailabilityTemplate
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def venue():
+    return Venue.objects.create(name='Grand Hall', capacity=500, location='Downtown', category='Hall')
+
+
+@pytest.fixture
+def today():
+    return timezone.localdate()
+
+
+@pytest.mark.django_db
+class TestVenueDetailAvailability:
+    def test_default_window_skips_past_and_distant_slots(self, api_client, venue, today, settings):
+        settings.VENUE_DETAIL_AVAILABILITY_DAYS = 7
+        for offset in (-30, -1, 0, 6, 7, 200):
+            VenueAvailability.objects.create(venue=venue, date=today + timedelta(days=offset),
+                                             start_time=time(9), end_time=time(12))
+
+        response = api_client.get(reverse('venue-detail', args=[venue.id]))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [slot['date'] for slot in response.data['availability']] == [
+            today.isoformat(), (today + timedelta(days=6)).isoformat()
+        ]
+        assert response.data['availability_window']['end'] == today + timedelta(days=6)
+
+    def test_window_params(self, api_client, venue, today):
+        start = today + timedelta(days=100)
+        VenueAvailability.objects.create(venue=venue, date=start, start_time=time(9), end_time=time(12))
+        url = reverse('venue-detail', args=[venue.id])
+
+        response = api_client.get(url, {'availability_start': start.isoformat(), 'availability_days': 1})
+        assert len(response.data['availability']) == 1
+
+        for params in ({'availability_start': 'soon'}, {'availability_days': 0},
+                       {'availability_days': 10000}, {'availability_format': 'xml'}):
+            assert api_client.get(url, params).status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_intervals_format_merges_each_day(self, api_client, venue, today):
+        tomorrow = today + timedelta(days=1)
+        VenueAvailabilityTemplate.objects.create(venue=venue, weekdays=schedule.weekday_mask(range(7)),
+                                                 start_time=time(8), end_time=time(12), valid_from=today)
+        VenueAvailability.objects.create(venue=venue, date=tomorrow, start_time=time(12), end_time=time(0))
+        VenueAvailability.objects.create(venue=venue, date=tomorrow, start_time=time(10), end_time=time(11),
+                                         is_available=False)
+
+        response = api_client.get(reverse('venue-detail', args=[venue.id]),
+                                  {'availability_days': 2, 'availability_format': 'intervals'})
+
+        assert response.data['availability'] == {
+            today.isoformat(): [['08:00', '12:00']],
+            tomorrow.isoformat(): [['08:00', '10:00'], ['11:00', '24:00']],
+        }
+
+    def test_detail_is_three_queries_whatever_the_history(self, api_client, venue, today,
+                                                          django_assert_num_queries):
+        VenueAvailability.objects.bulk_create([
+            VenueAvailability(venue=venue, date=today - timedelta(days=offset), start_time=time(9),
+                              end_time=time(12))
+            for offset in range(1, 300)
+        ])
+        with django_assert_num_queries(3):
+            response = api_client.get(reverse('venue-detail', args=[venue.id]))
+        assert response.data['availability'] == []
+
+    def test_cached_detail_follows_the_date(self, api_client, venue, today, monkeypatch):
+        VenueAvailability.objects.create(venue=venue, date=today, start_time=time(9), end_time=time(12))
+        url = reverse('venue-detail', args=[venue.id])
+        assert len(api_client.get(url).data['availability']) == 1
+        assert len(api_client.get(url).json()['availability']) == 1
+
+        monkeypatch.setattr(timezone, 'localdate', lambda: today + timedelta(days=1))
+        assert api_client.get(url).json()['availability'] == []
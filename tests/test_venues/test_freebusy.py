@@ -0,0 +1,93 @@
+import datetime
+from datetime import time, timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from bookings.models import Booking, BookingStatus
+from venues.freebusy import merge_intervals
+from venues.models import Venue, VenueAvailability
+
+User = get_user_model()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def normal_user():
+    return User.objects.create_user(email='user@example.com', password='testpass123', user_type='student')
+
+
+@pytest.fixture
+def venues():
+    return [
+        Venue.objects.create(name=f'Room {n}', capacity=30, location='Block A', category='Room')
+        for n in range(3)
+    ]
+
+
+@pytest.fixture
+def day():
+    return timezone.localdate() + timedelta(days=3)
+
+
+def at(day, hour):
+    return timezone.make_aware(datetime.datetime.combine(day, time(hour)))
+
+
+def test_merge_intervals():
+    assert merge_intervals([(5, 7), (1, 3), (2, 4), (4, 5), (9, 10)]) == [[1, 7], [9, 10]]
+    assert merge_intervals([]) == []
+
+
+@pytest.mark.django_db
+class TestFreeBusyEndpoint:
+    def test_batch_lookup(self, api_client, normal_user, venues, day, django_assert_max_num_queries):
+        first, second, third = venues
+        VenueAvailability.objects.create(venue=first, date=day, start_time=time(8), end_time=time(12))
+        VenueAvailability.objects.create(venue=first, date=day, start_time=time(12), end_time=time(18))
+        VenueAvailability.objects.create(venue=second, date=day, start_time=time(13), end_time=time(14),
+                                         is_available=False)
+        for start, end in ((9, 10), (10, 11)):
+            Booking.objects.create(user=normal_user, venue=second, title='Lecture', start_time=at(day, start),
+                                   end_time=at(day, end), attendees_count=5, status=BookingStatus.APPROVED)
+        Booking.objects.create(user=normal_user, venue=third, title='Cancelled', start_time=at(day, 9),
+                               end_time=at(day, 10), attendees_count=5, status=BookingStatus.CANCELLED)
+
+        api_client.force_authenticate(user=normal_user)
+        params = {
+            'venues': ','.join(str(v.id) for v in venues),
+            'start': day.isoformat(),
+            'end': day.isoformat(),
+        }
+        with django_assert_max_num_queries(3):
+            response = api_client.get(reverse('venue-freebusy'), params)
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.data['venues']
+        assert len(data[str(first.id)]['available']) == 1
+        assert data[str(first.id)]['busy'] == []
+        assert len(data[str(second.id)]['busy']) == 2
+        assert data[str(third.id)] == {'available': [], 'busy': []}
+
+    def test_requires_parameters(self, api_client, normal_user):
+        api_client.force_authenticate(user=normal_user)
+        response = api_client.get(reverse('venue-freebusy'), {'venues': '1'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_rejects_long_range(self, api_client, normal_user, venues, day, settings):
+        settings.FREEBUSY_MAX_DAYS = 7
+        api_client.force_authenticate(user=normal_user)
+        response = api_client.get(reverse('venue-freebusy'), {
+            'venues': str(venues[0].id),
+            'start': day.isoformat(),
+            'end': (day + timedelta(days=10)).isoformat(),
+        })
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,118 @@
+import datetime
+from datetime import time, timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from bookings.models import Booking, BookingStatus
+from venues import occupancy
+from venues.models import Venue, VenueAvailability, VenueOccupancy
+
+User = get_user_model()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def normal_user():
+    return User.objects.create_user(email='user@example.com', password='testpass123', user_type='student')
+
+
+@pytest.fixture
+def venue():
+    return Venue.objects.create(name='Grand Hall', capacity=500, location='Downtown', category='Hall')
+
+
+@pytest.fixture
+def open_day(venue):
+    day = timezone.localdate() + timedelta(days=2)
+    VenueAvailability.objects.create(venue=venue, date=day, start_time=time(8, 0), end_time=time(18, 0))
+    return day
+
+
+def book(venue, user, day, start_hour, end_hour, status=BookingStatus.APPROVED):
+    start = timezone.make_aware(datetime.datetime.combine(day, time(start_hour)))
+    return Booking.objects.create(
+        user=user,
+        venue=venue,
+        title='Occupying',
+        start_time=start,
+        end_time=start + timedelta(hours=end_hour - start_hour),
+        attendees_count=10,
+        status=status,
+    )
+
+
+def free(venue, day, start, end):
+    return venue.id in occupancy.free_venue_ids([venue.id], day, start, end)
+
+
+class TestMasks:
+    def test_span_mask_rounding(self):
+        assert occupancy.span_mask(0, 15) == 0b1
+        assert occupancy.span_mask(10, 20) == 0b11
+        assert occupancy.span_mask(10, 20, inner=True) == 0
+        assert occupancy.span_mask(15, 45, inner=True) == 0b110
+
+    def test_time_mask_until_midnight(self):
+        assert occupancy.time_mask(time(0, 0), time(0, 0)) == occupancy.FULL_DAY
+
+    def test_bytes_round_trip(self):
+        mask = occupancy.time_mask(time(9, 0), time(17, 30))
+        assert occupancy.from_bytes(occupancy.to_bytes(mask)) == mask
+
+
+@pytest.mark.django_db
+class TestOccupancyIndex:
+    def test_declared_window_is_free(self, venue, open_day):
+        assert free(venue, open_day, time(9, 0), time(11, 0))
+        assert not free(venue, open_day, time(7, 0), time(9, 0))
+
+    def test_booking_marks_slots_busy(self, venue, normal_user, open_day):
+        booking = book(venue, normal_user, open_day, 10, 12)
+        assert VenueOccupancy.objects.filter(venue=venue, date=open_day).exists()
+        assert not free(venue, open_day, time(11, 0), time(13, 0))
+        assert free(venue, open_day, time(12, 0), time(14, 0))
+
+        booking.status = BookingStatus.CANCELLED
+        booking.save()
+        assert free(venue, open_day, time(11, 0), time(13, 0))
+
+    def test_moving_booking_frees_old_day(self, venue, normal_user, open_day):
+        booking = book(venue, normal_user, open_day, 10, 12)
+        booking.start_time += timedelta(days=1)
+        booking.end_time += timedelta(days=1)
+        booking.save()
+        assert free(venue, open_day, time(10, 0), time(12, 0))
+
+    def test_deleting_availability_closes_day(self, venue, open_day):
+        assert free(venue, open_day, time(9, 0), time(10, 0))
+        VenueAvailability.objects.filter(venue=venue, date=open_day).delete()
+        assert not free(venue, open_day, time(9, 0), time(10, 0))
+
+    def test_unavailable_window_is_subtracted(self, venue, open_day):
+        VenueAvailability.objects.create(venue=venue, date=open_day, start_time=time(12, 0),
+                                         end_time=time(13, 0), is_available=False)
+        assert not free(venue, open_day, time(11, 0), time(14, 0))
+
+
+@pytest.mark.django_db
+class TestAvailableEndpoint:
+    def test_booked_venue_not_listed(self, api_client, venue, normal_user, open_day):
+        book(venue, normal_user, open_day, 14, 16)
+        api_client.force_authenticate(user=normal_user)
+        url = reverse('venue-available')
+
+        response = api_client.get(url, {'date': open_day.isoformat(), 'start_time': '14:00', 'end_time': '16:00'})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == []
+
+        response = api_client.get(url, {'date': open_day.isoformat(), 'start_time': '16:00', 'end_time': '18:00'})
+        assert [item['id'] for item in response.data] == [venue.id]
@@ -0,0 +1,109 @@
+import datetime
+from datetime import time, timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from bookings.models import Booking, BookingStatus
+from venues.models import Venue, VenueAvailability
+
+User = get_user_model()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def normal_user():
+    return User.objects.create_user(email='user@example.com', password='testpass123', user_type='student')
+
+
+@pytest.fixture
+def day():
+    return timezone.localdate() + timedelta(days=3)
+
+
+@pytest.fixture
+def venues():
+    return {
+        name: Venue.objects.create(name=name, capacity=capacity, location='Campus', handled_by=handled_by,
+                                   features=features)
+        for name, capacity, handled_by, features in (
+            ('Great Hall', 200, 'sa', {'projector': True}),
+            ('Seminar Room', 12, 'sa', {'projector': True}),
+            ('Meeting Room', 10, 'ppk', {}),
+            ('Studio', 30, 'sa', {'projector': True}),
+        )
+    }
+
+
+def at(day, hour):
+    return timezone.make_aware(datetime.datetime.combine(day, time(hour)))
+
+
+def names(response):
+    return [item['name'] for item in response.data]
+
+
+@pytest.mark.django_db
+class TestRecommendEndpoint:
+    def get(self, api_client, day, **params):
+        params = {'attendees': 8, 'date': day.isoformat(), 'start_time': '10:00', 'end_time': '12:00', **params}
+        return api_client.get(reverse('venue-recommend'), params)
+
+    def test_smallest_sufficient_venue_first(self, api_client, normal_user, venues, day):
+        api_client.force_authenticate(user=normal_user)
+        response = self.get(api_client, day)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert names(response) == ['Meeting Room', 'Seminar Room', 'Studio', 'Great Hall']
+        assert response.data[0]['spare_capacity'] == 2
+
+    def test_busy_and_closed_venues_are_excluded(self, api_client, normal_user, venues, day):
+        Booking.objects.create(user=normal_user, venue=venues['Meeting Room'], title='Standup',
+                               start_time=at(day, 11), end_time=at(day, 13), attendees_count=5,
+                               status=BookingStatus.APPROVED)
+        Booking.objects.create(user=normal_user, venue=venues['Studio'], title='Cancelled',
+                               start_time=at(day, 10), end_time=at(day, 11), attendees_count=5,
+                               status=BookingStatus.CANCELLED)
+        VenueAvailability.objects.create(venue=venues['Seminar Room'], date=day, start_time=time(9),
+                                         end_time=time(10, 30), is_available=False)
+        api_client.force_authenticate(user=normal_user)
+
+        assert names(self.get(api_client, day)) == ['Studio', 'Great Hall']
+
+    def test_declared_open_venues_rank_first(self, api_client, normal_user, venues, day):
+        VenueAvailability.objects.create(venue=venues['Great Hall'], date=day, start_time=time(8),
+                                         end_time=time(18))
+        api_client.force_authenticate(user=normal_user)
+
+        response = self.get(api_client, day, attendees=20)
+        assert names(response) == ['Great Hall', 'Studio']
+        assert [item['declared_available'] for item in response.data] == [True, False]
+
+    def test_features_and_handler_filters(self, api_client, normal_user, venues, day):
+        api_client.force_authenticate(user=normal_user)
+        response = self.get(api_client, day, feature='projector', handled_by='sa', limit=2)
+
+        assert names(response) == ['Seminar Room', 'Studio']
+
+    def test_answers_in_one_query(self, api_client, normal_user, venues, day, django_assert_num_queries):
+        api_client.force_authenticate(user=normal_user)
+        self.get(api_client, day)
+        with django_assert_num_queries(1):
+            self.get(api_client, day, feature='projector')
+
+    def test_invalid_parameters(self, api_client, normal_user, day):
+        api_client.force_authenticate(user=normal_user)
+        assert self.get(api_client, day, attendees=0).status_code == status.HTTP_400_BAD_REQUEST
+        assert self.get(api_client, day, end_time='09:00').status_code == status.HTTP_400_BAD_REQUEST
+        assert self.get(api_client, day, date='tomorrow').status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_requires_authentication(self, api_client, day):
+        assert self.get(api_client, day).status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,168 @@
+from datetime import time, timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from venues import occupancy, schedule
+from venues.models import Venue, VenueAvailability, VenueAvailabilityTemplate
+
+User = get_user_model()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def staff_user():
+    return User.objects.create_user(email='staff@example.com', password='testpass123', user_type='staff',
+                                    is_staff=True)
+
+
+@pytest.fixture
+def normal_user():
+    return User.objects.create_user(email='user@example.com', password='testpass123', user_type='student')
+
+
+@pytest.fixture
+def venue():
+    return Venue.objects.create(name='Grand Hall', capacity=500, location='Downtown', category='Hall')
+
+
+@pytest.fixture
+def monday():
+    today = timezone.localdate()
+    return today + timedelta(days=7 - today.weekday())
+
+
+@pytest.fixture
+def weekdays_template(venue, monday):
+    # Monday to Friday, 08:00-18:00, for four weeks
+    return VenueAvailabilityTemplate.objects.create(
+        venue=venue,
+        weekdays=schedule.weekday_mask(range(5)),
+        start_time=time(8),
+        end_time=time(18),
+        valid_from=monday,
+        valid_until=monday + timedelta(days=27),
+    )
+
+
+@pytest.mark.django_db
+class TestResolve:
+    def test_templates_expand_on_matching_days(self, venue, monday, weekdays_template):
+        windows = schedule.resolve([venue.id], monday, monday + timedelta(days=6))[venue.id]
+
+        assert [window.date for window in windows] == [monday + timedelta(days=n) for n in range(5)]
+        assert all(window.template_id == weekdays_template.id and window.pk is None for window in windows)
+
+    def test_validity_range_bounds_expansion(self, venue, monday, weekdays_template):
+        resolved = schedule.resolve([venue.id], monday + timedelta(days=28), monday + timedelta(days=34))
+        assert resolved[venue.id] == []
+
+    def test_exception_rows_are_merged(self, venue, monday, weekdays_template):
+        tuesday = monday + timedelta(days=1)
+        holiday = VenueAvailability.objects.create(venue=venue, date=monday, start_time=time(0),
+                                                   end_time=time(0), is_available=False)
+        replaced = VenueAvailability.objects.create(venue=venue, date=tuesday, start_time=time(8),
+                                                    end_time=time(18), is_available=False)
+
+        windows = schedule.resolve([venue.id], monday, tuesday)[venue.id]
+        assert [(window.pk, window.template_id) for window in windows] == [
+            (holiday.pk, None),
+            (None, weekdays_template.id),
+            (replaced.pk, None),
+        ]
+
+    def test_occupancy_reads_templates(self, venue, monday, weekdays_template):
+        assert venue.id in occupancy.free_venue_ids([venue.id], monday, time(9), time(10))
+        assert venue.id not in occupancy.free_venue_ids([venue.id], monday + timedelta(days=5), time(9), time(10))
+
+    def test_template_change_refreshes_built_days(self, venue, monday, weekdays_template):
+        assert venue.id in occupancy.free_venue_ids([venue.id], monday, time(9), time(10))
+
+        weekdays_template.start_time = time(12)
+        weekdays_template.save()
+        assert venue.id not in occupancy.free_venue_ids([venue.id], monday, time(9), time(10))
+
+
+@pytest.mark.django_db
+class TestTemplateEndpoints:
+    def test_staff_creates_template(self, api_client, staff_user, venue, monday):
+        api_client.force_authenticate(user=staff_user)
+        url = reverse('venue-availability-templates', args=[venue.id])
+        response = api_client.post(url, {
+            'weekdays': [0, 2, 4],
+            'start_time': '09:00',
+            'end_time': '17:00',
+            'valid_from': monday.isoformat(),
+        }, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['weekdays'] == [0, 2, 4]
+        assert VenueAvailabilityTemplate.objects.get().weekdays == 0b10101
+
+    def test_invalid_templates_are_rejected(self, api_client, staff_user, venue, monday):
+        api_client.force_authenticate(user=staff_user)
+        url = reverse('venue-availability-templates', args=[venue.id])
+        base = {'weekdays': [0], 'start_time': '09:00', 'end_time': '17:00', 'valid_from': monday.isoformat()}
+
+        for changes in ({'weekdays': []}, {'weekdays': [7]}, {'end_time': '08:00'},
+                        {'valid_until': (monday - timedelta(days=1)).isoformat()}):
+            response = api_client.post(url, {**base, **changes}, format='json')
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_students_cannot_create_templates(self, api_client, normal_user, venue, monday):
+        api_client.force_authenticate(user=normal_user)
+        url = reverse('venue-availability-templates', args=[venue.id])
+        response = api_client.post(url, {'weekdays': [0], 'start_time': '09:00', 'end_time': '17:00',
+                                         'valid_from': monday.isoformat()}, format='json')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_delete_template(self, api_client, staff_user, venue, weekdays_template):
+        api_client.force_authenticate(user=staff_user)
+        url = reverse('venue-delete-availability-template', args=[venue.id, weekdays_template.id])
+
+        assert api_client.delete(url).status_code == status.HTTP_204_NO_CONTENT
+        assert api_client.delete(url).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_availability_get_resolves_templates(self, api_client, venue, monday, weekdays_template):
+        url = reverse('venue-availability', args=[venue.id])
+        response = api_client.get(url, {'start': monday.isoformat(),
+                                        'end': (monday + timedelta(days=6)).isoformat()})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 5
+        assert response.data[0]['template'] == weekdays_template.id
+
+        assert len(api_client.get(url, {'date': monday.isoformat()}).data) == 1
+        assert api_client.get(url, {'start': monday.isoformat(), 'end': '2000-01-01'}).status_code == \
+            status.HTTP_400_BAD_REQUEST
+
+    def test_available_endpoint_uses_templates(self, api_client, normal_user, venue, monday, weekdays_template):
+        api_client.force_authenticate(user=normal_user)
+        response = api_client.get(reverse('venue-available'), {
+            'date': monday.isoformat(),
+            'start_time': '10:00',
+            'end_time': '12:00',
+        })
+        assert [item['id'] for item in response.data] == [venue.id]
+
+    def test_recommend_sees_templates(self, api_client, normal_user, venue, monday, weekdays_template):
+        VenueAvailabilityTemplate.objects.create(venue=venue, weekdays=schedule.weekday_mask([2]),
+                                                 start_time=time(12), end_time=time(14), is_available=False,
+                                                 valid_from=monday)
+        api_client.force_authenticate(user=normal_user)
+        url = reverse('venue-recommend')
+        params = {'attendees': 10, 'start_time': '10:00', 'end_time': '13:00'}
+
+        response = api_client.get(url, {**params, 'date': monday.isoformat()})
+        assert response.data[0]['declared_available'] is True
+
+        wednesday = monday + timedelta(days=2)
+        assert api_client.get(url, {**params, 'date': wednesday.isoformat()}).data == []
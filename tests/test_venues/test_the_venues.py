@@ -1,11 +1,13 @@
 import pytest
 import json
 from datetime import date, time, timedelta
+from importlib import import_module
+from django.apps import apps as django_apps
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
-from venues.models import Venue, VenueAvailability
+from venues.models import Venue, VenueAvailability, VenueFeature
 
 User = get_user_model()
 
@@ -271,4 +273,113 @@ class TestVenueAvailabilityEndpoints:
             'start_time': '10:00:00',
             'end_time': '16:00:00'
         })
-        assert response.status_code == status.HTTP_400_BAD_REQUEST
\ No newline at end of file
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+@pytest.mark.django_db
+class TestVenueFeatureFilter:
+    def test_features_are_synced_on_save(self, venue):
+        assert set(venue.feature_set.values_list('feature', flat=True)) == {'projector', 'sound_system'}
+
+        venue.features = {'projector': False, 'wifi': True}
+        venue.save()
+        assert set(venue.feature_set.values_list('feature', flat=True)) == {'wifi'}
+
+    def test_backfill_matches_save_time_sync(self, venue):
+        backfill = import_module('venues.migrations.0004_venuefeature').backfill_features
+        listed = Venue.objects.create(
+            name='Seminar Room', capacity=40, location='Campus', handled_by='sa', features=['wifi', 'whiteboard']
+        )
+        synced = {
+            venue_id: set(VenueFeature.objects.filter(venue_id=venue_id).values_list('feature', flat=True))
+            for venue_id in (venue.id, listed.id)
+        }
+        VenueFeature.objects.all().delete()
+
+        backfill(django_apps, None)
+
+        for venue_id, features in synced.items():
+            assert set(VenueFeature.objects.filter(venue_id=venue_id).values_list('feature', flat=True)) == features
+        assert synced[listed.id] == {'wifi', 'whiteboard'}
+
+    def test_multiple_features_are_combined_with_and(self, api_client, venue):
+        Venue.objects.create(
+            name='Small Room',
+            capacity=20,
+            location='Downtown',
+            handled_by='sa',
+            features={'projector': True}
+        )
+        url = reverse('venue-search')
+
+        response = api_client.get(url, {'feature': ['projector', 'sound_system']})
+        assert [item['id'] for item in response.data] == [venue.id]
+
+        response = api_client.get(url, {'feature': 'projector', 'min_capacity': 100})
+        assert [item['id'] for item in response.data] == [venue.id]
+
+        response = api_client.get(url, {'feature': ['projector', 'catering']})
+        assert response.data == []
+
+    def test_feature_filter_runs_in_one_query(self, api_client, venue, django_assert_num_queries):
+        url = reverse('venue-search')
+        with django_assert_num_queries(1):
+            api_client.get(url, {'feature': ['projector', 'sound_system']})
+
+
+@pytest.mark.django_db
+class TestVenueSearchFacets:
+    @pytest.fixture
+    def catalog(self, venue):
+        return [
+            venue,
+            Venue.objects.create(
+                name='Seminar Room', capacity=40, location='Campus', category='Room',
+                handled_by='ppk', features={'projector': True, 'wifi': True}
+            ),
+            Venue.objects.create(
+                name='Lecture Theatre', capacity=150, location='Campus', category='Room',
+                handled_by='sa', features={'wifi': True}
+            ),
+        ]
+
+    def test_facets_count_every_dimension(self, api_client, catalog):
+        response = api_client.get(reverse('venue-search'), {'facets': 'true'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 3
+        assert [item['name'] for item in response.data['results']] == [
+            'Grand Hall', 'Lecture Theatre', 'Seminar Room'
+        ]
+        facets = response.data['facets']
+        assert facets['category'] == [{'value': 'Room', 'count': 2}, {'value': 'Hall', 'count': 1}]
+        assert facets['handled_by'] == [{'value': 'sa', 'count': 2}, {'value': 'ppk', 'count': 1}]
+        assert facets['capacity'] == [
+            {'value': '0-49', 'count': 1},
+            {'value': '50-199', 'count': 1},
+            {'value': '200-499', 'count': 0},
+            {'value': '500+', 'count': 1},
+        ]
+        assert facets['features'] == [
+            {'value': 'projector', 'count': 2},
+            {'value': 'wifi', 'count': 2},
+            {'value': 'sound_system', 'count': 1},
+        ]
+
+    def test_facets_follow_filters(self, api_client, catalog):
+        response = api_client.get(reverse('venue-search'), {'facets': '1', 'feature': 'wifi'})
+
+        assert response.data['count'] == 2
+        assert response.data['facets']['category'] == [{'value': 'Room', 'count': 2}]
+        assert response.data['facets']['features'] == [
+            {'value': 'wifi', 'count': 2},
+            {'value': 'projector', 'count': 1},
+        ]
+
+    def test_facets_cost_two_queries_over_the_page(self, api_client, catalog, django_assert_num_queries):
+        with django_assert_num_queries(4):
+            api_client.get(reverse('venue-search'), {'facets': 'true', 'min_capacity': 10})
+
+    def test_without_facets_the_response_is_unchanged(self, api_client, catalog):
+        response = api_client.get(reverse('venue-search'))
+        assert isinstance(response.data, list)
+        assert len(response.data) == 3
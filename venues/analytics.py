@@ -0,0 +1,177 @@
+"""
+Vectorized utilization analytics.
+
+Bookings are read as flat arrays with ``values_list`` and turned into an
+occupancy matrix of venues x hour buckets with NumPy. Each booking adds a
+ramp to the integral of "occupied hours so far": a slope of +1 from its start
+and -1 from its end, split into whole-bucket and fractional parts so both go
+into plain difference arrays with ``np.add.at``. Two cumulative sums then
+give the occupied fraction of every bucket, whatever the number of bookings.
+The same pass weighted by attendance gives seat-hours.
+
+Buckets are whole UTC hours from local midnight of the first day, labelled
+with their local weekday and hour of day.
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Venue
+
+HOUR = 3600
+
+
+def get_max_days():
+    return getattr(settings, 'ANALYTICS_MAX_DAYS', 200)
+
+
+def get_open_hours():
+    """``(first, last)`` local hours of the day counted as bookable time, end excluded."""
+    return getattr(settings, 'ANALYTICS_OPEN_HOURS', (8, 22))
+
+
+class OccupancyMatrix:
+    """
+    ``occupied[v, h]`` is the fraction of bucket ``h`` booked at venue
+    ``venue_ids[v]`` and ``seats[v, h]`` the attendee-hours booked in it.
+    """
+
+    def __init__(self, venue_ids, capacities, bucket_starts, occupied, seats):
+        self.venue_ids = venue_ids
+        self.capacities = capacities
+        self.bucket_starts = bucket_starts
+        self.occupied = occupied
+        self.seats = seats
+        local = [timezone.localtime(value) for value in bucket_starts]
+        self.hours = np.array([value.hour for value in local], dtype=np.int64)
+        self.weekdays = np.array([value.weekday() for value in local], dtype=np.int64)
+        self.dates = [value.date() for value in local]
+
+    def open_mask(self, open_hours):
+        first, last = open_hours
+        return (self.hours >= first) & (self.hours < last)
+
+
+def _ramp(index, position, sign, weights, slope, constant):
+    """Add ``sign * weights * max(0, k - position)`` to the integral sampled at every bucket edge ``k``."""
+    edge = np.ceil(position).astype(np.int64)
+    np.add.at(slope, (index, edge), sign * weights)
+    np.add.at(constant, (index, edge), sign * weights * (edge - position))
+
+
+def _bucket_totals(index, first, last, weights, venue_count, bucket_count):
+    # One extra column takes the events at the last edge, one more the clipped overflow
+    slope = np.zeros((venue_count, bucket_count + 2))
+    constant = np.zeros((venue_count, bucket_count + 2))
+    _ramp(index, first, 1.0, weights, slope, constant)
+    _ramp(index, last, -1.0, weights, slope, constant)
+    running = np.cumsum(slope, axis=1)
+    integral = np.cumsum(running, axis=1) - running + np.cumsum(constant, axis=1)
+    return np.diff(integral[:, :bucket_count + 1], axis=1)
+
+
+def occupancy_matrix(start_date, end_date, venue_ids=None):
+    """Build the :class:`OccupancyMatrix` of ``[start_date, end_date]`` with one venue and one booking query."""
+    from bookings.conflicts import blocking_bookings
+
+    range_start = timezone.make_aware(datetime.combine(start_date, datetime.min.time()))
+    range_end = timezone.make_aware(datetime.combine(end_date + timedelta(days=1), datetime.min.time()))
+    bucket_count = int((range_end - range_start).total_seconds() // HOUR)
+    bucket_starts = [range_start + timedelta(seconds=HOUR * offset) for offset in range(bucket_count)]
+
+    venues = Venue.objects.order_by('id')
+    if venue_ids:
+        venues = venues.filter(id__in=venue_ids)
+    venue_rows = list(venues.values_list('id', 'capacity'))
+    ids = np.array([venue_id for venue_id, _ in venue_rows], dtype=np.int64)
+    capacities = np.array([capacity for _, capacity in venue_rows], dtype=np.float64)
+
+    bookings = blocking_bookings().filter(
+        venue_id__in=ids.tolist(), start_time__lt=range_end, end_time__gt=range_start
+    ).values_list('venue_id', 'start_time', 'end_time', 'attendees_count')
+    venue_column, starts, ends, attendees = zip(*bookings) if bookings else ((), (), (), ())
+
+    count = len(venue_column)
+    origin = range_start.timestamp()
+    first = np.clip((np.fromiter((value.timestamp() for value in starts), np.float64, count) - origin) / HOUR,
+                    0, bucket_count)
+    last = np.clip((np.fromiter((value.timestamp() for value in ends), np.float64, count) - origin) / HOUR,
+                   0, bucket_count)
+    index = np.searchsorted(ids, np.array(venue_column, dtype=np.int64))
+    weights = np.ones(count)
+
+    occupied = np.minimum(_bucket_totals(index, first, last, weights, len(ids), bucket_count), 1.0)
+    seats = _bucket_totals(index, first, last, np.array(attendees, dtype=np.float64), len(ids), bucket_count)
+    return OccupancyMatrix(ids.tolist(), capacities, bucket_starts, occupied, seats)
+
+
+def _ratio(numerator, denominator):
+    return round(float(numerator / denominator), 4) if denominator else None
+
+
+def utilization(matrix, open_hours=None):
+    """Booked share of the open hours per venue, overall, per week and per hour of day."""
+    open_mask = matrix.open_mask(open_hours or get_open_hours())
+    week_starts = np.array([(day - timedelta(days=day.weekday())).toordinal() for day in matrix.dates])
+    weeks = np.unique(week_starts[open_mask])
+    open_hours_of_day = np.unique(matrix.hours[open_mask])
+
+    report = {}
+    for row, venue_id in enumerate(matrix.venue_ids):
+        booked = matrix.occupied[row]
+        report[venue_id] = {
+            'booked_hours': round(float(booked[open_mask].sum()), 2),
+            'open_hours': int(open_mask.sum()),
+            'utilization': _ratio(booked[open_mask].sum(), open_mask.sum()),
+            'weeks': [
+                {
+                    'week_start': datetime.fromordinal(int(week)).date(),
+                    'utilization': _ratio(booked[open_mask & (week_starts == week)].sum(),
+                                          (open_mask & (week_starts == week)).sum()),
+                }
+                for week in weeks
+            ],
+            'hours': {
+                int(hour): _ratio(booked[open_mask & (matrix.hours == hour)].sum(),
+                                  (open_mask & (matrix.hours == hour)).sum())
+                for hour in open_hours_of_day
+            },
+        }
+    return report
+
+
+def peak_hours(matrix, top=10):
+    """Mean occupancy of all venues by weekday and hour of day, busiest slots first."""
+    if not matrix.venue_ids:
+        return []
+    per_bucket = matrix.occupied.mean(axis=0)
+    slot = matrix.weekdays * 24 + matrix.hours
+    totals = np.bincount(slot, weights=per_bucket, minlength=7 * 24)
+    samples = np.bincount(slot, minlength=7 * 24)
+    means = np.divide(totals, samples, out=np.zeros_like(totals), where=samples > 0)
+    order = np.argsort(-means, kind='stable')[:top]
+    return [
+        {'weekday': int(index // 24), 'hour': int(index % 24), 'occupancy': round(float(means[index]), 4)}
+        for index in order if samples[index]
+    ]
+
+
+def idle_capacity(matrix, open_hours=None):
+    """Seat-hours offered during open hours against seat-hours used, per venue."""
+    open_mask = matrix.open_mask(open_hours or get_open_hours())
+    offered = matrix.capacities * open_mask.sum()
+    used = matrix.seats[:, open_mask].sum(axis=1)
+    idle_hours = (1.0 - matrix.occupied[:, open_mask]).sum(axis=1)
+    return {
+        venue_id: {
+            'capacity': int(matrix.capacities[row]),
+            'offered_seat_hours': round(float(offered[row]), 2),
+            'used_seat_hours': round(float(used[row]), 2),
+            'seat_utilization': _ratio(used[row], offered[row]),
+            'idle_hours': round(float(idle_hours[row]), 2),
+            'idle_seat_hours': round(float(offered[row] - used[row]), 2),
+        }
+        for row, venue_id in enumerate(matrix.venue_ids)
+    }
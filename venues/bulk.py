@@ -0,0 +1,60 @@
+"""
+Set-based availability ingestion.
+
+A payload is validated in memory, compared against the rows already stored
+for its venues and date range with one query, and inserted with
+``bulk_create(ignore_conflicts=True)`` in fixed-size batches, so a term of
+slots for many venues costs a handful of statements. Rows already present,
+in the table or earlier in the payload, are skipped instead of failing the
+request.
+"""
+from django.conf import settings
+from django.db import transaction
+
+from .models import VenueAvailability
+from .signals import availability_bulk_changed
+
+
+def get_batch_size():
+    return getattr(settings, 'AVAILABILITY_BULK_BATCH_SIZE', 500)
+
+
+def get_max_items():
+    return getattr(settings, 'AVAILABILITY_BULK_MAX_ITEMS', 10000)
+
+
+def slot_key(venue_id, day, start_time, end_time):
+    return venue_id, day, start_time, end_time
+
+
+@transaction.atomic
+def ingest(slots):
+    """
+    Insert the validated ``slots`` (dicts with ``venue_id``, ``date``,
+    ``start_time``, ``end_time`` and ``is_available``) and return
+    ``(inserted, skipped)``.
+    """
+    if not slots:
+        return 0, 0
+
+    venue_ids = {slot['venue_id'] for slot in slots}
+    dates = [slot['date'] for slot in slots]
+    seen = set(
+        VenueAvailability.objects.filter(
+            venue_id__in=venue_ids,
+            date__range=(min(dates), max(dates)),
+        ).values_list('venue_id', 'date', 'start_time', 'end_time')
+    )
+
+    rows = []
+    for slot in slots:
+        key = slot_key(slot['venue_id'], slot['date'], slot['start_time'], slot['end_time'])
+        if key in seen:
+            continue
+        seen.add(key)
+        rows.append(VenueAvailability(**slot))
+
+    # ignore_conflicts still covers rows committed concurrently since the read above
+    VenueAvailability.objects.bulk_create(rows, batch_size=get_batch_size(), ignore_conflicts=True)
+    availability_bulk_changed((row.venue_id, row.date) for row in rows)
+    return len(rows), len(slots) - len(rows)
@@ -0,0 +1,71 @@
+"""
+Facet counts for the venue browser.
+
+The counts of every scalar dimension (``category``, ``handled_by`` and the
+capacity band) come from one ``GROUP BY`` over the three of them and are
+rolled up in Python; feature counts are one more grouped query on the
+``(feature, venue)`` index. Both run over the same filtered queryset as the
+listing, so a faceted search costs two queries on top of the page.
+"""
+from collections import Counter
+
+from django.db.models import Case, CharField, Count, Q, Value, When
+
+from .models import VenueFeature
+
+# (label, lower bound inclusive, upper bound exclusive)
+CAPACITY_BANDS = (
+    ('0-49', None, 50),
+    ('50-199', 50, 200),
+    ('200-499', 200, 500),
+    ('500+', 500, None),
+)
+
+
+def capacity_band():
+    whens = []
+    for label, low, high in CAPACITY_BANDS:
+        condition = Q()
+        if low is not None:
+            condition &= Q(capacity__gte=low)
+        if high is not None:
+            condition &= Q(capacity__lt=high)
+        whens.append(When(condition, then=Value(label)))
+    return Case(*whens, output_field=CharField())
+
+
+def _ranked(counter):
+    return [
+        {'value': value, 'count': count}
+        for value, count in sorted(counter.items(), key=lambda item: (-item[1], str(item[0])))
+    ]
+
+
+def facet_counts(queryset):
+    """Return ``{dimension: [{'value': ..., 'count': ...}]}`` for the venues of ``queryset``."""
+    rows = (
+        queryset.order_by()
+        .annotate(capacity_band=capacity_band())
+        .values('category', 'handled_by', 'capacity_band')
+        .annotate(total=Count('id'))
+    )
+    categories, handlers, bands = Counter(), Counter(), Counter()
+    for row in rows:
+        categories[row['category']] += row['total']
+        handlers[row['handled_by']] += row['total']
+        bands[row['capacity_band']] += row['total']
+
+    features = Counter(dict(
+        VenueFeature.objects.filter(venue__in=queryset.order_by().values('pk'))
+        .values('feature')
+        .annotate(total=Count('venue'))
+        .values_list('feature', 'total')
+    ))
+
+    return {
+        'category': _ranked(categories),
+        'handled_by': _ranked(handlers),
+        # Bands keep their natural order and are listed even when empty
+        'capacity': [{'value': label, 'count': bands[label]} for label, _, _ in CAPACITY_BANDS],
+        'features': _ranked(features),
+    }
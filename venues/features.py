@@ -0,0 +1,47 @@
+"""
+Indexed venue features.
+
+``Venue.features`` is a free-form JSON dict; the features set to ``True`` in
+it are mirrored into :class:`~venues.models.VenueFeature` rows so that
+feature filters run in SQL on the ``(feature, venue)`` index.
+"""
+from django.db.models import Count
+
+from .models import VenueFeature
+
+
+def enabled_features(features):
+    if isinstance(features, dict):
+        return {str(name) for name, enabled in features.items() if enabled is True}
+    if isinstance(features, list):
+        return {str(name) for name in features}
+    return set()
+
+
+def sync(venue):
+    """Bring the feature rows of ``venue`` in line with ``venue.features``."""
+    wanted = enabled_features(venue.features)
+    existing = set(VenueFeature.objects.filter(venue=venue).values_list('feature', flat=True))
+
+    if existing - wanted:
+        VenueFeature.objects.filter(venue=venue, feature__in=existing - wanted).delete()
+    if wanted - existing:
+        VenueFeature.objects.bulk_create(
+            [VenueFeature(venue=venue, feature=feature) for feature in wanted - existing],
+            ignore_conflicts=True
+        )
+
+
+def with_all_features(queryset, features):
+    """Restrict a venue queryset to the venues having every one of ``features``."""
+    features = set(features)
+    if not features:
+        return queryset
+    matching = (
+        VenueFeature.objects.filter(feature__in=features)
+        .values('venue_id')
+        .annotate(matched=Count('feature'))
+        .filter(matched=len(features))
+        .values('venue_id')
+    )
+    return queryset.filter(id__in=matching)
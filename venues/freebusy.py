@@ -0,0 +1,76 @@
+"""Free/busy intervals for several venues at once."""
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from . import schedule
+
+
+def get_max_days():
+    return getattr(settings, 'FREEBUSY_MAX_DAYS', 62)
+
+
+def get_max_venues():
+    return getattr(settings, 'FREEBUSY_MAX_VENUES', 100)
+
+
+def merge_intervals(intervals):
+    """Merge overlapping or touching ``(start, end)`` pairs into a sorted list."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def window_interval(day, start_time, end_time):
+    start = timezone.make_aware(datetime.combine(day, start_time))
+    end = timezone.make_aware(datetime.combine(day, end_time))
+    if end <= start:
+        # An end time of 00:00 closes the window at midnight
+        end += timedelta(days=1)
+    return start, end
+
+
+def free_busy(venue_ids, start_date, end_date):
+    """
+    Return ``{venue_id: {'available': [...], 'busy': [...]}}`` for ``[start_date, end_date]``.
+
+    ``available`` merges the declared open windows; ``busy`` merges blocking
+    bookings with windows declared unavailable, templates included. Both are
+    lists of aware ``[start, end]`` datetimes.
+    """
+    from bookings.conflicts import blocking_bookings
+
+    range_start = timezone.make_aware(datetime.combine(start_date, datetime.min.time()))
+    range_end = timezone.make_aware(datetime.combine(end_date + timedelta(days=1), datetime.min.time()))
+
+    available = defaultdict(list)
+    busy = defaultdict(list)
+
+    for venue_id, windows in schedule.resolve(venue_ids, start_date, end_date).items():
+        for window in windows:
+            (available if window.is_available else busy)[venue_id].append(
+                window_interval(window.date, window.start_time, window.end_time)
+            )
+
+    bookings = blocking_bookings().filter(
+        venue_id__in=venue_ids,
+        start_time__lt=range_end,
+        end_time__gt=range_start,
+    ).values_list('venue_id', 'start_time', 'end_time')
+    for venue_id, start_time, end_time in bookings:
+        busy[venue_id].append((max(start_time, range_start), min(end_time, range_end)))
+
+    return {
+        venue_id: {
+            'available': merge_intervals(available[venue_id]),
+            'busy': merge_intervals(busy[venue_id]),
+        }
+        for venue_id in venue_ids
+    }
@@ -0,0 +1,68 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from bookings.models import Booking
+from venues import schedule, summary
+from venues.models import Venue, VenueAvailability, VenueDaySummary
+
+CHUNK_DAYS = 31
+
+
+class Command(BaseCommand):
+    help = 'Recompute venue day summaries, by default over every day with bookings or availability.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=date.fromisoformat, help='First day (YYYY-MM-DD).')
+        parser.add_argument('--end', type=date.fromisoformat, help='Last day (YYYY-MM-DD).')
+        parser.add_argument('--venue', type=int, action='append', dest='venues', help='Venue id (repeatable).')
+
+    def default_range(self):
+        bookings = Booking.objects.aggregate(first=Min('start_time'), last=Max('end_time'))
+        slots = VenueAvailability.objects.aggregate(first=Min('date'), last=Max('date'))
+        # Templates are open-ended: cover the window the API expands by default
+        today = timezone.localdate()
+        firsts = [today, slots['first']]
+        lasts = [today + timedelta(days=schedule.get_default_days() - 1), slots['last']]
+        if bookings['first'] is not None:
+            firsts.append(timezone.localtime(bookings['first']).date())
+            lasts.append(timezone.localtime(bookings['last']).date())
+        return min(day for day in firsts if day), max(day for day in lasts if day)
+
+    def handle(self, *args, **options):
+        start, end = self.default_range()
+        start = options['start'] or start
+        end = options['end'] or end
+        if end < start:
+            raise CommandError('--end must not be before --start')
+
+        venues = Venue.objects.all()
+        if options['venues']:
+            venues = venues.filter(id__in=options['venues'])
+        venue_ids = list(venues.values_list('id', flat=True))
+
+        written = 0
+        chunk_start = start
+        while chunk_start <= end:
+            chunk_end = min(chunk_start + timedelta(days=CHUNK_DAYS - 1), end)
+            days = schedule.date_range(chunk_start, chunk_end)
+            summaries = summary.compute({(venue_id, day) for venue_id in venue_ids for day in days})
+            rows = [
+                VenueDaySummary(venue_id=venue_id, date=day, **fields)
+                for (venue_id, day), fields in summaries.items()
+                if not summary.is_empty(fields)
+            ]
+            with transaction.atomic():
+                VenueDaySummary.objects.filter(
+                    venue_id__in=venue_ids, date__range=(chunk_start, chunk_end)
+                ).delete()
+                VenueDaySummary.objects.bulk_create(rows, batch_size=500)
+            written += len(rows)
+            chunk_start = chunk_end + timedelta(days=1)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {written} day summaries for {len(venue_ids)} venues from {start} to {end}'
+        ))
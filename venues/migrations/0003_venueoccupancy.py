@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-17 11:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venues', '0002_venue_required_document_types'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VenueOccupancy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('available', models.BinaryField(max_length=12)),
+                ('busy', models.BinaryField(max_length=12)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occupancy', to='venues.venue')),
+            ],
+            options={
+                'db_table': 'venue_occupancy',
+                'indexes': [models.Index(fields=['date', 'venue'], name='venue_occup_date_0b7a97_idx')],
+                'unique_together': {('venue', 'date')},
+            },
+        ),
+    ]
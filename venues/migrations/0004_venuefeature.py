@@ -0,0 +1,48 @@
+# Generated by Django 5.2 on 2026-10-17 11:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def enabled_features(features):
+    # Frozen copy of venues.features.enabled_features
+    if isinstance(features, dict):
+        return {str(name) for name, enabled in features.items() if enabled is True}
+    if isinstance(features, list):
+        return {str(name) for name in features}
+    return set()
+
+
+def backfill_features(apps, schema_editor):
+    Venue = apps.get_model('venues', 'Venue')
+    VenueFeature = apps.get_model('venues', 'VenueFeature')
+    rows = [
+        VenueFeature(venue_id=venue_id, feature=name)
+        for venue_id, features in Venue.objects.values_list('id', 'features').iterator()
+        for name in enabled_features(features)
+    ]
+    VenueFeature.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venues', '0003_venueoccupancy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VenueFeature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('feature', models.CharField(max_length=100)),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feature_set', to='venues.venue')),
+            ],
+            options={
+                'db_table': 'venue_feature',
+                'indexes': [models.Index(fields=['feature', 'venue'], name='venue_featu_feature_c2a74b_idx')],
+                'unique_together': {('venue', 'feature')},
+            },
+        ),
+        migrations.RunPython(backfill_features, migrations.RunPython.noop),
+    ]
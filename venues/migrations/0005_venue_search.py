@@ -0,0 +1,52 @@
+from django.db import migrations
+
+# Frozen copy of venues.search.venue_index as of this migration: later changes
+# to the index ship their own migration instead of rewriting this one.
+FORWARD_SQL = {
+    'sqlite': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS venue_search "
+        "USING fts5(name, description, location, tokenize='unicode61 remove_diacritics 2')",
+        "DELETE FROM venue_search",
+        "INSERT INTO venue_search (rowid, name, description, location) "
+        "SELECT v.id, COALESCE(v.name, ''), COALESCE(v.description, ''), COALESCE(v.location, '') "
+        "FROM venue v",
+    ],
+    'postgresql': [
+        "CREATE TABLE IF NOT EXISTS venue_search (object_id bigint PRIMARY KEY, document tsvector NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS venue_search_document_idx ON venue_search USING GIN (document)",
+        "DELETE FROM venue_search",
+        "INSERT INTO venue_search (object_id, document) "
+        "SELECT v.id, to_tsvector('simple', concat_ws(' ', "
+        "COALESCE(v.name, ''), COALESCE(v.description, ''), COALESCE(v.location, ''))) "
+        "FROM venue v",
+    ],
+}
+
+REVERSE_SQL = {
+    'sqlite': ["DROP TABLE IF EXISTS venue_search"],
+    'postgresql': ["DROP TABLE IF EXISTS venue_search"],
+}
+
+
+def execute(schema_editor, statements):
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def create_index(apps, schema_editor):
+    execute(schema_editor, FORWARD_SQL)
+
+
+def drop_index(apps, schema_editor):
+    execute(schema_editor, REVERSE_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venues', '0004_venuefeature'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-17 12:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venues', '0005_venue_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['is_available', 'capacity'], name='venue_is_avai_318d96_idx'),
+        ),
+    ]
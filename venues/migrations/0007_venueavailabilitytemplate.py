@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-17 12:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venues', '0006_venue_capacity_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VenueAvailabilityTemplate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weekdays', models.PositiveSmallIntegerField()),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('is_available', models.BooleanField(default=True)),
+                ('valid_from', models.DateField()),
+                ('valid_until', models.DateField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='availability_templates', to='venues.venue')),
+            ],
+            options={
+                'db_table': 'venue_availability_template',
+                'indexes': [models.Index(fields=['venue', 'valid_from'], name='venue_avail_venue_i_cc07f5_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2 on 2026-10-17 12:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venues', '0007_venueavailabilitytemplate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VenueDaySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('available_minutes', models.PositiveIntegerField(default=0)),
+                ('booked_minutes', models.PositiveIntegerField(default=0)),
+                ('free_minutes', models.PositiveIntegerField(default=0)),
+                ('booking_count', models.PositiveIntegerField(default=0)),
+                ('status_counts', models.JSONField(default=dict)),
+                ('peak_attendees', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='day_summaries', to='venues.venue')),
+            ],
+            options={
+                'db_table': 'venue_day_summary',
+                'indexes': [models.Index(fields=['date', 'venue'], name='venue_day_s_date_21f806_idx')],
+                'unique_together': {('venue', 'date')},
+            },
+        ),
+    ]
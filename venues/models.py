@@ -17,11 +17,31 @@ class Venue(models.Model):
 
     class Meta:
         db_table = 'venue'
+        indexes = [
+            # Recommendations scan open venues by ascending capacity
+            models.Index(fields=['is_available', 'capacity']),
+        ]
 
     def __str__(self):
         return self.name
 
 
+class VenueFeature(models.Model):
+    """One enabled entry of ``Venue.features``, kept in sync on save for indexed filtering."""
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='feature_set')
+    feature = models.CharField(max_length=100)
+
+    class Meta:
+        db_table = 'venue_feature'
+        unique_together = ['venue', 'feature']
+        indexes = [
+            models.Index(fields=['feature', 'venue']),
+        ]
+
+    def __str__(self):
+        return f"{self.feature} at {self.venue_id}"
+
+
 class VenueAvailability(models.Model):
     venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='availability')
     date = models.DateField()
@@ -31,4 +51,92 @@ class VenueAvailability(models.Model):
 
     class Meta:
         db_table = 'venue_availability'
-        unique_together = ['venue', 'date', 'start_time', 'end_time']
\ No newline at end of file
+        unique_together = ['venue', 'date', 'start_time', 'end_time']
+
+class VenueAvailabilityTemplate(models.Model):
+    """
+    A weekly recurring window, e.g. Monday to Friday from 08:00 to 18:00.
+
+    ``weekdays`` is a bitmask with bit 0 standing for Monday. Templates are
+    expanded on demand by ``venues.schedule``; ``VenueAvailability`` rows on
+    a date act as one-off exceptions to them.
+    """
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='availability_templates')
+    weekdays = models.PositiveSmallIntegerField()
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    is_available = models.BooleanField(default=True)
+    valid_from = models.DateField()
+    valid_until = models.DateField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'venue_availability_template'
+        indexes = [
+            models.Index(fields=['venue', 'valid_from']),
+        ]
+
+    def __str__(self):
+        return f"Template {self.start_time}-{self.end_time} of {self.venue_id}"
+
+    def applies_to(self, day):
+        return (
+            bool(self.weekdays & (1 << day.weekday()))
+            and self.valid_from <= day
+            and (self.valid_until is None or day <= self.valid_until)
+        )
+
+
+class VenueOccupancy(models.Model):
+    """
+    Free/busy bitmap of one venue for one day, one bit per 15-minute slot.
+
+    ``available`` holds the slots declared open by ``VenueAvailability`` and
+    ``busy`` the slots taken by bookings; both are 96-bit big-endian integers
+    stored as 12 bytes.
+    """
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='occupancy')
+    date = models.DateField()
+    available = models.BinaryField(max_length=12)
+    busy = models.BinaryField(max_length=12)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'venue_occupancy'
+        unique_together = ['venue', 'date']
+        indexes = [
+            models.Index(fields=['date', 'venue']),
+        ]
+
+    def __str__(self):
+        return f"Occupancy of {self.venue_id} on {self.date}"
+
+
+class VenueDaySummary(models.Model):
+    """
+    Read model of one venue's day for dashboards, maintained from
+    ``venue_days_changed`` (see ``venues.summary``).
+
+    ``available_minutes`` is the declared open time, ``booked_minutes`` the
+    time covered by blocking bookings and ``free_minutes`` the open time no
+    booking touches, at the 15-minute resolution of the occupancy bitmaps.
+    """
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='day_summaries')
+    date = models.DateField()
+    available_minutes = models.PositiveIntegerField(default=0)
+    booked_minutes = models.PositiveIntegerField(default=0)
+    free_minutes = models.PositiveIntegerField(default=0)
+    booking_count = models.PositiveIntegerField(default=0)
+    status_counts = models.JSONField(default=dict)
+    peak_attendees = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'venue_day_summary'
+        unique_together = ['venue', 'date']
+        indexes = [
+            models.Index(fields=['date', 'venue']),
+        ]
+
+    def __str__(self):
+        return f"Summary of {self.venue_id} on {self.date}"
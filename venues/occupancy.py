@@ -0,0 +1,152 @@
+"""
+Per-venue, per-day occupancy bitmaps.
+
+A day is split into 96 slots of 15 minutes and represented as a Python int
+with bit ``i`` standing for the slot starting at ``i * 15`` minutes. Declared
+availability (templates and exception rows, see ``venues.schedule``) is
+rounded inwards (a slot is only open if it is open for its whole length) and
+bookings outwards (a slot touched by a booking is busy), so a free bit can
+always be booked.
+
+Rows are rebuilt whenever a booking, availability row or template touching
+the day changes (see ``venues.signals``) and built lazily the first time a
+day is queried.
+"""
+import math
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+from . import schedule
+from .models import VenueOccupancy
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+MASK_BYTES = SLOTS_PER_DAY // 8
+FULL_DAY = (1 << SLOTS_PER_DAY) - 1
+
+
+def to_bytes(mask):
+    return mask.to_bytes(MASK_BYTES, 'big')
+
+
+def from_bytes(value):
+    return int.from_bytes(bytes(value), 'big')
+
+
+def minute_of_day(value):
+    return value.hour * 60 + value.minute + value.second / 60
+
+
+def span_mask(start_minute, end_minute, inner=False):
+    """Bits of the slots covering ``[start_minute, end_minute)``; ``inner`` keeps only whole slots."""
+    if inner:
+        first = math.ceil(start_minute / SLOT_MINUTES)
+        last = math.floor(end_minute / SLOT_MINUTES)
+    else:
+        first = math.floor(start_minute / SLOT_MINUTES)
+        last = math.ceil(end_minute / SLOT_MINUTES)
+    first, last = max(first, 0), min(last, SLOTS_PER_DAY)
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+def time_mask(start_time, end_time, inner=False):
+    end_minute = minute_of_day(end_time)
+    if end_time == time(0, 0):
+        end_minute = 24 * 60
+    return span_mask(minute_of_day(start_time), end_minute, inner=inner)
+
+
+def day_bounds(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def booking_days(venue_id, start_time, end_time):
+    """The ``(venue_id, date)`` pairs a booking window touches, in local time."""
+    first = timezone.localtime(start_time).date()
+    last = timezone.localtime(end_time - timedelta(microseconds=1)).date()
+    return {(venue_id, first + timedelta(days=offset)) for offset in range((last - first).days + 1)}
+
+
+def compute(pairs):
+    """Return ``{(venue_id, date): (available_mask, busy_mask)}`` using three queries."""
+    from bookings.conflicts import blocking_bookings
+
+    pairs = set(pairs)
+    if not pairs:
+        return {}
+    venue_ids = {venue_id for venue_id, _ in pairs}
+    dates = {day for _, day in pairs}
+    range_start, _ = day_bounds(min(dates))
+    _, range_end = day_bounds(max(dates))
+
+    opened = defaultdict(int)
+    closed = defaultdict(int)
+    resolved = schedule.resolve(venue_ids, min(dates), max(dates), dates=dates)
+    for venue_id, windows in resolved.items():
+        for window in windows:
+            key = (venue_id, window.date)
+            if window.is_available:
+                opened[key] |= time_mask(window.start_time, window.end_time, inner=True)
+            else:
+                closed[key] |= time_mask(window.start_time, window.end_time)
+
+    busy = defaultdict(int)
+    bookings = blocking_bookings().filter(
+        venue_id__in=venue_ids,
+        start_time__lt=range_end,
+        end_time__gt=range_start,
+    ).values_list('venue_id', 'start_time', 'end_time')
+    for venue_id, start_time, end_time in bookings:
+        for key in booking_days(venue_id, start_time, end_time) & pairs:
+            day_start, day_end = day_bounds(key[1])
+            start_minute = (max(start_time, day_start) - day_start).total_seconds() / 60
+            end_minute = (min(end_time, day_end) - day_start).total_seconds() / 60
+            busy[key] |= span_mask(start_minute, end_minute)
+
+    return {key: (opened[key] & ~closed[key] & FULL_DAY, busy[key]) for key in pairs}
+
+
+def refresh(pairs):
+    """Recompute and store the bitmaps for ``pairs``."""
+    masks = compute(pairs)
+    VenueOccupancy.objects.bulk_create(
+        [
+            VenueOccupancy(venue_id=venue_id, date=day, available=to_bytes(available), busy=to_bytes(busy))
+            for (venue_id, day), (available, busy) in masks.items()
+        ],
+        update_conflicts=True,
+        unique_fields=['venue', 'date'],
+        update_fields=['available', 'busy', 'updated_at'],
+    )
+    return masks
+
+
+def load(venue_ids, day):
+    """Return ``{venue_id: (available_mask, busy_mask)}`` for ``day``, building missing rows."""
+    venue_ids = set(venue_ids)
+    masks = {
+        venue_id: (from_bytes(available), from_bytes(busy))
+        for venue_id, available, busy in VenueOccupancy.objects.filter(
+            venue_id__in=venue_ids, date=day
+        ).values_list('venue_id', 'available', 'busy')
+    }
+    missing = venue_ids - set(masks)
+    if missing:
+        for (venue_id, _), value in refresh({(venue_id, day) for venue_id in missing}).items():
+            masks[venue_id] = value
+    return masks
+
+
+def free_venue_ids(venue_ids, day, start_time, end_time):
+    """Ids among ``venue_ids`` that are declared open and unbooked for the whole window on ``day``."""
+    wanted = time_mask(start_time, end_time)
+    return [
+        venue_id
+        for venue_id, (available, busy) in load(venue_ids, day).items()
+        if wanted and (available & ~busy) & wanted == wanted
+    ]
@@ -0,0 +1,90 @@
+"""
+Best-fit venue recommendations.
+
+Candidates are read in one query from the ``(is_available, capacity)`` index,
+smallest sufficient capacity first. Bookings overlapping the window and
+windows declared unavailable (stored or from a template) are excluded with
+``NOT EXISTS`` subqueries, and whether a declared open window covers the
+request is annotated so that confirmed venues rank first. No venue is ever
+looked at on its own.
+"""
+from datetime import time
+
+from django.conf import settings
+from django.db.models import Exists, F, OuterRef, Q
+
+from . import features
+from .freebusy import window_interval
+from .models import Venue, VenueAvailability, VenueAvailabilityTemplate
+
+
+def get_max_results():
+    return getattr(settings, 'VENUE_RECOMMENDATION_LIMIT', 50)
+
+
+def declared_windows(day, is_available):
+    """
+    The stored rows and the template windows of ``OuterRef('pk')`` on ``day``,
+    as two querysets, following the precedence of ``schedule.resolve``.
+    """
+    rows = VenueAvailability.objects.filter(venue=OuterRef('pk'), date=day, is_available=is_available)
+    replaced = VenueAvailability.objects.filter(
+        venue=OuterRef('venue'), date=day, start_time=OuterRef('start_time'), end_time=OuterRef('end_time')
+    )
+    templates = (
+        VenueAvailabilityTemplate.objects.filter(
+            Q(valid_until__isnull=True) | Q(valid_until__gte=day),
+            venue=OuterRef('pk'),
+            valid_from__lte=day,
+            is_available=is_available,
+        )
+        .alias(on_day=F('weekdays').bitand(1 << day.weekday()))
+        .filter(on_day__gt=0)
+        .exclude(Exists(replaced))
+    )
+    return rows, templates
+
+
+def recommend(attendees, day, start_time, end_time, required_features=(), handled_by=None):
+    """
+    Venues seating ``attendees`` that are free on ``day`` from ``start_time``
+    to ``end_time``, best fit first.
+
+    Each venue is annotated with ``spare_capacity`` and ``declared_available``
+    (a single open window declared for the day covers the request).
+    """
+    from bookings.conflicts import blocking_bookings
+
+    start, end = window_interval(day, start_time, end_time)
+    ends_at_midnight = end_time == time(0, 0)
+
+    busy = blocking_bookings().filter(venue=OuterRef('pk'), start_time__lt=end, end_time__gt=start)
+
+    # An end time of 00:00 closes a declared window at midnight
+    def overlapping(windows):
+        windows = windows.filter(Q(end_time__gt=start_time) | Q(end_time=time(0, 0)))
+        return windows if ends_at_midnight else windows.filter(start_time__lt=end_time)
+
+    def covering(windows):
+        windows = windows.filter(start_time__lte=start_time)
+        if ends_at_midnight:
+            return windows.filter(end_time=time(0, 0))
+        return windows.filter(Q(end_time__gte=end_time) | Q(end_time=time(0, 0)))
+
+    closed = declared_windows(day, is_available=False)
+    opened = declared_windows(day, is_available=True)
+
+    queryset = Venue.objects.filter(is_available=True, capacity__gte=attendees)
+    if handled_by:
+        queryset = queryset.filter(handled_by=handled_by)
+    queryset = features.with_all_features(queryset, required_features)
+
+    return (
+        queryset
+        .filter(~Exists(busy), *(~Exists(overlapping(windows)) for windows in closed))
+        .annotate(
+            spare_capacity=F('capacity') - attendees,
+            declared_available=Exists(covering(opened[0])) | Exists(covering(opened[1])),
+        )
+        .order_by('-declared_available', 'capacity', 'id')
+    )
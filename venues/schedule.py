@@ -0,0 +1,171 @@
+"""
+Declared availability resolved from templates and exception rows.
+
+A :class:`~venues.models.VenueAvailabilityTemplate` stands for the same
+window on every matching weekday of its validity range, so a semester of
+opening hours is one row. Templates are only expanded for the dates a caller
+asks about. ``VenueAvailability`` rows stay the one-off exceptions: they are
+returned as stored, and a row replaces the template window with the same
+times on its date (a holiday is a row declared unavailable from 00:00 to
+00:00).
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Prefetch, Q
+
+from .models import VenueAvailability, VenueAvailabilityTemplate
+
+
+def get_default_days():
+    return getattr(settings, 'AVAILABILITY_DEFAULT_DAYS', 60)
+
+
+def get_detail_days():
+    return getattr(settings, 'VENUE_DETAIL_AVAILABILITY_DAYS', 14)
+
+
+def get_max_days():
+    return getattr(settings, 'AVAILABILITY_MAX_DAYS', 366)
+
+
+def templates_in(start_date, end_date):
+    """Templates valid on at least one day of ``[start_date, end_date]``."""
+    return VenueAvailabilityTemplate.objects.filter(
+        Q(valid_until__isnull=True) | Q(valid_until__gte=start_date),
+        valid_from__lte=end_date,
+    )
+
+
+def active_templates(venue_ids, start_date, end_date):
+    return templates_in(start_date, end_date).filter(venue_id__in=venue_ids)
+
+
+def date_range(start_date, end_date):
+    return [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+
+
+def expand(rows, templates, days):
+    """
+    Merge the stored ``rows`` with the windows ``templates`` open on ``days``
+    into ``{venue_id: [VenueAvailability, ...]}``, sorted by date and time.
+
+    Windows expanded from a template are unsaved instances; every returned
+    window carries the ``template_id`` it comes from, ``None`` for stored rows.
+    """
+    resolved = defaultdict(list)
+    taken = set()
+    for row in rows:
+        row.template_id = None
+        resolved[row.venue_id].append(row)
+        taken.add((row.venue_id, row.date, row.start_time, row.end_time))
+
+    for template in sorted(templates, key=lambda template: template.pk):
+        for day in days:
+            key = (template.venue_id, day, template.start_time, template.end_time)
+            if key in taken or not template.applies_to(day):
+                continue
+            taken.add(key)
+            window = VenueAvailability(
+                venue_id=template.venue_id,
+                date=day,
+                start_time=template.start_time,
+                end_time=template.end_time,
+                is_available=template.is_available,
+            )
+            window.template_id = template.pk
+            resolved[template.venue_id].append(window)
+
+    for windows in resolved.values():
+        windows.sort(key=lambda window: (window.date, window.start_time, window.end_time))
+    return resolved
+
+
+def resolve(venue_ids, start_date, end_date, dates=None):
+    """
+    Return ``{venue_id: [VenueAvailability, ...]}`` for ``[start_date, end_date]``
+    (restricted to ``dates`` when given) in two queries; see :func:`expand`.
+    """
+    venue_ids = set(venue_ids)
+    rows = VenueAvailability.objects.filter(venue_id__in=venue_ids, date__range=(start_date, end_date))
+    if dates is not None:
+        rows = rows.filter(date__in=dates)
+    days = sorted(dates) if dates is not None else date_range(start_date, end_date)
+    return expand(rows, active_templates(venue_ids, start_date, end_date), days)
+
+
+def prefetch_window(queryset, start_date, end_date):
+    """
+    Prefetch onto each venue of ``queryset`` the stored rows and templates of
+    ``[start_date, end_date]``; :func:`venue_window` then expands them without
+    further queries.
+    """
+    return queryset.prefetch_related(
+        Prefetch(
+            'availability',
+            queryset=VenueAvailability.objects.filter(date__range=(start_date, end_date)),
+            to_attr='window_rows'
+        ),
+        Prefetch('availability_templates', queryset=templates_in(start_date, end_date), to_attr='window_templates'),
+    )
+
+
+def venue_window(venue, start_date, end_date):
+    """The resolved windows of one venue, from :func:`prefetch_window` when it ran."""
+    if not hasattr(venue, 'window_rows'):
+        return resolve([venue.pk], start_date, end_date)[venue.pk]
+    return expand(venue.window_rows, venue.window_templates, date_range(start_date, end_date))[venue.pk]
+
+
+def to_minutes(value):
+    return value.hour * 60 + value.minute
+
+
+def format_minutes(minutes):
+    return f'{minutes // 60:02d}:{minutes % 60:02d}'
+
+
+def day_intervals(windows):
+    """
+    Compact form of resolved ``windows``: ``{date: [[start, end], ...]}`` with
+    the open time of each day as merged ``HH:MM`` intervals, closed windows
+    cut out. A day ending at midnight ends at ``24:00``.
+    """
+    opened = defaultdict(list)
+    closed = defaultdict(list)
+    for window in windows:
+        start = to_minutes(window.start_time)
+        end = to_minutes(window.end_time) or 24 * 60
+        (opened if window.is_available else closed)[window.date].append((start, end))
+
+    compact = {}
+    for day in sorted(opened):
+        free = []
+        for start, end in sorted(opened[day]):
+            if free and start <= free[-1][1]:
+                free[-1][1] = max(free[-1][1], end)
+            else:
+                free.append([start, end])
+        for closed_start, closed_end in closed[day]:
+            free = [
+                piece
+                for start, end in free
+                for piece in ([start, min(end, closed_start)], [max(start, closed_end), end])
+                if piece[0] < piece[1]
+            ]
+        if free:
+            compact[day.isoformat()] = [[format_minutes(start), format_minutes(end)] for start, end in free]
+    return compact
+
+
+def weekday_mask(weekdays):
+    """Bitmask of an iterable of ``date.weekday()`` numbers."""
+    mask = 0
+    for weekday in weekdays:
+        mask |= 1 << weekday
+    return mask
+
+
+def weekdays_of(mask):
+    return [weekday for weekday in range(7) if mask & (1 << weekday)]
@@ -0,0 +1,12 @@
+from backend.search import SearchIndex
+
+venue_index = SearchIndex(
+    table='venue_search',
+    source='venue v',
+    key='v.id',
+    columns={
+        'name': 'v.name',
+        'description': 'v.description',
+        'location': 'v.location',
+    },
+)
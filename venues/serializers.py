@@ -1,14 +1,63 @@
+from datetime import time, timedelta
+
+from django.utils import timezone
 from rest_framework import serializers
-from .models import Venue, VenueAvailability
+from .models import Venue, VenueAvailability, VenueAvailabilityTemplate
+from .schedule import day_intervals, get_detail_days, venue_window, weekday_mask, weekdays_of
 
 
 class VenueAvailabilitySerializer(serializers.ModelSerializer):
+    # Set on windows expanded from a template, null for stored rows
+    template = serializers.SerializerMethodField()
 
     class Meta:
         model = VenueAvailability
-        fields = ['id', 'venue', 'date', 'start_time', 'end_time', 'is_available']
+        fields = ['id', 'venue', 'date', 'start_time', 'end_time', 'is_available', 'template']
         read_only_fields = ['id']
 
+    def get_template(self, obj):
+        return getattr(obj, 'template_id', None)
+
+
+class WeekdaysField(serializers.ListField):
+    """Weekday numbers (0 is Monday) stored as a bitmask."""
+    child = serializers.IntegerField(min_value=0, max_value=6)
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('allow_empty', False)
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        return weekday_mask(super().to_internal_value(data))
+
+    def to_representation(self, value):
+        return weekdays_of(value)
+
+
+class VenueAvailabilityTemplateSerializer(serializers.ModelSerializer):
+    weekdays = WeekdaysField()
+
+    class Meta:
+        model = VenueAvailabilityTemplate
+        fields = [
+            'id', 'venue', 'weekdays', 'start_time', 'end_time',
+            'is_available', 'valid_from', 'valid_until'
+        ]
+        read_only_fields = ['id', 'venue']
+
+    def validate(self, data):
+        start_time = data.get('start_time', getattr(self.instance, 'start_time', None))
+        end_time = data.get('end_time', getattr(self.instance, 'end_time', None))
+        # An end time of 00:00 closes the window at midnight
+        if end_time != time(0, 0) and start_time >= end_time:
+            raise serializers.ValidationError({'end_time': 'End time must be after start time.'})
+
+        valid_from = data.get('valid_from', getattr(self.instance, 'valid_from', None))
+        valid_until = data.get('valid_until', getattr(self.instance, 'valid_until', None))
+        if valid_until is not None and valid_until < valid_from:
+            raise serializers.ValidationError({'valid_until': 'The template must end after it starts.'})
+        return data
+
 
 class VenueSerializer(serializers.ModelSerializer):
 
@@ -22,13 +71,86 @@ class VenueSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
+class AvailabilitySlotSerializer(serializers.Serializer):
+    venue = serializers.IntegerField(min_value=1)
+    date = serializers.DateField()
+    start_time = serializers.TimeField()
+    end_time = serializers.TimeField()
+    is_available = serializers.BooleanField(default=True)
+
+    def validate(self, data):
+        # An end time of 00:00 closes the window at midnight
+        if data['end_time'] != time(0, 0) and data['start_time'] >= data['end_time']:
+            raise serializers.ValidationError({'end_time': 'End time must be after start time.'})
+        return data
+
+
+class BulkAvailabilitySerializer(serializers.Serializer):
+    slots = AvailabilitySlotSerializer(many=True, allow_empty=False)
+
+    def validate_slots(self, slots):
+        max_items = self.context.get('max_items')
+        if max_items is not None and len(slots) > max_items:
+            raise serializers.ValidationError(f'At most {max_items} slots can be sent at once.')
+
+        venue_ids = {slot['venue'] for slot in slots}
+        missing = venue_ids - set(Venue.objects.filter(id__in=venue_ids).values_list('id', flat=True))
+        if missing:
+            raise serializers.ValidationError(
+                f'Unknown venue ids: {", ".join(str(venue_id) for venue_id in sorted(missing))}'
+            )
+        return [
+            {
+                'venue_id': slot['venue'],
+                'date': slot['date'],
+                'start_time': slot['start_time'],
+                'end_time': slot['end_time'],
+                'is_available': slot['is_available'],
+            }
+            for slot in slots
+        ]
+
+
+class RecommendedVenueSerializer(VenueSerializer):
+    spare_capacity = serializers.IntegerField(read_only=True)
+    declared_available = serializers.BooleanField(read_only=True)
+
+    class Meta(VenueSerializer.Meta):
+        fields = VenueSerializer.Meta.fields + ['spare_capacity', 'declared_available']
+
+
 class VenueDetailSerializer(serializers.ModelSerializer):
-    availability = VenueAvailabilitySerializer(many=True, read_only=True)
+    """
+    Venue with its availability over a bounded window, passed in the context
+    as ``availability_window`` (``start``, ``end`` and ``format``). The
+    ``slots`` format lists resolved windows, ``intervals`` the merged open
+    time of each day.
+    """
+    availability = serializers.SerializerMethodField()
+    availability_window = serializers.SerializerMethodField()
 
     class Meta:
         model = Venue
         fields = [
             'id', 'name', 'description', 'capacity',
             'location', 'category', 'handled_by',
-            'is_available', 'features', 'availability'
-        ]
\ No newline at end of file
+            'is_available', 'features', 'availability', 'availability_window'
+        ]
+
+    def get_window(self):
+        window = self.context.get('availability_window')
+        if window is None:
+            start = timezone.localdate()
+            window = {'start': start, 'end': start + timedelta(days=get_detail_days() - 1), 'format': 'slots'}
+        return window
+
+    def get_availability(self, obj):
+        window = self.get_window()
+        windows = venue_window(obj, window['start'], window['end'])
+        if window['format'] == 'intervals':
+            return day_intervals(windows)
+        return VenueAvailabilitySerializer(windows, many=True).data
+
+    def get_availability_window(self, obj):
+        window = self.get_window()
+        return {'start': window['start'], 'end': window['end'], 'format': window['format']}
\ No newline at end of file
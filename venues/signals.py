@@ -0,0 +1,117 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal, receiver
+from backend.cache import tiered_cache
+from .models import Venue, VenueAvailability, VenueAvailabilityTemplate, VenueDaySummary, VenueOccupancy
+from . import occupancy, features, summary
+from .search import venue_index
+
+# Cache tags of the venue listings and of one venue's detail
+CATALOG_TAG = 'venue-catalog'
+
+
+def venue_tag(venue_id):
+    return f'venue:{venue_id}'
+
+
+def invalidate_on_commit(*tags):
+    """
+    Invalidate ``tags`` once the current transaction commits: a request
+    reading in between would otherwise cache the old rows again under the
+    new version.
+    """
+    transaction.on_commit(lambda: tiered_cache.invalidate(*tags))
+
+# Sent with ``days``, a set of (venue_id, date) pairs whose bookings or availability changed
+venue_days_changed = Signal()
+
+# Days collected by the availability receivers inside batched_availability_changes()
+_pending_days = ContextVar('pending_availability_days', default=None)
+
+
+def availability_bulk_changed(days):
+    """Stand-in for the per-row availability receivers after bulk writes."""
+    days = set(days)
+    if days:
+        venue_days_changed.send(sender=VenueAvailability, days=days)
+        invalidate_on_commit(*{venue_tag(venue_id) for venue_id, _ in days})
+
+
+@contextmanager
+def batched_availability_changes():
+    """
+    Collect the days touched by availability rows saved or deleted one by one
+    (e.g. by a queryset ``delete()``) and notify them once, on success.
+    """
+    days = set()
+    token = _pending_days.set(days)
+    try:
+        yield days
+    finally:
+        _pending_days.reset(token)
+    availability_bulk_changed(days)
+
+
+@receiver(venue_days_changed)
+def refresh_day_models(sender, days, **kwargs):
+    masks = occupancy.refresh(days)
+    summary.refresh(days, masks)
+
+
+@receiver(post_save, sender=VenueAvailability)
+@receiver(post_delete, sender=VenueAvailability)
+def availability_changed(sender, instance, **kwargs):
+    if isinstance(kwargs.get('origin'), Venue):
+        return
+    pending = _pending_days.get()
+    if pending is not None:
+        pending.add((instance.venue_id, instance.date))
+        return
+    venue_days_changed.send(sender=sender, days={(instance.venue_id, instance.date)})
+
+
+@receiver(post_save, sender=VenueAvailabilityTemplate)
+@receiver(post_delete, sender=VenueAvailabilityTemplate)
+def template_changed(sender, instance, **kwargs):
+    if isinstance(kwargs.get('origin'), Venue):
+        return
+    # A template touches an open-ended range of days: rebuild the ones already built
+    days = set(VenueOccupancy.objects.filter(venue_id=instance.venue_id).values_list('venue_id', 'date'))
+    days |= set(VenueDaySummary.objects.filter(venue_id=instance.venue_id).values_list('venue_id', 'date'))
+    if days:
+        venue_days_changed.send(sender=sender, days=days)
+    invalidate_on_commit(venue_tag(instance.venue_id))
+
+
+@receiver(post_save, sender=Venue)
+def sync_venue_features(sender, instance, raw=False, **kwargs):
+    if not raw:
+        features.sync(instance)
+
+
+@receiver(post_save, sender=Venue)
+def index_venue(sender, instance, raw=False, **kwargs):
+    if not raw:
+        venue_index.update([instance.pk])
+
+
+@receiver(post_delete, sender=Venue)
+def unindex_venue(sender, instance, **kwargs):
+    venue_index.remove([instance.pk])
+
+
+@receiver(post_save, sender=Venue)
+@receiver(post_delete, sender=Venue)
+def invalidate_venue_cache(sender, instance, **kwargs):
+    invalidate_on_commit(CATALOG_TAG, venue_tag(instance.pk))
+
+
+@receiver(post_save, sender=VenueAvailability)
+@receiver(post_delete, sender=VenueAvailability)
+def invalidate_venue_detail_cache(sender, instance, **kwargs):
+    if _pending_days.get() is not None:
+        return
+    invalidate_on_commit(venue_tag(instance.venue_id))
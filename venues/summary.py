@@ -0,0 +1,194 @@
+"""
+Per-venue, per-day summaries for dashboards.
+
+:class:`~venues.models.VenueDaySummary` rows are refreshed together with the
+occupancy bitmaps whenever ``venue_days_changed`` reports a day, so the
+heatmap and utilization endpoints read one narrow table instead of
+aggregating bookings and availability on every request. Open and free time
+come from the bitmaps; booked time, counts and attendance from one query
+over the bookings touching the days.
+
+A template opens an open-ended range of days that no write reports, so the
+readers build the rows of the template days they ask about the first time,
+like ``occupancy.load`` does for the bitmaps.
+"""
+from collections import Counter, defaultdict
+
+from django.conf import settings
+
+from . import occupancy, schedule
+from .models import VenueDaySummary
+
+SUMMARY_FIELDS = [
+    'available_minutes', 'booked_minutes', 'free_minutes',
+    'booking_count', 'status_counts', 'peak_attendees',
+]
+
+
+def get_max_days():
+    return getattr(settings, 'DAY_SUMMARY_MAX_DAYS', 366)
+
+
+def slot_minutes(mask):
+    return mask.bit_count() * occupancy.SLOT_MINUTES
+
+
+def compute(pairs, masks=None):
+    """
+    Return ``{(venue_id, date): {field: value}}`` for ``pairs``.
+
+    ``masks`` are the occupancy bitmaps of the same pairs when the caller
+    already has them. ``booking_count``, ``booked_minutes`` and
+    ``peak_attendees`` (the largest single attendance) only count blocking
+    bookings; ``status_counts`` counts every booking touching the day.
+    """
+    from bookings.conflicts import NON_BLOCKING_STATUSES
+    from bookings.models import Booking
+
+    pairs = set(pairs)
+    if not pairs:
+        return {}
+    if masks is None:
+        masks = occupancy.compute(pairs)
+
+    summaries = {
+        key: {
+            'available_minutes': slot_minutes(available),
+            'booked_minutes': 0,
+            'free_minutes': slot_minutes(available & ~busy),
+            'booking_count': 0,
+            'status_counts': Counter(),
+            'peak_attendees': 0,
+        }
+        for key, (available, busy) in masks.items()
+    }
+
+    dates = {day for _, day in pairs}
+    range_start, _ = occupancy.day_bounds(min(dates))
+    _, range_end = occupancy.day_bounds(max(dates))
+    booked = defaultdict(list)
+    bookings = Booking.objects.filter(
+        venue_id__in={venue_id for venue_id, _ in pairs},
+        start_time__lt=range_end,
+        end_time__gt=range_start,
+    ).values_list('venue_id', 'start_time', 'end_time', 'status', 'attendees_count')
+    for venue_id, start_time, end_time, status, attendees in bookings:
+        blocking = status not in NON_BLOCKING_STATUSES
+        for key in occupancy.booking_days(venue_id, start_time, end_time) & pairs:
+            summary = summaries[key]
+            summary['status_counts'][status] += 1
+            if blocking:
+                summary['booking_count'] += 1
+                summary['peak_attendees'] = max(summary['peak_attendees'], attendees)
+                day_start, day_end = occupancy.day_bounds(key[1])
+                booked[key].append((max(start_time, day_start), min(end_time, day_end)))
+
+    for key, intervals in booked.items():
+        covered, reach = 0, None
+        for start, end in sorted(intervals):
+            if reach is not None and start < reach:
+                start = reach
+            if end > start:
+                covered += (end - start).total_seconds()
+                reach = end
+        summaries[key]['booked_minutes'] = int(covered // 60)
+
+    for summary in summaries.values():
+        summary['status_counts'] = dict(summary['status_counts'])
+    return summaries
+
+
+def refresh(pairs, masks=None):
+    """Recompute and store the summaries of ``pairs``."""
+    summaries = compute(pairs, masks)
+    VenueDaySummary.objects.bulk_create(
+        [
+            VenueDaySummary(venue_id=venue_id, date=day, **fields)
+            for (venue_id, day), fields in summaries.items()
+        ],
+        update_conflicts=True,
+        unique_fields=['venue', 'date'],
+        update_fields=SUMMARY_FIELDS + ['updated_at'],
+    )
+    return summaries
+
+
+def is_empty(fields):
+    return not (fields['available_minutes'] or fields['status_counts'])
+
+
+def summaries_in(venue_ids, start_date, end_date):
+    queryset = VenueDaySummary.objects.filter(date__range=(start_date, end_date))
+    if venue_ids:
+        queryset = queryset.filter(venue_id__in=venue_ids)
+    return queryset
+
+
+def build_template_days(venue_ids, start_date, end_date):
+    """Store the missing summaries of the days of the range a template opens."""
+    templates = schedule.templates_in(start_date, end_date).filter(is_available=True)
+    if venue_ids:
+        templates = templates.filter(venue_id__in=venue_ids)
+    pairs = set()
+    for template in templates:
+        last = min(end_date, template.valid_until or end_date)
+        for day in schedule.date_range(max(start_date, template.valid_from), last):
+            if template.applies_to(day):
+                pairs.add((template.venue_id, day))
+    if not pairs:
+        return
+    pairs -= set(summaries_in({venue_id for venue_id, _ in pairs}, start_date, end_date).values_list(
+        'venue_id', 'date'
+    ))
+    if pairs:
+        refresh(pairs, occupancy.refresh(pairs))
+
+
+def heatmap(venue_ids, start_date, end_date):
+    """``{venue_id: {date: {...}}}`` of the days with availability or bookings."""
+    build_template_days(venue_ids, start_date, end_date)
+    cells = defaultdict(dict)
+    rows = summaries_in(venue_ids, start_date, end_date).order_by('venue_id', 'date').values_list(
+        'venue_id', 'date', 'available_minutes', 'booked_minutes', 'free_minutes', 'booking_count'
+    )
+    for venue_id, day, available, booked, free, count in rows:
+        cells[venue_id][day.isoformat()] = {
+            'available_minutes': available,
+            'booked_minutes': booked,
+            'free_minutes': free,
+            'booking_count': count,
+        }
+    return cells
+
+
+def utilization(venue_ids, start_date, end_date):
+    """Totals per venue over the range, with ``utilization`` = booked / available time."""
+    build_template_days(venue_ids, start_date, end_date)
+    totals = {}
+    rows = summaries_in(venue_ids, start_date, end_date).values_list(
+        'venue_id', 'available_minutes', 'booked_minutes', 'free_minutes',
+        'booking_count', 'status_counts', 'peak_attendees'
+    )
+    for venue_id, available, booked, free, count, status_counts, peak in rows:
+        total = totals.setdefault(venue_id, {
+            'available_minutes': 0,
+            'booked_minutes': 0,
+            'free_minutes': 0,
+            'booking_count': 0,
+            'status_counts': Counter(),
+            'peak_attendees': 0,
+        })
+        total['available_minutes'] += available
+        total['booked_minutes'] += booked
+        total['free_minutes'] += free
+        total['booking_count'] += count
+        total['status_counts'].update(status_counts)
+        total['peak_attendees'] = max(total['peak_attendees'], peak)
+
+    for total in totals.values():
+        total['status_counts'] = dict(total['status_counts'])
+        total['utilization'] = (
+            round(total['booked_minutes'] / total['available_minutes'], 4)
+            if total['available_minutes'] else None
+        )
+    return totals
@@ -19,12 +19,21 @@ POST   /api/venues/                         # Create venue (staff)
 GET    /api/venues/{id}/                    # Get venue details
 PUT    /api/venues/{id}/                    # Update venue (staff)
 DELETE /api/venues/{id}/                    # Delete venue (staff)
-GET    /api/venues/{id}/availability/       # Get venue availability slots
-POST   /api/venues/{id}/availability/       # Create availability slots (staff)
+GET    /api/venues/{id}/availability/       # Resolved availability (?date= or ?start=&end=, next 60 days by default)
+POST   /api/venues/{id}/availability/       # Create availability slots / exceptions (staff)
 DELETE /api/venues/{id}/availability/{date}/ # Delete availability for date (staff)
+DELETE /api/venues/{id}/availability/{start}/{end}/ # Delete availability for a date range (staff)
+POST   /api/venues/availability/bulk/       # Bulk-insert slots for several venues, skipping duplicates (staff)
+GET    /api/venues/{id}/availability-templates/       # Weekly availability templates
+POST   /api/venues/{id}/availability-templates/       # Create a template (staff)
+DELETE /api/venues/{id}/availability-templates/{tid}/ # Delete a template (staff)
 """
 # Venue Search
 """
 GET    /api/venues/search/                  # Search venues with multiple filters
 GET    /api/venues/available/               # Get available venues for date/time range
+GET    /api/venues/freebusy/                # Busy/available intervals for several venues (?venues=1,2&start=&end=)
+GET    /api/venues/heatmap/                 # Per-day booked/available/free minutes (?start=&end=[&venues=1,2])
+GET    /api/venues/utilization/             # Per-venue totals and utilization over a range (staff)
+GET    /api/venues/analytics/{report}/      # utilization | peak-hours | idle-capacity by hour bucket (staff)
 """
\ No newline at end of file
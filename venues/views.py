@@ -1,27 +1,88 @@
-from django.db.models import Q
-from rest_framework import viewsets, status, filters
+from rest_framework import viewsets, status, filters, serializers
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from datetime import datetime
-from .models import Venue, VenueAvailability
+from datetime import datetime, time, timedelta
+from django.utils import timezone
+from django.utils.dateparse import parse_time
+from .models import Venue, VenueAvailability, VenueAvailabilityTemplate
 from .serializers import (
     VenueSerializer,
     VenueDetailSerializer,
-    VenueAvailabilitySerializer
+    VenueAvailabilitySerializer,
+    VenueAvailabilityTemplateSerializer,
+    BulkAvailabilitySerializer,
+    RecommendedVenueSerializer
 )
 from accounts.permissions import IsStaffOrReadOnly
+from backend.identity import IdentityMapMixin
+from backend.cache import CachedResponseMixin
+from backend.search import FullTextSearchFilter
+from .signals import CATALOG_TAG, venue_tag, batched_availability_changes
+from . import occupancy, freebusy, features, facets, recommend, schedule, bulk, summary, analytics
+from .search import venue_index
 
 
-class VenueViewSet(viewsets.ModelViewSet):
+class VenueViewSet(CachedResponseMixin, IdentityMapMixin, viewsets.ModelViewSet):
     queryset = Venue.objects.all()
     serializer_class = VenueSerializer
     permission_classes = [IsStaffOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['category', 'is_available', 'handled_by']
     search_fields = ['name', 'description', 'location']
+    search_index = venue_index
     ordering_fields = ['name', 'capacity']
+    cached_actions = ('list', 'retrieve', 'search')
+
+    def get_cache_tags(self):
+        # A venue's detail page also lists its availability
+        if self.action == 'retrieve':
+            return [venue_tag(self.kwargs['pk'])]
+        return [CATALOG_TAG]
+
+    def get_cache_variant(self):
+        # The default availability window of a detail page starts today
+        if self.action == 'retrieve':
+            return timezone.localdate().isoformat()
+        return ''
+
+    def get_availability_window(self):
+        """
+        Window of the availability embedded in a venue's detail:
+        ``?availability_start=`` (today by default), ``?availability_days=``
+        and ``?availability_format=slots|intervals``.
+        """
+        params = self.request.query_params
+        try:
+            start = (datetime.strptime(params['availability_start'], '%Y-%m-%d').date()
+                     if params.get('availability_start') else timezone.localdate())
+        except ValueError:
+            raise serializers.ValidationError({'availability_start': 'Invalid date format. Use YYYY-MM-DD'})
+
+        days = params.get('availability_days', '')
+        max_days = schedule.get_max_days()
+        if days and not (days.isdigit() and 1 <= int(days) <= max_days):
+            raise serializers.ValidationError({'availability_days': f'Must be between 1 and {max_days}'})
+        days = int(days) if days else schedule.get_detail_days()
+
+        availability_format = params.get('availability_format', 'slots')
+        if availability_format not in ('slots', 'intervals'):
+            raise serializers.ValidationError({'availability_format': 'Use slots or intervals'})
+        return {'start': start, 'end': start + timedelta(days=days - 1), 'format': availability_format}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'retrieve':
+            window = self.get_availability_window()
+            queryset = schedule.prefetch_window(queryset, window['start'], window['end'])
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action == 'retrieve':
+            context['availability_window'] = self.get_availability_window()
+        return context
 
     def get_serializer_class(self):
         if self.action == 'retrieve':
@@ -40,19 +101,30 @@ class VenueViewSet(viewsets.ModelViewSet):
         venue = self.get_object()
 
         if request.method == 'GET':
-            availability = VenueAvailability.objects.filter(venue=venue)
-
+            # ?date= for one day, or ?start=&end=; the next AVAILABILITY_DEFAULT_DAYS by default
             date_param = request.query_params.get('date', None)
-            if date_param:
-                try:
-                    filter_date = datetime.strptime(date_param, '%Y-%m-%d').date()
-                    availability = availability.filter(date=filter_date)
-                except ValueError:
-                    return Response(
-                        {'error': 'Invalid date format. Use YYYY-MM-DD'},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
+            try:
+                if date_param:
+                    start_date = end_date = datetime.strptime(date_param, '%Y-%m-%d').date()
+                else:
+                    start_param = request.query_params.get('start', None)
+                    end_param = request.query_params.get('end', None)
+                    start_date = (datetime.strptime(start_param, '%Y-%m-%d').date()
+                                  if start_param else timezone.localdate())
+                    end_date = (datetime.strptime(end_param, '%Y-%m-%d').date() if end_param
+                                else start_date + timedelta(days=schedule.get_default_days() - 1))
+            except ValueError:
+                return Response(
+                    {'error': 'Invalid date format. Use YYYY-MM-DD'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if end_date < start_date or (end_date - start_date).days >= schedule.get_max_days():
+                return Response(
+                    {'error': f'The date range must be ordered and at most {schedule.get_max_days()} days long'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
 
+            availability = schedule.resolve([venue.id], start_date, end_date)[venue.id]
             serializer = VenueAvailabilitySerializer(availability, many=True)
             return Response(serializer.data)
 
@@ -86,6 +158,88 @@ class VenueViewSet(viewsets.ModelViewSet):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=False, methods=['post'], url_path='availability/bulk',
+            permission_classes=[IsAuthenticated, IsAdminUser])
+    def bulk_availability(self, request):
+        serializer = BulkAvailabilitySerializer(data=request.data, context={'max_items': bulk.get_max_items()})
+        serializer.is_valid(raise_exception=True)
+
+        inserted, skipped = bulk.ingest(serializer.validated_data['slots'])
+        return Response(
+            {'inserted': inserted, 'skipped': skipped},
+            status=status.HTTP_201_CREATED if inserted else status.HTTP_200_OK
+        )
+
+    @action(detail=True, methods=['delete'],
+            url_path=r'availability/(?P<start>\d{4}-\d{2}-\d{2})/(?P<end>\d{4}-\d{2}-\d{2})',
+            permission_classes=[IsAuthenticated, IsAdminUser])
+    def delete_availability_range(self, request, pk=None, start=None, end=None):
+        venue = self.get_object()
+
+        try:
+            start_date = datetime.strptime(start, '%Y-%m-%d').date()
+            end_date = datetime.strptime(end, '%Y-%m-%d').date()
+        except ValueError:
+            return Response(
+                {'error': 'Invalid date format. Use YYYY-MM-DD'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if end_date < start_date:
+            return Response(
+                {'error': 'The end date must not be before the start date'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        with batched_availability_changes():
+            deleted, _ = VenueAvailability.objects.filter(
+                venue=venue, date__range=(start_date, end_date)
+            ).delete()
+
+        if deleted:
+            return Response(
+                {'message': f'Deleted {deleted} availability slots from {start} to {end}'},
+                status=status.HTTP_200_OK
+            )
+        return Response(
+            {'message': f'No availability slots found from {start} to {end}'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    @action(detail=True, methods=['get', 'post'], url_path='availability-templates')
+    def availability_templates(self, request, pk=None):
+        venue = self.get_object()
+
+        if request.method == 'GET':
+            serializer = VenueAvailabilityTemplateSerializer(
+                venue.availability_templates.order_by('valid_from', 'start_time', 'id'), many=True
+            )
+            return Response(serializer.data)
+
+        if not (request.user.is_authenticated and
+                (request.user.is_staff or request.user.is_superuser)):
+            return Response(
+                {'error': 'Permission denied'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        serializer = VenueAvailabilityTemplateSerializer(data=request.data)
+        if serializer.is_valid():
+            serializer.save(venue=venue)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=True, methods=['delete'], url_path=r'availability-templates/(?P<template_id>\d+)',
+            permission_classes=[IsAuthenticated, IsAdminUser])
+    def delete_availability_template(self, request, pk=None, template_id=None):
+        venue = self.get_object()
+        deleted, _ = VenueAvailabilityTemplate.objects.filter(venue=venue, id=template_id).delete()
+        if deleted:
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        return Response(
+            {'error': 'Availability template not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
     @action(detail=True, methods=['delete'], url_path=r'availability/(?P<date>\d{4}-\d{2}-\d{2})',
             permission_classes=[IsAuthenticated, IsAdminUser])
     def delete_availability(self, request, pk=None, date=None):
@@ -139,22 +293,20 @@ class VenueViewSet(viewsets.ModelViewSet):
         if handled_by:
             queryset = queryset.filter(handled_by=handled_by)
 
-        # Added search parameter support
-        search = request.query_params.get('search', None)
-        if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search) |
-                Q(description__icontains=search) |
-                Q(location__icontains=search)
-            )
+        # Added search parameter support, ranked through the full-text index
+        queryset = FullTextSearchFilter().filter_queryset(request, queryset, self)
+
+        # ?feature=projector&feature=wifi keeps venues having all of them
+        queryset = features.with_all_features(queryset, request.query_params.getlist('feature'))
 
-        feature = request.query_params.get('feature', None)
-        if feature:
-            venues_with_feature = []
-            for venue in queryset:
-                if feature in venue.features and venue.features.get(feature) is True:
-                    venues_with_feature.append(venue.id)
-            queryset = queryset.filter(id__in=venues_with_feature)
+        # ?facets=true returns one page of venues with the counts of every filter value
+        if request.query_params.get('facets', '').lower() in ('1', 'true'):
+            if not queryset.ordered:
+                queryset = queryset.order_by('name', 'id')
+            page = self.paginate_queryset(queryset)
+            response = self.get_paginated_response(VenueSerializer(page, many=True).data)
+            response.data['facets'] = facets.facet_counts(queryset)
+            return response
 
         serializer = VenueSerializer(queryset, many=True)
         return Response(serializer.data)
@@ -173,20 +325,165 @@ class VenueViewSet(viewsets.ModelViewSet):
 
         try:
             filter_date = datetime.strptime(date_str, '%Y-%m-%d').date()
+            start_time = parse_time(start_time_str)
+            end_time = parse_time(end_time_str)
+            if start_time is None or end_time is None or start_time >= end_time:
+                raise ValueError
+        except ValueError:
+            return Response(
+                {'error': 'Invalid date or time format. Use YYYY-MM-DD for date and HH:MM for time'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-            available_venues = Venue.objects.filter(
-                is_available=True,
-                availability__date=filter_date,
-                availability__start_time__lte=start_time_str,
-                availability__end_time__gte=end_time_str,
-                availability__is_available=True
-            ).distinct()
+        venue_ids = Venue.objects.filter(is_available=True).values_list('id', flat=True)
+        free_ids = occupancy.free_venue_ids(venue_ids, filter_date, start_time, end_time)
 
-            serializer = VenueSerializer(available_venues, many=True)
-            return Response(serializer.data)
+        serializer = VenueSerializer(Venue.objects.filter(id__in=free_ids), many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def recommend(self, request):
+        attendees = request.query_params.get('attendees', '')
+        date_str = request.query_params.get('date', None)
+        start_time_str = request.query_params.get('start_time', None)
+        end_time_str = request.query_params.get('end_time', None)
+
+        if not attendees.isdigit() or int(attendees) < 1 or not all([date_str, start_time_str, end_time_str]):
+            return Response(
+                {'error': 'Required parameters: attendees (positive integer), date, start_time, end_time'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
+        try:
+            filter_date = datetime.strptime(date_str, '%Y-%m-%d').date()
+            start_time = parse_time(start_time_str)
+            end_time = parse_time(end_time_str)
+            if start_time is None or end_time is None or (start_time >= end_time and end_time != time(0, 0)):
+                raise ValueError
         except ValueError:
             return Response(
                 {'error': 'Invalid date or time format. Use YYYY-MM-DD for date and HH:MM for time'},
                 status=status.HTTP_400_BAD_REQUEST
             )
+
+        limit = request.query_params.get('limit', '')
+        limit = max(1, min(int(limit), recommend.get_max_results())) if limit.isdigit() else 10
+
+        venues = recommend.recommend(
+            int(attendees),
+            filter_date,
+            start_time,
+            end_time,
+            required_features=request.query_params.getlist('feature'),
+            handled_by=request.query_params.get('handled_by'),
+        )[:limit]
+        return Response(RecommendedVenueSerializer(venues, many=True).data)
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def freebusy(self, request):
+        try:
+            venue_ids = [int(value) for value in request.query_params.get('venues', '').split(',') if value]
+            start_date = datetime.strptime(request.query_params.get('start', ''), '%Y-%m-%d').date()
+            end_date = datetime.strptime(request.query_params.get('end', ''), '%Y-%m-%d').date()
+        except ValueError:
+            return Response(
+                {'error': 'Required parameters: venues (comma-separated ids), start and end (YYYY-MM-DD)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if not venue_ids or len(venue_ids) > freebusy.get_max_venues():
+            return Response(
+                {'error': f'Provide between 1 and {freebusy.get_max_venues()} venue ids'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if end_date < start_date or (end_date - start_date).days >= freebusy.get_max_days():
+            return Response(
+                {'error': f'The date range must be ordered and at most {freebusy.get_max_days()} days long'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        datetime_field = serializers.DateTimeField()
+        intervals = freebusy.free_busy(sorted(set(venue_ids)), start_date, end_date)
+        return Response({
+            'start': start_date,
+            'end': end_date,
+            'venues': {
+                str(venue_id): {
+                    kind: [[datetime_field.to_representation(value) for value in pair] for pair in pairs]
+                    for kind, pairs in entry.items()
+                }
+                for venue_id, entry in intervals.items()
+            },
+        })
+
+    def parse_report_range(self, request, max_days):
+        """``(venue_ids, start_date, end_date)`` of the report endpoints; ``venues`` is optional."""
+        try:
+            venue_ids = [int(value) for value in request.query_params.get('venues', '').split(',') if value]
+            start_date = datetime.strptime(request.query_params.get('start', ''), '%Y-%m-%d').date()
+            end_date = datetime.strptime(request.query_params.get('end', ''), '%Y-%m-%d').date()
+        except ValueError:
+            raise serializers.ValidationError(
+                {'error': 'Required parameters: start and end (YYYY-MM-DD); optional venues (comma-separated ids)'}
+            )
+        if end_date < start_date or (end_date - start_date).days >= max_days:
+            raise serializers.ValidationError(
+                {'error': f'The date range must be ordered and at most {max_days} days long'}
+            )
+        return venue_ids, start_date, end_date
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def heatmap(self, request):
+        venue_ids, start_date, end_date = self.parse_report_range(request, summary.get_max_days())
+        return Response({
+            'start': start_date,
+            'end': end_date,
+            'venues': {
+                str(venue_id): days
+                for venue_id, days in summary.heatmap(venue_ids, start_date, end_date).items()
+            },
+        })
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated, IsAdminUser])
+    def utilization(self, request):
+        venue_ids, start_date, end_date = self.parse_report_range(request, summary.get_max_days())
+        return Response({
+            'start': start_date,
+            'end': end_date,
+            'venues': {
+                str(venue_id): totals
+                for venue_id, totals in summary.utilization(venue_ids, start_date, end_date).items()
+            },
+        })
+
+    @action(detail=False, methods=['get'], url_path=r'analytics/(?P<report>utilization|peak-hours|idle-capacity)',
+            permission_classes=[IsAuthenticated, IsAdminUser])
+    def analytics(self, request, report=None):
+        venue_ids, start_date, end_date = self.parse_report_range(request, analytics.get_max_days())
+
+        open_hours = analytics.get_open_hours()
+        if request.query_params.get('open_hours'):
+            try:
+                first, last = (int(value) for value in request.query_params['open_hours'].split('-'))
+                if not 0 <= first < last <= 24:
+                    raise ValueError
+            except ValueError:
+                raise serializers.ValidationError({'open_hours': 'Use FIRST-LAST hours, e.g. 8-22'})
+            open_hours = (first, last)
+
+        matrix = analytics.occupancy_matrix(start_date, end_date, venue_ids)
+        if report == 'peak-hours':
+            top = request.query_params.get('top', '')
+            results = analytics.peak_hours(matrix, top=int(top) if top.isdigit() else 10)
+        elif report == 'utilization':
+            results = {str(venue_id): entry for venue_id, entry in analytics.utilization(matrix, open_hours).items()}
+        else:
+            results = {str(venue_id): entry for venue_id, entry in analytics.idle_capacity(matrix, open_hours).items()}
+
+        return Response({
+            'report': report,
+            'start': start_date,
+            'end': end_date,
+            'open_hours': list(open_hours),
+            'results': results,
+        })